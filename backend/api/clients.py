@@ -1,28 +1,71 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 
-from core.database import execute_query
-from models.clients import Client, ClientSummary
+from core.database import run_db
+from core.responses import model_response
+from models.clients import Client, ClientList, ClientSummary, ClientSummaryList
 from models.contracts import Contract
-from services.client_service import get_all_clients, get_client_by_id, get_client_summary
+from services.client_service import search_clients, get_client_by_id, get_client_summary, get_client_summaries
 from services.contract_service import get_client_contract
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
 @router.get("/", response_model=List[Client])
 async def read_clients(
-    provider: Optional[str] = Query(None, description="Filter by provider name")
+    response: Response,
+    q: Optional[str] = Query(None, description="Search client names (prefix, then substring)"),
+    provider: Optional[str] = Query(None, description="Filter by provider name"),
+    status: Optional[str] = Query(None, description="Filter by compliance status (green, yellow, red)"),
+    fee_type: Optional[str] = Query(None, description="Filter by fee type"),
+    schedule: Optional[str] = Query(None, description="Filter by payment schedule"),
+    sort: Optional[str] = Query(None, description="name, status, next_due, last_payment, provider or relevance"),
+    order: str = Query("asc", description="asc or desc"),
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Items per page; omit for all")
 ):
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    
     try:
-        clients = get_all_clients(provider)
-        return clients
+        clients, total = await run_db(
+            search_clients,
+            search=q,
+            provider=provider,
+            status=status,
+            fee_type=fee_type,
+            schedule=schedule,
+            sort=sort,
+            descending=order == "desc",
+            page=page,
+            limit=limit
+        )
+        response.headers["X-Total-Count"] = str(total)
+        return model_response(ClientList, clients, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Declared before /{client_id} so "summaries" is not parsed as an id
+@router.get("/summaries", response_model=List[ClientSummary])
+async def read_client_summaries(
+    ids: Optional[str] = Query(None, description="Comma-separated client ids; omit for all active clients")
+):
+    try:
+        client_ids = [int(value) for value in ids.split(",") if value.strip()] if ids else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    
+    try:
+        summaries = await run_db(get_client_summaries, client_ids)
+        return model_response(ClientSummaryList, summaries)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{client_id}", response_model=Client)
 async def read_client(client_id: int):
     try:
-        client = get_client_by_id(client_id)
+        client = await run_db(get_client_by_id, client_id)
         if not client:
             raise HTTPException(status_code=404, detail="Client not found")
         return client
@@ -35,7 +78,7 @@ async def read_client(client_id: int):
 @router.get("/{client_id}/summary", response_model=ClientSummary)
 async def read_client_summary(client_id: int):
     try:
-        summary = get_client_summary(client_id)
+        summary = await run_db(get_client_summary, client_id)
         if not summary:
             raise HTTPException(status_code=404, detail="Client not found")
         return summary
@@ -47,7 +90,7 @@ async def read_client_summary(client_id: int):
 @router.get("/{client_id}/contract", response_model=Contract)
 async def read_client_contract(client_id: int):
     try:
-        contract = get_client_contract(client_id)
+        contract = await run_db(get_client_contract, client_id)
         if not contract:
             raise HTTPException(status_code=404, detail="Contract not found")
         return contract
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 
+from core.database import run_db
 from models.contracts import Contract, ExpectedFeeCalculation
 from services.contract_service import (
     get_contract_by_id, 
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/contracts", tags=["contracts"])
 @router.get("/{contract_id}", response_model=Contract)
 async def read_contract(contract_id: int):
     try:
-        contract = get_contract_by_id(contract_id)
+        contract = await run_db(get_contract_by_id, contract_id)
         if not contract:
             raise HTTPException(status_code=404, detail="Contract not found")
         return contract
@@ -25,7 +26,7 @@ async def read_contract(contract_id: int):
 @router.get("/client/{client_id}", response_model=Contract)
 async def read_client_contract(client_id: int):
     try:
-        contract = get_client_contract(client_id)
+        contract = await run_db(get_client_contract, client_id)
         if not contract:
             raise HTTPException(status_code=404, detail="Contract not found for this client")
         return contract
@@ -40,7 +41,7 @@ async def calculate_fee(
     total_assets: Optional[float] = Query(None, description="Total assets for percentage-based fees")
 ):
     try:
-        fee_calculation = calculate_expected_fee(contract_id, total_assets)
+        fee_calculation = await run_db(calculate_expected_fee, contract_id, total_assets)
         return fee_calculation
     except HTTPException:
         raise
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+from typing import Any, Dict, List
+
+from core.database import get_pool
+from core.metrics import metrics
+from services.contract_service import get_contract_cache_stats
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", response_class=Response)
+async def read_metrics():
+    return Response(
+        metrics.render(get_pool().stats(), {"contract": get_contract_cache_stats()}), 
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@router.get("/debug/slow-queries", response_model=List[Dict[str, Any]])
+async def read_slow_queries():
+    return metrics.slow_queries()
\ No newline at end of file
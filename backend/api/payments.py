@@ -1,15 +1,30 @@
-from fastapi import APIRouter, HTTPException, Query, Path
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Path, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 
-from models.payments import Payment, PaymentCreate, PaymentWithDetails, AvailablePeriods
+from core.database import run_db
+from core.responses import model_response
+from models.payments import (
+    Payment, PaymentCreate, PaymentWithDetails, PaymentWithDetailsList, AvailablePeriods, BulkPaymentResult
+)
 from services.payment_service import (
     get_client_payments, 
+    encode_payment_cursor,
     get_payment_by_id,
     create_payment,
     update_payment,
     delete_payment,
-    get_available_periods
+    get_available_periods,
+    bulk_create_payments,
+    parse_payments_csv
 )
+from services.export_service import iter_payment_export, csv_stream, xlsx_stream
+
+EXPORT_FORMATS = {
+    "csv": (csv_stream, "text/csv; charset=utf-8"),
+    "xlsx": (xlsx_stream, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
 
 # Main payments router
 router = APIRouter(prefix="/payments", tags=["payments"])
@@ -19,10 +34,12 @@ client_payments_router = APIRouter(prefix="/clients", tags=["client-payments"])
 
 @client_payments_router.get("/{client_id}/payments", response_model=List[PaymentWithDetails])
 async def read_client_payments(
+    response: Response,
     client_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
-    year: Optional[int] = Query(None, description="Filter by year")
+    year: Optional[int] = Query(None, description="Filter by year"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces page")
 ):
     try:
         # Convert year to int if it's a valid integer string, otherwise use None
@@ -30,20 +47,64 @@ async def read_client_payments(
         if isinstance(year, str) and year.lower() == 'null':
             filtered_year = None
             
-        payments = get_client_payments(
+        payments = await run_db(
+            get_client_payments,
             client_id=client_id, 
             page=page, 
             limit=limit, 
-            year=filtered_year
+            year=filtered_year,
+            cursor=cursor
         )
-        return payments
+        
+        if len(payments) == limit:
+            response.headers["X-Next-Cursor"] = encode_payment_cursor(payments[-1])
+        
+        return model_response(PaymentWithDetailsList, payments, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Declared before /{payment_id} so "export" is not parsed as an id
+@router.get("/export")
+async def export_payments(
+    file_format: str = Query("csv", alias="format", description="csv or xlsx"),
+    client_id: Optional[int] = Query(None, description="Limit to one client"),
+    provider: Optional[str] = Query(None, description="Limit to one provider"),
+    start_date: Optional[str] = Query(None, description="Received on or after (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Received on or before (YYYY-MM-DD)")
+):
+    if file_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be csv or xlsx")
+    
+    for value in (start_date, end_date):
+        if value:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+    
+    # Rows are fetched and written batch by batch as the response is sent, so
+    # memory does not grow with the size of the export
+    writer, media_type = EXPORT_FORMATS[file_format]
+    batches = iter_payment_export(
+        client_id=client_id, 
+        provider=provider, 
+        start_date=start_date, 
+        end_date=end_date
+    )
+    filename = f"payments-{client_id}" if client_id is not None else "payments"
+    
+    return StreamingResponse(
+        writer(batches),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{file_format}"'}
+    )
+
 @router.get("/{payment_id}", response_model=PaymentWithDetails)
 async def read_payment(payment_id: int = Path(..., ge=1)):
     try:
-        payment = get_payment_by_id(payment_id)
+        payment = await run_db(get_payment_by_id, payment_id)
         if not payment:
             raise HTTPException(status_code=404, detail="Payment not found")
         return payment
@@ -55,18 +116,36 @@ async def read_payment(payment_id: int = Path(..., ge=1)):
 @router.post("/", response_model=Payment)
 async def create_new_payment(payment: PaymentCreate):
     try:
-        new_payment = create_payment(payment)
+        new_payment = await run_db(create_payment, payment)
         return new_payment
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk", response_model=BulkPaymentResult)
+async def create_bulk_payments(payments: List[PaymentCreate]):
+    try:
+        result = await run_db(bulk_create_payments, payments)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk/csv", response_model=BulkPaymentResult)
+async def create_bulk_payments_csv(request: Request):
+    try:
+        body = await request.body()
+        payments = parse_payments_csv(body.decode("utf-8-sig"))
+        result = await run_db(bulk_create_payments, payments)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.put("/{payment_id}", response_model=Payment)
 async def update_existing_payment(
     payment_id: int = Path(..., ge=1),
     payment: PaymentCreate = None
 ):
     try:
-        updated_payment = update_payment(payment_id, payment)
+        updated_payment = await run_db(update_payment, payment_id, payment)
         if not updated_payment:
             raise HTTPException(status_code=404, detail="Payment not found")
         return updated_payment
@@ -78,7 +157,7 @@ async def update_existing_payment(
 @router.delete("/{payment_id}", status_code=204)
 async def delete_existing_payment(payment_id: int = Path(..., ge=1)):
     try:
-        success = delete_payment(payment_id)
+        success = await run_db(delete_payment, payment_id)
         if not success:
             raise HTTPException(status_code=404, detail="Payment not found")
         return None
@@ -94,9 +173,10 @@ contracts_router = APIRouter(prefix="/contracts", tags=["contract-periods"])
 async def read_available_periods(
     contract_id: int,
     client_id: int = Query(..., description="Client ID is required"),
+    unpaid_only: bool = Query(False, description="Leave out periods that already have a payment"),
 ):
     try:
-        periods = get_available_periods(contract_id, client_id)
+        periods = await run_db(get_available_periods, contract_id, client_id, unpaid_only)
         return periods
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+
+from core.database import run_db
+from core.responses import model_response
+from models.providers import ProviderSummary, ProviderSummaryList
+from services.provider_service import get_provider_summary, get_provider_summaries
+
+router = APIRouter(prefix="/providers", tags=["providers"])
+
+@router.get("/summary", response_model=List[ProviderSummary])
+async def read_provider_summaries(
+    year: int = Query(..., description="Calendar year"),
+    quarter: Optional[int] = Query(None, ge=1, le=4, description="Limit to one quarter")
+):
+    try:
+        summaries = await run_db(get_provider_summaries, year, quarter)
+        return model_response(ProviderSummaryList, summaries)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Provider names can contain "/" (e.g. "Capital Group / American Funds")
+@router.get("/{provider_name:path}/summary", response_model=List[ProviderSummary])
+async def read_provider_summary(
+    provider_name: str,
+    year: Optional[int] = Query(None, description="Limit to one year"),
+    quarter: Optional[int] = Query(None, ge=1, le=4, description="Limit to one quarter")
+):
+    try:
+        summaries = await run_db(get_provider_summary, provider_name, year, quarter)
+        if summaries is None:
+            raise HTTPException(status_code=404, detail="Provider not found")
+        return model_response(ProviderSummaryList, summaries)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
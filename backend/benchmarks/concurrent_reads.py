@@ -0,0 +1,129 @@
+"""Read throughput on the client roster while payment writes are in flight.
+
+Compares SQLite defaults (rollback journal, synchronous=FULL) with the tuned
+pragmas from core.config. Run from the backend directory:
+
+    python -m benchmarks.concurrent_reads --seconds 5 --readers 4
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from core.config import BASE_DIR, DB_PRAGMAS
+from core.database import ConnectionPool
+
+SCHEMA_PATH = os.path.join(BASE_DIR, "data", "clean_schema.sql")
+
+ROSTER_QUERY = """
+    SELECT c.client_id, c.display_name, c.full_name, c.ima_signed_date, c.onedrive_folder_path,
+           co.provider_name, cm.last_payment_date, cm.last_payment_amount
+    FROM clients c
+    LEFT JOIN (
+        SELECT client_id, provider_name
+        FROM contracts 
+        WHERE valid_to IS NULL
+        GROUP BY client_id
+    ) co ON c.client_id = co.client_id
+    LEFT JOIN client_metrics cm ON c.client_id = cm.client_id
+    WHERE c.valid_to IS NULL
+    ORDER BY c.display_name
+"""
+
+def create_database(path: str, clients: int = 50) -> None:
+    pool = ConnectionPool(path, size=1, pragmas={})
+    conn = pool.acquire()
+    with open(SCHEMA_PATH, "r") as f:
+        conn.executescript(f.read())
+    for client_id in range(1, clients + 1):
+        conn.execute(
+            "INSERT INTO clients (client_id, display_name, full_name) VALUES (?, ?, ?)",
+            (client_id, f"Client {client_id:03d}", f"CLIENT {client_id:03d} LLC")
+        )
+        conn.execute(
+            """INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, flat_rate, payment_schedule)
+               VALUES (?, ?, 'Bench Provider', 'flat', 1000.0, 'quarterly')""",
+            (client_id, client_id)
+        )
+    conn.commit()
+    pool.release(conn)
+    pool.close()
+
+def writer(pool: ConnectionPool, stop: threading.Event, counts: dict, clients: int) -> None:
+    n = 0
+    while not stop.is_set():
+        client_id = n % clients + 1
+        conn = pool.acquire()
+        try:
+            # Mirrors create_payment: an insert and a metrics upsert, each committed
+            conn.execute(
+                """INSERT INTO payments (contract_id, client_id, received_date, actual_fee,
+                                         applied_start_quarter, applied_start_quarter_year,
+                                         applied_end_quarter, applied_end_quarter_year)
+                   VALUES (?, ?, '2024-01-15', 1000.0, 1, 2024, 1, 2024)""",
+                (client_id, client_id)
+            )
+            conn.commit()
+            conn.execute(
+                """INSERT INTO client_metrics (client_id, last_payment_date, last_payment_amount)
+                   VALUES (?, '2024-01-15', 1000.0)
+                   ON CONFLICT(client_id) DO UPDATE SET last_payment_amount = excluded.last_payment_amount""",
+                (client_id,)
+            )
+            conn.commit()
+        finally:
+            pool.release(conn)
+        n += 1
+    counts["writes"] = n
+
+def reader(pool: ConnectionPool, stop: threading.Event, counts: dict, idx: int) -> None:
+    n = 0
+    while not stop.is_set():
+        conn = pool.acquire()
+        try:
+            conn.execute(ROSTER_QUERY).fetchall()
+        finally:
+            pool.release(conn)
+        n += 1
+    counts[f"reader-{idx}"] = n
+
+def run(label: str, pragmas: dict, seconds: float, readers: int, clients: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        create_database(path, clients)
+        pool = ConnectionPool(path, size=readers + 1, pragmas=pragmas)
+        stop = threading.Event()
+        counts = {}
+        
+        threads = [threading.Thread(target=writer, args=(pool, stop, counts, clients))]
+        threads += [
+            threading.Thread(target=reader, args=(pool, stop, counts, i))
+            for i in range(readers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        pool.close()
+    
+    reads = sum(v for k, v in counts.items() if k.startswith("reader"))
+    print(
+        f"{label:<10} reads/sec: {reads / seconds:>10,.0f}   "
+        f"writes/sec: {counts['writes'] / seconds:>8,.0f}"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=50)
+    args = parser.parse_args()
+    
+    run("defaults", {}, args.seconds, args.readers, args.clients)
+    run("tuned", DB_PRAGMAS, args.seconds, args.readers, args.clients)
+
+if __name__ == "__main__":
+    main()
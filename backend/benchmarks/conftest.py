@@ -0,0 +1,130 @@
+"""pytest-benchmark suite over generated databases.
+
+Every benchmark runs once per scale, a multiple of the production client
+count (BASE_CLIENTS). One database per scale is generated for the session,
+or reused from --bench-data. Results are saved under benchmarks/baselines,
+in one directory per machine id (for example Windows-CPython-3.11-64bit).
+Install requirements-dev.txt, then run from the backend directory:
+
+    python -m pytest benchmarks --scales 10,100 --benchmark-save=baseline
+    python -m pytest benchmarks --scales 10,100 --benchmark-compare --benchmark-compare-fail=median:25%
+
+Timings only compare on the machine that recorded them, so save a baseline
+on your own machine before comparing. --benchmark-compare only reads the
+current machine's directory. The committed Linux-CPython-3.11-64bit run was
+recorded on a single-CPU Linux VM. It is a reference for the shape of the
+numbers, not a target for Windows machines. Other machine directories are
+ignored by git.
+"""
+import os
+import shutil
+
+import pytest
+
+from benchmarks.generator import BASE_CLIENTS, REFERENCE_DATE, busiest_client, generate_database, use_database
+from core.database import execute_query
+from services.contract_service import get_contract_by_id
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark data")
+    group.addoption(
+        "--scales", default="10,100,1000",
+        help="Comma-separated multiples of the production client count"
+    )
+    group.addoption(
+        "--bench-data", default=None,
+        help="Directory to keep generated databases in between runs"
+    )
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Store runs next to the suite instead of ./.benchmarks unless overridden
+    if config.getoption("benchmark_storage", None) == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{BASELINES_DIR}"
+
+def pytest_collect_file(file_path, parent):
+    # Suite modules are named *_bench.py so the default test run skips them
+    if file_path.name.endswith("_bench.py") and not parent.session.isinitpath(file_path):
+        return pytest.Module.from_parent(parent, path=file_path)
+
+def pytest_generate_tests(metafunc):
+    if "bench_db" in metafunc.fixturenames:
+        scales = [int(scale) for scale in metafunc.config.getoption("scales").split(",")]
+        metafunc.parametrize(
+            "bench_db", scales, indirect=True, scope="session", ids=[f"{scale}x" for scale in scales]
+        )
+
+def database_path(config, tmp_path_factory, scale: int) -> str:
+    # Named by reference date so a cached file is regenerated when it moves
+    name = f"bench-{scale}x-{REFERENCE_DATE.isoformat()}.db"
+    data_dir = config.getoption("bench_data")
+    if data_dir:
+        os.makedirs(data_dir, exist_ok=True)
+        path = os.path.join(data_dir, name)
+    else:
+        path = str(tmp_path_factory.getbasetemp() / name)
+    if not os.path.exists(path):
+        generate_database(path, clients=BASE_CLIENTS * scale)
+    return path
+
+@pytest.fixture(scope="session")
+def bench_db(request, tmp_path_factory):
+    # Active database for one scale, plus the ids benchmarks look up
+    path = database_path(request.config, tmp_path_factory, request.param)
+    with use_database(path):
+        busiest = busiest_client()
+        contract = get_contract_by_id(busiest["contract_id"])
+        client = execute_query(
+            "SELECT display_name FROM clients WHERE client_id = ?", (busiest["client_id"],), fetch_one=True
+        )
+        latest = execute_query(
+            "SELECT MAX(payment_id) AS payment_id FROM payments WHERE client_id = ? AND valid_to IS NULL",
+            (busiest["client_id"],),
+            fetch_one=True
+        )
+        yield {
+            "path": path,
+            "scale": request.param,
+            "client_id": busiest["client_id"],
+            "contract_id": busiest["contract_id"],
+            "payment_id": latest["payment_id"],
+            "schedule": contract.payment_schedule,
+            "provider": contract.provider_name,
+            "search": client["display_name"].split()[0],
+            "year": REFERENCE_DATE.year - 1,
+        }
+
+@pytest.fixture(scope="session")
+def scratch_db(bench_db, tmp_path_factory):
+    # Copy of the scale's database for benchmarks that commit writes
+    path = str(tmp_path_factory.getbasetemp() / f"scratch-{bench_db['scale']}x.db")
+    shutil.copyfile(bench_db["path"], path)
+    return path
+
+@pytest.fixture
+def payment_payload(bench_db):
+    # One period of the busiest client's contract, as the payment form sends it
+    payload = {
+        "contract_id": bench_db["contract_id"],
+        "client_id": bench_db["client_id"],
+        "received_date": REFERENCE_DATE.isoformat(),
+        "total_assets": 1_250_000.0,
+        "expected_fee": 625.0,
+        "actual_fee": 625.0,
+        "method": "Auto - ACH",
+        "notes": None,
+    }
+    year = bench_db["year"]
+    if bench_db["schedule"] == "monthly":
+        payload.update(
+            applied_start_month=12, applied_start_month_year=year,
+            applied_end_month=12, applied_end_month_year=year
+        )
+    else:
+        payload.update(
+            applied_start_quarter=4, applied_start_quarter_year=year,
+            applied_end_quarter=4, applied_end_quarter_year=year
+        )
+    return payload
@@ -0,0 +1,82 @@
+"""HTTP endpoints through the full middleware stack at each benchmark scale.
+
+Reads go against the generated database; writes commit, so they run against
+a scratch copy of it.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.generator import use_database
+from main import app
+
+@pytest.fixture(scope="module")
+def client():
+    # Browser-like Accept-Encoding so compression is part of the measurement
+    return TestClient(app, headers={"Accept-Encoding": "gzip, br"})
+
+def get(client, path, status=200):
+    response = client.get(path)
+    assert response.status_code == status, response.text
+    return response
+
+@pytest.mark.parametrize("path", [
+    "/health",
+    "/clients/",
+    "/clients/?limit=50&sort=next_due",
+    "/clients/?status=red&limit=50",
+    "/clients/summaries",
+])
+def test_roster(benchmark, bench_db, client, path):
+    benchmark(get, client, path)
+
+def test_roster_search(benchmark, bench_db, client):
+    benchmark(get, client, f"/clients/?q={bench_db['search']}&limit=50")
+
+def test_roster_revalidation(benchmark, bench_db, client):
+    etag = get(client, "/clients/").headers["ETag"]
+    response = benchmark(client.get, "/clients/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+@pytest.mark.parametrize("path", [
+    "/clients/{client_id}",
+    "/clients/{client_id}/summary",
+    "/clients/{client_id}/contract",
+    "/clients/{client_id}/payments?limit=100",
+    "/clients/{client_id}/payments?limit=100&year={year}",
+    "/contracts/{contract_id}",
+    "/contracts/client/{client_id}",
+    "/contracts/{contract_id}/expected-fee?total_assets=1250000",
+    "/contracts/{contract_id}/periods?client_id={client_id}",
+    "/contracts/{contract_id}/periods?client_id={client_id}&unpaid_only=true",
+    "/payments/{payment_id}",
+    "/payments/export?client_id={client_id}",
+    "/providers/{provider}/summary",
+    "/providers/summary?year={year}",
+    "/metrics",
+    "/debug/slow-queries",
+])
+def test_client_detail(benchmark, bench_db, client, path):
+    benchmark(get, client, path.format(**bench_db))
+
+def test_create_payment(benchmark, bench_db, scratch_db, client, payment_payload):
+    with use_database(scratch_db):
+        response = benchmark(client.post, "/payments/", json=payment_payload)
+    assert response.status_code == 200, response.text
+
+def test_update_payment(benchmark, bench_db, scratch_db, client, payment_payload):
+    with use_database(scratch_db):
+        response = benchmark(client.put, f"/payments/{bench_db['payment_id']}", json=payment_payload)
+    assert response.status_code == 200, response.text
+
+def test_delete_payment(benchmark, bench_db, scratch_db, client, payment_payload):
+    def create():
+        created = client.post("/payments/", json=payment_payload).json()
+        return (f"/payments/{created['payment_id']}",), {}
+
+    with use_database(scratch_db):
+        benchmark.pedantic(client.delete, setup=create, rounds=50)
+
+def test_bulk_create_payments(benchmark, bench_db, scratch_db, client, payment_payload):
+    with use_database(scratch_db):
+        response = benchmark(client.post, "/payments/bulk", json=[payment_payload] * 12)
+    assert response.status_code == 200, response.text
@@ -0,0 +1,234 @@
+"""Deterministic synthetic database for benchmarks and plan audits.
+
+The fee type / schedule mix, providers and payment methods follow the
+production data (~30 clients, payments since 2019); scale by passing a
+larger client count. Dates are anchored to REFERENCE_DATE rather than
+today: payments run up to the month before it and compliance is computed as
+of it, so statuses come out as a realistic mix and the same arguments always
+produce the same rows, whenever they are run.
+
+    python -m benchmarks.generator /tmp/bench.db --clients 3000 --years 5
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core import database
+from core.config import BASE_DIR, DB_PRAGMAS
+from core.database import ConnectionPool, execute_query
+
+SCHEMA_PATH = os.path.join(BASE_DIR, "data", "clean_schema.sql")
+
+# "Today" for generated data; moving it changes every generated database
+REFERENCE_DATE = date(2025, 1, 1)
+
+# Client count of the production database; benchmark scales multiply this
+BASE_CLIENTS = 30
+
+# (fee_type, payment_schedule, weight), weighted like the production contracts
+FEE_MIXES = [
+    ("percentage", "monthly", 12),
+    ("flat", "quarterly", 10),
+    ("percentage", "quarterly", 5),
+    ("flat", "monthly", 2),
+]
+
+PROVIDERS = [
+    "John Hancock", "Voya", "Empower", "Fidelity", "Ascensus", "Principal",
+    "Capital Group / American Funds", "Transamerica", "Ascensus Trust Company",
+]
+
+METHODS = ["Auto - ACH", "Auto - Check", "Invoice - Check", "Wire Transfer", "Check"]
+
+NAME_WORDS = [
+    "Alder", "Beacon", "Cedar", "Summit", "Harbor", "Granite", "Maple", "Pioneer", "Riverside",
+    "Keystone", "Lakeside", "Northstar", "Oakridge", "Pinnacle", "Redwood", "Silver", "Trinity",
+    "Valley", "Westfield", "Evergreen", "Frontier", "Heritage", "Liberty", "Meridian",
+]
+NAME_KINDS = [
+    "Dental", "Engineering", "Family Practice", "Construction", "Law Group", "Logistics",
+    "Orthopedics", "Architects", "Veterinary", "Manufacturing", "Insurance", "Realty",
+]
+
+MISSED_PAYMENT_RATE = 0.05
+SPLIT_PAYMENT_RATE = 0.03
+NO_PAYMENTS_RATE = 0.03
+INACTIVE_CLIENT_RATE = 0.02
+
+def client_row(rng: random.Random, client_id: int) -> Tuple:
+    name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_KINDS)}"
+    return (
+        client_id,
+        f"{name} {client_id}",
+        f"{name.upper()} {client_id} 401(K) PLAN",
+        f"{rng.randint(2015, 2022)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        None,
+        "2025-01-01 00:00:00" if rng.random() < INACTIVE_CLIENT_RATE else None,
+    )
+
+def contract_row(rng: random.Random, client_id: int, start_ym: int) -> Tuple:
+    fee_type, schedule = rng.choices(
+        [(fee, sched) for fee, sched, _ in FEE_MIXES], 
+        weights=[weight for _, _, weight in FEE_MIXES]
+    )[0]
+    periods_per_year = 12 if schedule == "monthly" else 4
+    percent_rate = flat_rate = None
+    if fee_type == "percentage":
+        # Annual 0.15% - 0.85%, stored per payment period
+        percent_rate = round(rng.uniform(0.0015, 0.0085) / periods_per_year, 6)
+    else:
+        flat_rate = round(rng.choice([6000, 10000, 15000, 20000, 30000]) / periods_per_year, 2)
+    return (
+        client_id, client_id, f"C-{client_id:06d}", rng.choice(PROVIDERS),
+        f"{start_ym // 12}-{start_ym % 12 + 1:02d}-01", fee_type, percent_rate, flat_rate,
+        schedule, rng.randint(5, 600),
+    )
+
+def payment_rows(rng: random.Random, contract: Tuple, start_ym: int, end_ym: int) -> List[Tuple]:
+    contract_id, client_id = contract[0], contract[1]
+    fee_type, percent_rate, flat_rate, schedule = contract[5], contract[6], contract[7], contract[8]
+    monthly = schedule == "monthly"
+    step = 1 if monthly else 3
+    first = start_ym if monthly else start_ym - start_ym % 3
+    assets = rng.uniform(100_000, 5_000_000)
+    method = rng.choice(METHODS)
+    
+    rows = []
+    ym = first
+    while ym + step - 1 <= end_ym:
+        span = 1
+        if rng.random() < SPLIT_PAYMENT_RATE:
+            span = rng.randint(2, 3)
+        last = min(ym + span * step - 1, end_ym)
+        span = (last - ym + 1) // step
+        assets *= 1 + rng.gauss(0.004 * step, 0.01 * step)
+        
+        if rng.random() >= MISSED_PAYMENT_RATE:
+            reported_assets = round(assets) if fee_type == "percentage" and rng.random() < 0.9 else None
+            expected = (assets * percent_rate if fee_type == "percentage" else flat_rate) * span
+            actual = expected if rng.random() < 0.4 else expected * rng.uniform(0.93, 1.04)
+            received = last + 1
+            day = rng.randint(3, 25)
+            if monthly:
+                period = (ym % 12 + 1, ym // 12, last % 12 + 1, last // 12, None, None, None, None)
+            else:
+                period = (None, None, None, None, ym % 12 // 3 + 1, ym // 12, last % 12 // 3 + 1, last // 12)
+            rows.append((
+                contract_id, client_id, f"{received // 12}-{received % 12 + 1:02d}-{day:02d}",
+                reported_assets, round(expected, 2), round(actual, 2), method, None, *period,
+            ))
+        ym = last + 1
+    return rows
+
+@contextmanager
+def use_database(path: str, pool_size: int = 4) -> Iterator[ConnectionPool]:
+    # Point core.database at another file for the duration, dropping
+    # in-process caches that are keyed by ids from the previous database
+    from services.contract_service import invalidate_contract_cache
+    
+    previous = database._pool
+    database._pool = ConnectionPool(path, size=pool_size, pragmas=DB_PRAGMAS)
+    invalidate_contract_cache()
+    try:
+        yield database._pool
+    finally:
+        database._pool.close()
+        database._pool = previous
+        invalidate_contract_cache()
+
+def generate_database(
+    path: str, 
+    clients: int = BASE_CLIENTS, 
+    years: int = 5, 
+    end_ym: Optional[int] = None, 
+    seed: int = 0,
+    derived: bool = True
+) -> Dict[str, int]:
+    # derived=True fills summaries, metrics and compliance through the same
+    # maintenance code the app runs
+    # end_ym is the last month covered, as year * 12 + month - 1
+    if end_ym is None:
+        end_ym = REFERENCE_DATE.year * 12 + REFERENCE_DATE.month - 2
+    rng = random.Random(seed)
+    window_start = end_ym - years * 12 + 1
+    
+    client_rows, contract_rows, payments = [], [], []
+    for client_id in range(1, clients + 1):
+        client_rows.append(client_row(rng, client_id))
+        # Most clients predate the window; the rest were onboarded during it
+        start_ym = window_start if rng.random() < 0.7 else rng.randint(window_start, end_ym - 6)
+        contract = contract_row(rng, client_id, start_ym)
+        contract_rows.append(contract)
+        if rng.random() >= NO_PAYMENTS_RATE:
+            payments += payment_rows(rng, contract, start_ym, end_ym)
+    
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    with open(SCHEMA_PATH, "r") as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        """INSERT INTO clients (client_id, display_name, full_name, ima_signed_date, onedrive_folder_path, valid_to)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        client_rows
+    )
+    conn.executemany(
+        """INSERT INTO contracts (contract_id, client_id, contract_number, provider_name, contract_start_date,
+                                  fee_type, percent_rate, flat_rate, payment_schedule, num_people)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        contract_rows
+    )
+    conn.executemany(
+        """INSERT INTO payments (contract_id, client_id, received_date, total_assets, expected_fee, actual_fee,
+                                 method, notes,
+                                 applied_start_month, applied_start_month_year, applied_end_month, applied_end_month_year,
+                                 applied_start_quarter, applied_start_quarter_year, 
+                                 applied_end_quarter, applied_end_quarter_year)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        payments
+    )
+    conn.commit()
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+    
+    if derived:
+        from services.client_service import refresh_client_compliance
+        from services.maintenance_service import run_maintenance
+        with use_database(path):
+            run_maintenance()
+            # Maintenance judges compliance as of the real date
+            refresh_client_compliance(today=datetime.combine(REFERENCE_DATE, datetime.min.time()))
+    
+    return {"clients": len(client_rows), "contracts": len(contract_rows), "payments": len(payments)}
+
+def busiest_client() -> Dict[str, int]:
+    # Client and contract with the longest payment history in the active database
+    return execute_query("""
+        SELECT client_id, contract_id FROM payments 
+        WHERE valid_to IS NULL 
+        GROUP BY client_id 
+        ORDER BY COUNT(*) DESC, client_id 
+        LIMIT 1
+    """, fetch_one=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--clients", type=int, default=BASE_CLIENTS)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    if os.path.exists(args.path):
+        parser.error(f"{args.path} already exists")
+    started = time.perf_counter()
+    counts = generate_database(args.path, args.clients, args.years, seed=args.seed)
+    print(", ".join(f"{n:,} {name}" for name, n in counts.items()) + f" in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Concurrent load against the app with a realistic request mix.
+
+Workers loop over roster listings, summaries, payment pages and payment
+creation for the duration and report p50/p95/p99 latency and requests/sec
+per scenario. By default the app is served by uvicorn in this process over a
+generated database; --mode asgi skips the network, and --url targets a server
+started separately (so the load generator does not share its GIL). Pool size
+and the other core.config settings come from the environment as usual. Run
+from the backend directory:
+
+    python -m benchmarks.load --clients 300 --concurrency 16 --seconds 20
+    python -m benchmarks.load --url http://127.0.0.1:8000 --read-only
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import uvicorn
+
+from benchmarks.generator import REFERENCE_DATE, generate_database, use_database
+from core.config import DB_POOL_SIZE
+
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+def roster(rng: random.Random, targets: List[Dict[str, Any]]) -> Request:
+    return "GET", rng.choice([
+        "/clients/",
+        "/clients/?limit=50&sort=next_due",
+        "/clients/?status=red&limit=50",
+        f"/clients/?q={rng.choice(targets)['search']}&limit=50",
+    ]), None
+
+def summaries(rng: random.Random, targets: List[Dict[str, Any]]) -> Request:
+    if rng.random() < 0.25:
+        return "GET", "/clients/summaries", None
+    return "GET", f"/clients/{rng.choice(targets)['client_id']}/summary", None
+
+def payment_page(rng: random.Random, targets: List[Dict[str, Any]]) -> Request:
+    client_id = rng.choice(targets)["client_id"]
+    if rng.random() < 0.3:
+        return "GET", f"/clients/{client_id}/payments?limit=10&year={REFERENCE_DATE.year - rng.randint(1, 4)}", None
+    return "GET", f"/clients/{client_id}/payments?limit=10&page={rng.randint(1, 3)}", None
+
+def create_payment(rng: random.Random, targets: List[Dict[str, Any]]) -> Request:
+    target = rng.choice(targets)
+    year = REFERENCE_DATE.year - 1
+    payload = {
+        "contract_id": target["contract_id"],
+        "client_id": target["client_id"],
+        "received_date": REFERENCE_DATE.isoformat(),
+        "total_assets": round(rng.uniform(100_000, 5_000_000)),
+        "expected_fee": None,
+        "actual_fee": round(rng.uniform(500, 5000), 2),
+        "method": "Auto - ACH",
+        "notes": None,
+    }
+    if target["schedule"] == "monthly":
+        month = rng.randint(1, 12)
+        payload.update(
+            applied_start_month=month, applied_start_month_year=year,
+            applied_end_month=month, applied_end_month_year=year
+        )
+    else:
+        quarter = rng.randint(1, 4)
+        payload.update(
+            applied_start_quarter=quarter, applied_start_quarter_year=year,
+            applied_end_quarter=quarter, applied_end_quarter_year=year
+        )
+    return "POST", "/payments/", payload
+
+# (name, weight, request builder); weights follow the page views of a day of
+# payment entry: mostly payment history and the roster, one write in ten
+SCENARIOS: List[Tuple[str, int, Callable[[random.Random, List[Dict[str, Any]]], Request]]] = [
+    ("roster", 30, roster),
+    ("summaries", 15, summaries),
+    ("payment page", 45, payment_page),
+    ("create payment", 10, create_payment),
+]
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+@contextmanager
+def serve(app: Any) -> Iterator[str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    # Lifespan off: the pool is already set up, and maintenance would skew the run
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"))
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+async def load_targets(client: httpx.AsyncClient, limit: int = 50) -> List[Dict[str, Any]]:
+    roster_page = await client.get("/clients/", params={"limit": limit, "sort": "last_payment", "order": "desc"})
+    roster_page.raise_for_status()
+    targets = []
+    for row in roster_page.json():
+        response = await client.get(f"/contracts/client/{row['client_id']}")
+        if response.status_code != 200:
+            continue
+        contract = response.json()
+        targets.append({
+            "client_id": row["client_id"],
+            "contract_id": contract["contract_id"],
+            "schedule": (contract["payment_schedule"] or "").lower(),
+            "search": row["display_name"].split()[0],
+        })
+    if not targets:
+        raise RuntimeError("No clients with contracts to load test against")
+    return targets
+
+async def worker(
+    client: httpx.AsyncClient,
+    scenarios: List[Tuple[str, int, Callable]],
+    targets: List[Dict[str, Any]],
+    rng: random.Random,
+    record_from: float,
+    deadline: float,
+    revalidate: bool,
+    results: Dict[str, List[float]],
+    errors: Dict[str, int]
+) -> None:
+    builders = [builder for _, _, builder in scenarios]
+    names = [name for name, _, _ in scenarios]
+    weights = [weight for _, weight, _ in scenarios]
+    etags: Dict[str, str] = {}
+
+    while time.perf_counter() < deadline:
+        index = rng.choices(range(len(scenarios)), weights=weights)[0]
+        method, path, payload = builders[index](rng, targets)
+        headers = {"If-None-Match": etags[path]} if revalidate and path in etags else {}
+
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=payload, headers=headers)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            response, failed = None, True
+        finished = time.perf_counter()
+
+        if revalidate and response is not None and "ETag" in response.headers:
+            etags[path] = response.headers["ETag"]
+        if started >= record_from:
+            results[names[index]].append(finished - started)
+            if failed:
+                errors[names[index]] += 1
+
+async def run_load(
+    base_url: Optional[str],
+    app: Any,
+    concurrency: int,
+    seconds: float,
+    warmup: float,
+    scenarios: List[Tuple[str, int, Callable]],
+    revalidate: bool,
+    seed: int
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    # No URL means calling the ASGI app directly, without sockets
+    transport = None if base_url else httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=base_url or "http://testserver",
+        transport=transport,
+        limits=limits,
+        timeout=60,
+        headers={"Accept-Encoding": "gzip, br"}
+    ) as client:
+        targets = await load_targets(client)
+        results = {name: [] for name, _, _ in scenarios}
+        errors = {name: 0 for name, _, _ in scenarios}
+
+        started = time.perf_counter()
+        record_from = started + warmup
+        deadline = record_from + seconds
+        await asyncio.gather(*(
+            worker(client, scenarios, targets, random.Random(seed + n), record_from, deadline, revalidate, results, errors)
+            for n in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - record_from
+
+    return results, errors, elapsed
+
+def report(results: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> None:
+    print(f"\n{'scenario':<16} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9}")
+    rows = list(results.items()) + [("all", [t for timings in results.values() for t in timings])]
+    for name, timings in rows:
+        ordered = sorted(timings)
+        failed = sum(errors.values()) if name == "all" else errors[name]
+        print(
+            f"{name:<16} {len(ordered):>9,} {failed:>7,} "
+            f"{percentile(ordered, 0.50) * 1000:>9.2f} {percentile(ordered, 0.95) * 1000:>9.2f} "
+            f"{percentile(ordered, 0.99) * 1000:>9.2f} {len(ordered) / elapsed:>9.1f}"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Load an already running server instead of starting one")
+    parser.add_argument("--mode", choices=["uvicorn", "asgi"], default="uvicorn")
+    parser.add_argument("--db", help="Database to serve (copied first); generated when omitted")
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--read-only", action="store_true", help="Leave out payment creation")
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match with the last ETag per URL")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if not (args.read_only and s[0] == "create payment")]
+
+    with ExitStack() as stack:
+        base_url, app = args.url, None
+        if not base_url:
+            from main import app
+
+            tmp = stack.enter_context(tempfile.TemporaryDirectory())
+            path = os.path.join(tmp, "load.db")
+            if args.db:
+                shutil.copyfile(args.db, path)
+            else:
+                generate_database(path, args.clients)
+            stack.enter_context(use_database(path, pool_size=DB_POOL_SIZE))
+            if args.mode == "uvicorn":
+                base_url = stack.enter_context(serve(app))
+
+        results, errors, elapsed = asyncio.run(run_load(
+            base_url, app, args.concurrency, args.seconds, args.warmup, scenarios, args.revalidate, args.seed
+        ))
+
+    print(f"{args.concurrency} workers, {elapsed:.1f}s against {args.url or args.mode}")
+    report(results, errors, elapsed)
+
+if __name__ == "__main__":
+    main()
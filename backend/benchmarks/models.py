@@ -0,0 +1,107 @@
+"""Rows/sec for response model construction, serialization and each endpoint.
+
+Compares per-row validation, model_construct and one batch TypeAdapter
+validation on the same database rows; FastAPI's response_model pass against
+model_response; then whole requests through the app. Run from the backend
+directory:
+
+    python -m benchmarks.models --clients 500 --repeat 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from benchmarks.generator import busiest_client, generate_database, use_database
+from core.database import execute_query
+from core.responses import model_response
+from models.clients import Client, ClientList
+from models.payments import PaymentWithDetails, PaymentWithDetailsList
+from services.payment_service import enrich_payments
+
+def rows_per_second(fn: Callable[[], Any], rows: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return rows / best
+
+def compare_construction(label: str, model: Any, adapter: TypeAdapter, rows: List[Dict[str, Any]], repeat: int) -> None:
+    rates = {
+        "per-row": rows_per_second(lambda: [model(**row) for row in rows], len(rows), repeat),
+        "construct": rows_per_second(lambda: [model.model_construct(**row) for row in rows], len(rows), repeat),
+        "batch": rows_per_second(lambda: adapter.validate_python(rows), len(rows), repeat),
+    }
+    print(f"{label:<22}" + "   ".join(f"{name}: {rate:>10,.0f}" for name, rate in rates.items()))
+
+def compare_serialization(label: str, model: Any, adapter: TypeAdapter, items: List[Any], repeat: int) -> None:
+    # The response_model pass FastAPI runs on returned models vs serializing directly
+    response_field = create_response_field(name="response", type_=List[model])
+    loop = asyncio.new_event_loop()
+    fastapi_rate = rows_per_second(
+        lambda: loop.run_until_complete(serialize_response(field=response_field, response_content=items)),
+        len(items), repeat
+    )
+    loop.close()
+    direct_rate = rows_per_second(lambda: model_response(adapter, items), len(items), repeat)
+    print(f"{label:<22}response_model: {fastapi_rate:>10,.0f}   model_response: {direct_rate:>10,.0f}")
+
+def endpoint(client: TestClient, label: str, path: str, repeat: int) -> None:
+    rows = len(client.get(path).json())
+    rate = rows_per_second(lambda: client.get(path), rows, repeat)
+    print(f"{label:<38} {rate:>12,.0f} rows/s   ({rows} rows/request)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        generate_database(path, args.clients, args.years)
+        with use_database(path):
+            client_rows = execute_query("""
+                SELECT cm.*, c.*, co.provider_name FROM clients c
+                LEFT JOIN client_metrics cm ON cm.client_id = c.client_id
+                LEFT JOIN contracts co ON co.client_id = c.client_id
+            """)
+            payment_rows = enrich_payments(execute_query("""
+                SELECT p.*, c.display_name AS client_name, co.provider_name, co.fee_type,
+                       co.percent_rate, co.flat_rate, co.payment_schedule
+                FROM payments p
+                JOIN clients c ON c.client_id = p.client_id
+                JOIN contracts co ON co.contract_id = p.contract_id
+                LIMIT 5000
+            """))
+            
+            print("Model construction (rows/s)")
+            compare_construction("Client", Client, ClientList, client_rows, args.repeat)
+            compare_construction("PaymentWithDetails", PaymentWithDetails, PaymentWithDetailsList, payment_rows, args.repeat)
+            
+            print("\nResponse serialization (rows/s)")
+            clients = ClientList.validate_python(client_rows)
+            payments = PaymentWithDetailsList.validate_python(payment_rows)
+            compare_serialization("Client", Client, ClientList, clients, args.repeat)
+            compare_serialization("PaymentWithDetails", PaymentWithDetails, PaymentWithDetailsList, payments, args.repeat)
+            
+            # Imported late so the app binds to the benchmark pool, not DB_PATH
+            from main import app
+            client = TestClient(app)
+            print("\nThrough the app")
+            endpoint(client, "GET /clients/", "/clients/", args.repeat)
+            payments_path = f"/clients/{busiest_client()['client_id']}/payments?limit=100"
+            endpoint(client, "GET /clients/{id}/payments?limit=100", payments_path, args.repeat)
+            endpoint(client, "GET /clients/summaries", "/clients/summaries", args.repeat)
+
+if __name__ == "__main__":
+    main()
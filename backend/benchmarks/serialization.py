@@ -0,0 +1,83 @@
+"""Serialization and compression cost per endpoint payload.
+
+Times the steps FastAPI runs after the service returns: response-model
+serialization, JSON rendering with the stdlib and with orjson, and gzip or
+brotli encoding. Run from the backend directory:
+
+    python -m benchmarks.serialization --clients 500 --repeat 20
+"""
+import argparse
+import gzip
+import os
+import tempfile
+import time
+from typing import Any, Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from benchmarks.generator import busiest_client, generate_database, use_database
+from core.compression import brotli
+from core.config import GZIP_LEVEL, BROTLI_QUALITY
+from core.responses import orjson
+from models.clients import Client, ClientSummary
+from models.payments import PaymentWithDetails
+from services.client_service import get_all_clients, get_client_summaries
+from services.payment_service import get_client_payments
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+def report(label: str, model: Any, items: List[Any], repeat: int) -> None:
+    adapter = TypeAdapter(List[model])
+    # What FastAPI does with a response_model before handing content to the response class
+    content = adapter.dump_python(items, mode="json")
+    stdlib_body = JSONResponse(content).body
+    
+    timings = {
+        "model dump": best_of(lambda: adapter.dump_python(items, mode="json"), repeat),
+        "jsonable_encoder": best_of(lambda: jsonable_encoder(items), repeat),
+        "json render": best_of(lambda: JSONResponse(content), repeat),
+    }
+    if orjson is not None:
+        timings["orjson render"] = best_of(lambda: ORJSONResponse(content), repeat)
+    timings[f"gzip-{GZIP_LEVEL}"] = best_of(lambda: gzip.compress(stdlib_body, GZIP_LEVEL), repeat)
+    sizes = {"raw": len(stdlib_body), "gzip": len(gzip.compress(stdlib_body, GZIP_LEVEL))}
+    if brotli is not None:
+        timings[f"br-{BROTLI_QUALITY}"] = best_of(
+            lambda: brotli.compress(stdlib_body, quality=BROTLI_QUALITY), repeat
+        )
+        sizes["br"] = len(brotli.compress(stdlib_body, quality=BROTLI_QUALITY))
+    
+    print(f"\n{label} ({len(items)} rows)")
+    for step, ms in timings.items():
+        print(f"  {step:<18} {ms:>9.3f} ms")
+    print("  " + "   ".join(f"{name}: {size:,} B" for name, size in sizes.items()))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--page", type=int, default=100, help="Payment page size")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        generate_database(path, args.clients, args.years)
+        with use_database(path):
+            report("GET /clients/", Client, get_all_clients(), args.repeat)
+            report(
+                f"GET /clients/{{id}}/payments?limit={args.page}", 
+                PaymentWithDetails, get_client_payments(busiest_client()["client_id"], limit=args.page), args.repeat
+            )
+            report("GET /clients/summaries", ClientSummary, get_client_summaries(), args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Service functions at each benchmark scale.
+
+Writes run inside a transaction that is rolled back, so every round sees the
+same data.
+"""
+from benchmarks.generator import REFERENCE_DATE
+from core.database import transaction
+from models.payments import PaymentCreate
+from services.client_service import (
+    get_client_by_id, get_client_summaries, get_client_summary, refresh_client_compliance, search_clients
+)
+from services.contract_service import calculate_expected_fee, get_client_contract, get_contract_by_id
+from services.export_service import csv_stream, iter_payment_export
+from services.provider_service import get_provider_summaries, get_provider_summary, rebuild_provider_summaries
+from services.payment_service import (
+    bulk_create_payments, create_payment, delete_payment, encode_payment_cursor, get_available_periods,
+    get_client_payments, get_payment_by_id, reconcile_client_metrics, update_payment
+)
+from services.summary_service import rebuild_client_summaries
+
+class Rollback(Exception):
+    pass
+
+def rolled_back(fn, *args):
+    def run():
+        try:
+            with transaction():
+                fn(*args)
+                raise Rollback()
+        except Rollback:
+            pass
+    return run
+
+def drain(stream):
+    return sum(len(chunk) for chunk in stream)
+
+def test_search_clients_all(benchmark, bench_db):
+    clients, total = benchmark(search_clients)
+    assert len(clients) == total
+
+def test_search_clients_page(benchmark, bench_db):
+    clients, total = benchmark(search_clients, sort="next_due", limit=50)
+    assert len(clients) == min(50, total)
+
+def test_search_clients_name(benchmark, bench_db):
+    clients, _ = benchmark(search_clients, search=bench_db["search"], limit=50)
+    assert clients
+
+def test_search_clients_filtered(benchmark, bench_db):
+    benchmark(search_clients, provider=bench_db["provider"], status="red", sort="last_payment", limit=50)
+
+def test_get_client_by_id(benchmark, bench_db):
+    assert benchmark(get_client_by_id, bench_db["client_id"])
+
+def test_get_client_summary(benchmark, bench_db):
+    assert benchmark(get_client_summary, bench_db["client_id"])
+
+def test_get_client_summaries(benchmark, bench_db):
+    assert benchmark(get_client_summaries)
+
+def test_get_client_payments_page(benchmark, bench_db):
+    assert len(benchmark(get_client_payments, bench_db["client_id"], limit=100)) > 0
+
+def test_get_client_payments_cursor(benchmark, bench_db):
+    first = get_client_payments(bench_db["client_id"], limit=10)
+    cursor = encode_payment_cursor(first[-1])
+    benchmark(get_client_payments, bench_db["client_id"], limit=10, cursor=cursor)
+
+def test_get_client_payments_year(benchmark, bench_db):
+    assert benchmark(get_client_payments, bench_db["client_id"], limit=100, year=bench_db["year"])
+
+def test_get_payment_by_id(benchmark, bench_db):
+    assert benchmark(get_payment_by_id, bench_db["payment_id"])
+
+def test_get_available_periods(benchmark, bench_db):
+    periods = benchmark(
+        get_available_periods, bench_db["contract_id"], bench_db["client_id"], today=REFERENCE_DATE
+    )
+    assert periods.periods
+
+def test_get_contract_by_id(benchmark, bench_db):
+    assert benchmark(get_contract_by_id, bench_db["contract_id"])
+
+def test_get_client_contract(benchmark, bench_db):
+    assert benchmark(get_client_contract, bench_db["client_id"])
+
+def test_calculate_expected_fee(benchmark, bench_db):
+    benchmark(calculate_expected_fee, bench_db["contract_id"], 1_250_000.0)
+
+def test_export_client_csv(benchmark, bench_db):
+    assert benchmark(lambda: drain(csv_stream(iter_payment_export(client_id=bench_db["client_id"]))))
+
+def test_export_provider_year_csv(benchmark, bench_db):
+    year = bench_db["year"]
+    benchmark(lambda: drain(csv_stream(iter_payment_export(
+        provider=bench_db["provider"], start_date=f"{year}-01-01", end_date=f"{year}-12-31"
+    ))))
+
+def test_get_provider_summary(benchmark, bench_db):
+    assert benchmark(get_provider_summary, bench_db["provider"])
+
+def test_get_provider_summaries(benchmark, bench_db):
+    assert benchmark(get_provider_summaries, bench_db["year"])
+
+def test_create_payment(benchmark, bench_db, payment_payload):
+    benchmark(rolled_back(create_payment, PaymentCreate(**payment_payload)))
+
+def test_update_payment(benchmark, bench_db, payment_payload):
+    benchmark(rolled_back(update_payment, bench_db["payment_id"], PaymentCreate(**payment_payload)))
+
+def test_delete_payment(benchmark, bench_db):
+    benchmark(rolled_back(delete_payment, bench_db["payment_id"]))
+
+def test_bulk_create_payments(benchmark, bench_db, payment_payload):
+    payments = [PaymentCreate(**payment_payload) for _ in range(12)]
+    benchmark(rolled_back(bulk_create_payments, payments))
+
+def test_rebuild_client_summaries(benchmark, bench_db):
+    benchmark(rolled_back(rebuild_client_summaries, bench_db["client_id"]))
+
+def test_rebuild_provider_summaries(benchmark, bench_db):
+    benchmark(rolled_back(rebuild_provider_summaries, bench_db["provider"]))
+
+def test_refresh_client_compliance(benchmark, bench_db):
+    benchmark(rolled_back(refresh_client_compliance))
+
+def test_reconcile_client_metrics(benchmark, bench_db):
+    benchmark(rolled_back(reconcile_client_metrics))
@@ -3,6 +3,49 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DB_PATH = os.environ.get("DB_PATH", f"{BASE_DIR}/data/401k_payments.db")
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+# Streaming exports hold a connection for their whole run. At most
+# DB_STREAM_LIMIT stream at once, on connections the pool keeps on top of the
+# DB_POOL_SIZE that back the run_db workers
+DB_STREAM_LIMIT = int(os.environ.get("DB_STREAM_LIMIT", "2"))
+
+# Applied to every pooled connection when it is opened. cache_size is negative
+# to mean KiB rather than pages; busy_timeout is in milliseconds.
+DB_PRAGMAS = {
+    "journal_mode": os.environ.get("DB_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("DB_SYNCHRONOUS", "NORMAL"),
+    "cache_size": int(os.environ.get("DB_CACHE_SIZE", "-16384")),
+    "mmap_size": int(os.environ.get("DB_MMAP_SIZE", str(64 * 1024 * 1024))),
+    "busy_timeout": int(os.environ.get("DB_BUSY_TIMEOUT", "5000")),
+    "temp_store": os.environ.get("DB_TEMP_STORE", "MEMORY"),
+}
+
+# Seconds between background maintenance runs (summary rebuild, metrics reconcile, compliance rollover); 0 disables
+MAINTENANCE_INTERVAL = int(os.environ.get("MAINTENANCE_INTERVAL", str(24 * 60 * 60)))
+
+# In-process contract cache; entries expire after CONTRACT_CACHE_TTL seconds
+# and the least recently used are evicted beyond CONTRACT_CACHE_SIZE
+CONTRACT_CACHE_SIZE = int(os.environ.get("CONTRACT_CACHE_SIZE", "1024"))
+CONTRACT_CACHE_TTL = float(os.environ.get("CONTRACT_CACHE_TTL", "300"))
+
+# Rows fetched and written per chunk by the streaming payment export
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "500"))
+
+# Render JSON with orjson when it is installed; set FAST_JSON=0 to use the stdlib
+FAST_JSON = os.environ.get("FAST_JSON", "1") == "1"
+
+# Responses smaller than COMPRESSION_MINIMUM_SIZE bytes are sent as-is; brotli
+# is only offered when the brotli package is installed
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", "1024"))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "4"))
+
+# Statements at or over SLOW_QUERY_MS are kept for /debug/slow-queries, newest
+# SLOW_QUERY_LOG_SIZE only
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG_SIZE = int(os.environ.get("SLOW_QUERY_LOG_SIZE", "100"))
+
 ORIGINS = [
     "http://localhost:3000",
     "http://localhost:8000",
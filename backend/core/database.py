@@ -1,39 +1,324 @@
+import asyncio
+import functools
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Dict, List, Tuple, Union, Any
+from typing import Dict, List, Tuple, Union, Any, Optional, Callable, Iterator
 
-from .config import DB_PATH
+from .config import DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_PRAGMAS, DB_STREAM_LIMIT
+from .migrations import apply_migrations
 
 def dict_factory(cursor, row):
     return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
 
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, Any]) -> None:
+    for name, value in pragmas.items():
+        if value is None:
+            continue
+        conn.execute(f"PRAGMA {name} = {value}")
+
+class ConnectionPool:
+    def __init__(
+        self, 
+        db_path: str, 
+        size: int = DB_POOL_SIZE, 
+        timeout: float = DB_POOL_TIMEOUT,
+        pragmas: Optional[Dict[str, Any]] = None
+    ):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = DB_PRAGMAS if pragmas is None else pragmas
+        # LIFO so the most recently used (warmest page cache) connection is reused first
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = dict_factory
+        apply_pragmas(conn, self.pragmas)
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def acquire(self) -> sqlite3.Connection:
+        while True:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._connect()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError("Timed out waiting for a database connection")
+            
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            self._discard(conn)
+            return
+        
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (sqlite3.Error, queue.Full):
+            self._discard(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": self.size, "open": self._created, "idle": self._idle.qsize()}
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_stream_slots = threading.BoundedSemaphore(DB_STREAM_LIMIT)
+_local = threading.local()
+
+# Instrumentation hooks: query observers are called as (query, seconds, rows)
+# after each statement, acquire observers with the seconds spent in acquire()
+_query_observers: List[Callable[[str, float, int], None]] = []
+_acquire_observers: List[Callable[[float], None]] = []
+
+def add_query_observer(observer: Callable[[str, float, int], None]) -> None:
+    _query_observers.append(observer)
+
+def remove_query_observer(observer: Callable[[str, float, int], None]) -> None:
+    _query_observers.remove(observer)
+
+def add_acquire_observer(observer: Callable[[float], None]) -> None:
+    _acquire_observers.append(observer)
+
+def _observe_query(query: str, started: float, rows: int) -> None:
+    _report_query(query, time.perf_counter() - started, rows)
+
+def _report_query(query: str, elapsed: float, rows: int) -> None:
+    for observer in _query_observers:
+        observer(query, elapsed, rows)
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Stream slots get their own connections so exports never
+                # hold the ones the run_db workers need
+                pool = ConnectionPool(DB_PATH, size=DB_POOL_SIZE + DB_STREAM_LIMIT)
+                conn = pool.acquire()
+                try:
+                    apply_migrations(conn)
+                finally:
+                    pool.release(conn)
+                _pool = pool
+    return _pool
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _pool_lock:
+            if _executor is None:
+                # One worker per pooled connection so workers never queue on the pool
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_POOL_SIZE, 
+                    thread_name_prefix="db-worker"
+                )
+    return _executor
+
+def shutdown_executor() -> None:
+    global _executor
+    with _pool_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
 @contextmanager
 def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = dict_factory
+    pool = get_pool()
+    started = time.perf_counter()
+    conn = pool.acquire()
+    if _acquire_observers:
+        elapsed = time.perf_counter() - started
+        for observer in _acquire_observers:
+            observer(elapsed)
     try:
         yield conn
     finally:
-        conn.close()
+        pool.release(conn)
+
+def _execute(
+    conn: sqlite3.Connection,
+    query: str, 
+    params: Union[Tuple, Dict, List] = None, 
+    fetch_one: bool = False,
+    commit: bool = True
+) -> List[Dict[str, Any]]:
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    
+    if params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+        
+    if query.strip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+        if commit:
+            conn.commit()
+        _observe_query(query, started, cursor.rowcount)
+        return {"lastrowid": cursor.lastrowid, "rowcount": cursor.rowcount}
+    
+    if fetch_one:
+        row = cursor.fetchone()
+        _observe_query(query, started, 0 if row is None else 1)
+        return row
+    
+    rows = cursor.fetchall()
+    _observe_query(query, started, len(rows))
+    return rows
+
+@contextmanager
+def transaction(immediate: bool = True):
+    # Statements issued through execute_query on this thread join the open
+    # transaction, so services can call each other inside one unit of work.
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+    
+    with get_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        _local.conn = conn
+        _local.after_commit = []
+        try:
+            yield conn
+            conn.commit()
+            callbacks = _local.after_commit
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            _local.conn = None
+            _local.after_commit = None
+    
+    for callback in callbacks:
+        callback()
+
+def after_commit(callback: Callable[[], Any]) -> None:
+    # Defers callback until the open transaction commits (it is dropped on
+    # rollback); outside a transaction the write has already committed.
+    if getattr(_local, "conn", None) is None:
+        callback()
+        return
+    _local.after_commit.append(callback)
 
 def execute_query(
     query: str, 
     params: Union[Tuple, Dict, List] = None, 
     fetch_one: bool = False
 ) -> List[Dict[str, Any]]:
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return _execute(conn, query, params, fetch_one, commit=False)
+    
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-            
-        if query.strip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
-            conn.commit()
-            return {"lastrowid": cursor.lastrowid, "rowcount": cursor.rowcount}
-        
-        if fetch_one:
-            return cursor.fetchone()
-        
-        return cursor.fetchall()
\ No newline at end of file
+        return _execute(conn, query, params, fetch_one)
+
+def execute_many(query: str, params_list: List[Union[Tuple, Dict]]) -> Dict[str, Any]:
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        started = time.perf_counter()
+        cursor = conn.executemany(query, params_list)
+        _observe_query(query, started, cursor.rowcount)
+        return {"rowcount": cursor.rowcount}
+    
+    with get_db_connection() as conn:
+        started = time.perf_counter()
+        cursor = conn.executemany(query, params_list)
+        conn.commit()
+        _observe_query(query, started, cursor.rowcount)
+        return {"rowcount": cursor.rowcount}
+
+def stream_query(
+    query: str, 
+    params: Union[Tuple, Dict, List] = None, 
+    batch_size: int = 500
+) -> Iterator[List[Dict[str, Any]]]:
+    # Yields fetchmany() batches from one pooled connection held for the life
+    # of the generator. The read transaction keeps a long export on a single
+    # snapshot; release() rolls it back when the generator finishes or is closed.
+    # Observers get the time spent executing and fetching, not the time the
+    # consumer spends on each batch between yields. Streams wait for one of
+    # DB_STREAM_LIMIT slots before taking a connection.
+    if not _stream_slots.acquire(timeout=DB_POOL_TIMEOUT):
+        raise sqlite3.OperationalError("Timed out waiting for a stream slot")
+    try:
+        with get_db_connection() as conn:
+            conn.execute("BEGIN")
+            elapsed, total = 0.0, 0
+            try:
+                started = time.perf_counter()
+                cursor = conn.execute(query, params or ())
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - started
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield rows
+                    started = time.perf_counter()
+            finally:
+                _report_query(query, elapsed, total)
+    finally:
+        _stream_slots.release()
\ No newline at end of file
@@ -0,0 +1,95 @@
+import math
+import re
+import time
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .versions import data_versions
+
+# Paths whose responses depend only on one client's data
+CLIENT_SCOPED_PATHS = [
+    re.compile(r"^/clients/(\d+)(?:/|$)"),
+    re.compile(r"^/contracts/client/(\d+)/?$"),
+]
+
+def client_id_for_path(path: str) -> Optional[int]:
+    for pattern in CLIENT_SCOPED_PATHS:
+        match = pattern.match(path)
+        if match:
+            return int(match.group(1))
+    return None
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def not_modified_since(if_modified_since: str, modified: float) -> bool:
+    # HTTP dates have whole-second resolution, so compare the end of the
+    # second the last write fell in rather than truncating it
+    try:
+        return math.ceil(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+class ETagMiddleware:
+    # Conditional GET support for the read API. Validators come from
+    # core.versions rather than from the body, so a matching If-None-Match
+    # (or If-Modified-Since) is answered with 304 before any service or
+    # database work. The version is read before the handler runs: a write
+    # racing the read can only make the tag older than the body, which costs
+    # one extra full response but never serves stale data.
+    def __init__(self, app: ASGIApp, exclude: Iterable[str] = ()):
+        self.app = app
+        self.exclude = tuple(exclude)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http" 
+            or scope["method"] not in ("GET", "HEAD") 
+            or scope["path"].startswith(self.exclude)
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
+        version, modified = data_versions.current(client_id_for_path(path))
+        # The URL is part of the tag so each representation has its own
+        representation = zlib.crc32(path.encode() + b"?" + scope.get("query_string", b""))
+        etag = f'"{version}.{representation:08x}"'
+        validators = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        # Last-Modified is only sent once its second is over. Before then a
+        # write later in the same second would get the same date, and
+        # If-Modified-Since would answer 304 for a body that has changed.
+        if time.time() >= math.ceil(modified):
+            validators["Last-Modified"] = formatdate(math.ceil(modified), usegmt=True)
+        
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        if_modified_since = request_headers.get("if-modified-since")
+        if (
+            (if_none_match is not None and etag_matches(if_none_match, etag))
+            or (if_none_match is None and if_modified_since and not_modified_since(if_modified_since, modified))
+        ):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(k.lower().encode(), v.encode()) for k, v in validators.items()],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        async def send_with_validators(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                for name, value in validators.items():
+                    headers[name] = value
+            await send(message)
+        
+        await self.app(scope, receive, send_with_validators)
\ No newline at end of file
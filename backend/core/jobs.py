@@ -0,0 +1,17 @@
+import asyncio
+import logging
+from typing import Any, Callable
+
+from .database import run_db
+
+logger = logging.getLogger(__name__)
+
+async def run_periodically(func: Callable[[], Any], interval_seconds: float) -> None:
+    # Runs once immediately, then every interval; failures are logged and the
+    # loop carries on so one bad run does not stop future ones
+    while True:
+        try:
+            await run_db(func)
+        except Exception:
+            logger.exception("Periodic job %s failed", getattr(func, "__name__", func))
+        await asyncio.sleep(interval_seconds)
\ No newline at end of file
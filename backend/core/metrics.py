@@ -0,0 +1,215 @@
+import bisect
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import SLOW_QUERY_MS, SLOW_QUERY_LOG_SIZE
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Batch IN lists vary in length per call; fold them so they share one series
+_IN_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_statement(query: str) -> str:
+    return _IN_LIST.sub("?...", _WHITESPACE.sub(" ", query).strip())
+
+def label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def render(self, name: str, labels: str) -> List[str]:
+        prefix = f"{labels}," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum:.6f}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+class QueryStats:
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.query_id = f"{zlib.crc32(statement.encode()):08x}"
+        self.duration = Histogram(QUERY_BUCKETS)
+        self.rows = 0
+
+class MetricsRegistry:
+    # Process-local counters behind /metrics and /debug/slow-queries. Request
+    # series are labelled by route template, not the raw path, and statements
+    # by a normalized form, so cardinality stays bounded.
+    def __init__(self, slow_query_ms: float = 100.0, slow_query_log_size: int = 100):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, str], Histogram] = {}
+        self._queries: Dict[str, QueryStats] = {}
+        self._acquire = Histogram(QUERY_BUCKETS)
+        self._slow_queries: Deque[Dict] = deque(maxlen=slow_query_log_size)
+    
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, str(status))
+        with self._lock:
+            histogram = self._requests.get(key)
+            if histogram is None:
+                histogram = self._requests[key] = Histogram(REQUEST_BUCKETS)
+            histogram.observe(seconds)
+    
+    def observe_query(self, query: str, seconds: float, rows: int) -> None:
+        statement = normalize_statement(query)
+        with self._lock:
+            stats = self._queries.get(statement)
+            if stats is None:
+                stats = self._queries[statement] = QueryStats(statement)
+            stats.duration.observe(seconds)
+            stats.rows += rows
+            if seconds >= self.slow_query_seconds:
+                self._slow_queries.append({
+                    "query_id": stats.query_id,
+                    "statement": statement,
+                    "duration_ms": round(seconds * 1000, 3),
+                    "rows": rows,
+                    "at": time.time(),
+                })
+    
+    def observe_acquire(self, seconds: float) -> None:
+        with self._lock:
+            self._acquire.observe(seconds)
+    
+    def slow_queries(self) -> List[Dict]:
+        # Newest first
+        with self._lock:
+            return list(reversed(self._slow_queries))
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._queries.clear()
+            self._acquire = Histogram(QUERY_BUCKETS)
+            self._slow_queries.clear()
+    
+    def render(
+        self, 
+        pool_stats: Optional[Dict[str, int]] = None, 
+        cache_stats: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> str:
+        # Prometheus text exposition format 0.0.4
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (method, route, status), histogram in sorted(self._requests.items()):
+                labels = f'method="{method}",route="{label_value(route)}",status="{status}"'
+                lines += histogram.render("http_request_duration_seconds", labels)
+            
+            lines += [
+                "# HELP db_query_duration_seconds Statement execution time including fetch.",
+                "# TYPE db_query_duration_seconds histogram",
+            ]
+            queries = sorted(self._queries.values(), key=lambda stats: stats.query_id)
+            for stats in queries:
+                labels = f'query="{stats.query_id}",statement="{label_value(stats.statement[:120])}"'
+                lines += stats.duration.render("db_query_duration_seconds", labels)
+            
+            lines += [
+                "# HELP db_query_rows_total Rows returned or changed per statement.",
+                "# TYPE db_query_rows_total counter",
+            ]
+            lines += [f'db_query_rows_total{{query="{stats.query_id}"}} {stats.rows}' for stats in queries]
+            
+            lines += [
+                "# HELP db_connection_acquire_seconds Time spent waiting for a pooled connection.",
+                "# TYPE db_connection_acquire_seconds histogram",
+            ]
+            lines += self._acquire.render("db_connection_acquire_seconds", "")
+        
+        if pool_stats is not None:
+            lines += [
+                "# HELP db_pool_connections Pooled SQLite connections.",
+                "# TYPE db_pool_connections gauge",
+                f'db_pool_connections{{state="open"}} {pool_stats["open"]}',
+                f'db_pool_connections{{state="idle"}} {pool_stats["idle"]}',
+                f'db_pool_connections{{state="max"}} {pool_stats["size"]}',
+            ]
+        if cache_stats:
+            lines += [
+                "# HELP cache_lookups_total In-process cache lookups by result.",
+                "# TYPE cache_lookups_total counter",
+            ]
+            for name, stats in sorted(cache_stats.items()):
+                lines += [
+                    f'cache_lookups_total{{cache="{name}",result="hit"}} {stats["hits"]}',
+                    f'cache_lookups_total{{cache="{name}",result="miss"}} {stats["misses"]}',
+                ]
+            lines += [
+                "# HELP cache_entries Entries held by each in-process cache.",
+                "# TYPE cache_entries gauge",
+            ]
+            for name, stats in sorted(cache_stats.items()):
+                lines += [
+                    f'cache_entries{{cache="{name}",state="current"}} {stats["size"]}',
+                    f'cache_entries{{cache="{name}",state="max"}} {stats["maxsize"]}',
+                ]
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry(SLOW_QUERY_MS, SLOW_QUERY_LOG_SIZE)
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        # Answered before routing (e.g. a 304 from the ETag middleware)
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", []):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.observe_request(
+                scope["method"], route_template(scope), status, time.perf_counter() - started
+            )
\ No newline at end of file
@@ -0,0 +1,152 @@
+import sqlite3
+from typing import List, Tuple
+
+# Ordered (version, statements) pairs. data/clean_schema.sql always reflects the
+# latest version and sets PRAGMA user_version to match, so fresh databases skip
+# straight past every entry here; existing databases are brought forward on
+# first connection.
+MIGRATIONS: List[Tuple[int, List[str]]] = [
+    (1, [
+        """
+        CREATE INDEX IF NOT EXISTS idx_payments_keyset
+        ON payments(client_id, received_date DESC, payment_id DESC)
+        """,
+    ]),
+    (2, [
+        # Month ordinals (year * 12 + month - 1) of the first and last month a
+        # payment covers, so period filters become indexable range predicates
+        # instead of ORs across four *_year columns.
+        """
+        ALTER TABLE payments ADD COLUMN applied_start_ym INTEGER GENERATED ALWAYS AS (
+            CASE
+                WHEN applied_start_month IS NOT NULL
+                    THEN applied_start_month_year * 12 + applied_start_month - 1
+                WHEN applied_start_quarter IS NOT NULL
+                    THEN applied_start_quarter_year * 12 + (applied_start_quarter - 1) * 3
+            END
+        ) VIRTUAL
+        """,
+        """
+        ALTER TABLE payments ADD COLUMN applied_end_ym INTEGER GENERATED ALWAYS AS (
+            CASE
+                WHEN applied_end_month IS NOT NULL
+                    THEN applied_end_month_year * 12 + applied_end_month - 1
+                WHEN applied_end_quarter IS NOT NULL
+                    THEN applied_end_quarter_year * 12 + applied_end_quarter * 3 - 1
+            END
+        ) VIRTUAL
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_payments_applied_period
+        ON payments(client_id, applied_start_ym, applied_end_ym)
+        """,
+        "DROP INDEX IF EXISTS idx_payments_applied_months",
+    ]),
+    (3, [
+        # Year that total_ytd_payments was accumulated for; incremental updates
+        # fall back to a full recompute when it no longer matches
+        "ALTER TABLE client_metrics ADD COLUMN ytd_year INTEGER",
+    ]),
+    (4, [
+        # Summaries are maintained by services/summary_service.py on every
+        # payment write; the old triggers only handled quarterly inserts.
+        # Existing rows are rebuilt by the maintenance job.
+        "DROP TRIGGER IF EXISTS update_quarterly_after_payment",
+        "DROP TRIGGER IF EXISTS update_yearly_after_quarterly",
+    ]),
+    (5, [
+        # Compliance is stored rather than computed per request; refreshed on
+        # payment writes and by the daily maintenance run
+        "ALTER TABLE client_metrics ADD COLUMN compliance_status TEXT",
+        "ALTER TABLE client_metrics ADD COLUMN compliance_reason TEXT",
+        "ALTER TABLE client_metrics ADD COLUMN next_payment_due TEXT",
+        "ALTER TABLE client_metrics ADD COLUMN compliance_as_of TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_client_metrics_compliance ON client_metrics(compliance_status, next_payment_due)",
+    ]),
+    (6, [
+        # Roster search: an external-content FTS5 index over client names with
+        # prefix indexes for type-ahead, kept in sync by the standard triggers
+        """
+            CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+                display_name, full_name,
+                content='clients', content_rowid='client_id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """,
+        "INSERT INTO clients_fts(clients_fts) VALUES ('rebuild')",
+        """
+            CREATE TRIGGER IF NOT EXISTS clients_fts_insert AFTER INSERT ON clients BEGIN
+                INSERT INTO clients_fts(rowid, display_name, full_name)
+                VALUES (new.client_id, new.display_name, new.full_name);
+            END
+        """,
+        """
+            CREATE TRIGGER IF NOT EXISTS clients_fts_delete AFTER DELETE ON clients BEGIN
+                INSERT INTO clients_fts(clients_fts, rowid, display_name, full_name)
+                VALUES ('delete', old.client_id, old.display_name, old.full_name);
+            END
+        """,
+        """
+            CREATE TRIGGER IF NOT EXISTS clients_fts_update AFTER UPDATE OF display_name, full_name ON clients BEGIN
+                INSERT INTO clients_fts(clients_fts, rowid, display_name, full_name)
+                VALUES ('delete', old.client_id, old.display_name, old.full_name);
+                INSERT INTO clients_fts(rowid, display_name, full_name)
+                VALUES (new.client_id, new.display_name, new.full_name);
+            END
+        """,
+        # Active-row indexes for the roster's default ordering and filters
+        "CREATE INDEX IF NOT EXISTS idx_clients_active_name ON clients(display_name) WHERE valid_to IS NULL",
+        "CREATE INDEX IF NOT EXISTS idx_contracts_active_client ON contracts(client_id, provider_name) WHERE valid_to IS NULL",
+    ]),
+    (7, [
+        # Provider rollups per quarter, maintained by services/provider_service.py
+        # on every payment write. Existing payments are rolled up by the
+        # maintenance job.
+        """
+            CREATE TABLE IF NOT EXISTS provider_summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                provider_name TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                quarter INTEGER NOT NULL,
+                total_payments REAL NOT NULL DEFAULT 0,
+                expected_total REAL NOT NULL DEFAULT 0,
+                client_count INTEGER NOT NULL DEFAULT 0,
+                payment_count INTEGER NOT NULL DEFAULT 0,
+                exact_count INTEGER NOT NULL DEFAULT 0,
+                acceptable_count INTEGER NOT NULL DEFAULT 0,
+                warning_count INTEGER NOT NULL DEFAULT 0,
+                alert_count INTEGER NOT NULL DEFAULT 0,
+                unknown_count INTEGER NOT NULL DEFAULT 0,
+                last_updated TEXT,
+                UNIQUE(provider_name, year, quarter)
+            )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_provider_summaries_period ON provider_summaries(year, quarter)",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("PRAGMA user_version").fetchone()
+    return row["user_version"] if isinstance(row, dict) else row[0]
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    version = get_schema_version(conn)
+    
+    for target, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = target
+    
+    return version
\ No newline at end of file
@@ -0,0 +1,28 @@
+from typing import Any, Optional, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from .config import FAST_JSON
+
+try:
+    import orjson
+except ImportError:
+    # Optional: responses fall back to the stdlib encoder without it
+    orjson = None
+
+def default_response_class() -> Type[JSONResponse]:
+    # orjson renders the already-validated response content several times
+    # faster than json.dumps and emits compact UTF-8 directly
+    if FAST_JSON and orjson is not None:
+        return ORJSONResponse
+    return JSONResponse
+
+def model_response(adapter: TypeAdapter, content: Any, response: Optional[Response] = None) -> Response:
+    # For content the service already validated: serialize it to JSON bytes in
+    # pydantic's core and skip FastAPI's dump-and-revalidate against the
+    # response_model (which then only documents the route). Headers set on the
+    # injected response are carried over.
+    headers = dict(response.headers) if response is not None else None
+    return Response(adapter.dump_json(content), media_type="application/json", headers=headers)
\ No newline at end of file
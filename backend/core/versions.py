@@ -0,0 +1,43 @@
+import secrets
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+class DataVersions:
+    # In-process data versions behind the HTTP validators. A client bump
+    # covers that client's endpoints and everything roster-wide; bump() with
+    # no clients (maintenance, bulk rewrites) invalidates every scope. The
+    # epoch changes per process so validators never survive a restart.
+    def __init__(self):
+        self.epoch = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._global = 0
+        self._clients: Dict[int, int] = {}
+        self._generation_modified = time.time()
+        self._global_modified = self._generation_modified
+        self._client_modified: Dict[int, float] = {}
+    
+    def bump(self, client_ids: Optional[Iterable[int]] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._global += 1
+            self._global_modified = now
+            if client_ids is None:
+                self._generation += 1
+                self._generation_modified = now
+                return
+            for client_id in client_ids:
+                self._clients[client_id] = self._clients.get(client_id, 0) + 1
+                self._client_modified[client_id] = now
+    
+    def current(self, client_id: Optional[int] = None) -> Tuple[str, float]:
+        # Returns (version, last modified epoch seconds) for a scope
+        with self._lock:
+            if client_id is None:
+                return f"{self.epoch}.g{self._global}", self._global_modified
+            version = f"{self.epoch}.{self._generation}.c{client_id}.{self._clients.get(client_id, 0)}"
+            modified = max(self._generation_modified, self._client_modified.get(client_id, 0))
+            return version, modified
+
+data_versions = DataVersions()
\ No newline at end of file
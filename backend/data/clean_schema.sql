@@ -30,6 +30,24 @@ CREATE TABLE yearly_summaries (
     UNIQUE(client_id, year)
 );
 
+CREATE TABLE provider_summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    provider_name TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    quarter INTEGER NOT NULL,
+    total_payments REAL NOT NULL DEFAULT 0,
+    expected_total REAL NOT NULL DEFAULT 0,
+    client_count INTEGER NOT NULL DEFAULT 0,
+    payment_count INTEGER NOT NULL DEFAULT 0,
+    exact_count INTEGER NOT NULL DEFAULT 0,
+    acceptable_count INTEGER NOT NULL DEFAULT 0,
+    warning_count INTEGER NOT NULL DEFAULT 0,
+    alert_count INTEGER NOT NULL DEFAULT 0,
+    unknown_count INTEGER NOT NULL DEFAULT 0,
+    last_updated TEXT,
+    UNIQUE(provider_name, year, quarter)
+);
+
 CREATE TABLE contacts (
     contact_id INTEGER PRIMARY KEY AUTOINCREMENT,
     client_id INTEGER NOT NULL,
@@ -47,6 +65,7 @@ CREATE TABLE contacts (
 
 CREATE INDEX idx_quarterly_lookup ON quarterly_summaries(client_id, year, quarter);
 CREATE INDEX idx_yearly_lookup ON yearly_summaries(client_id, year);
+CREATE INDEX idx_provider_summaries_period ON provider_summaries(year, quarter);
 CREATE INDEX idx_contacts_client_id ON contacts(client_id);
 CREATE INDEX idx_contacts_type ON contacts(client_id, contact_type);
 
@@ -92,11 +111,17 @@ CREATE TABLE client_metrics (
     avg_quarterly_payment REAL,
     last_recorded_assets REAL,
     last_updated TEXT,
+    ytd_year INTEGER,
+    compliance_status TEXT,
+    compliance_reason TEXT,
+    next_payment_due TEXT,
+    compliance_as_of TEXT,
     UNIQUE(client_id),
     FOREIGN KEY(client_id) REFERENCES clients(client_id) ON DELETE CASCADE
 );
 
 CREATE INDEX idx_client_metrics_lookup ON client_metrics(client_id);
+CREATE INDEX idx_client_metrics_compliance ON client_metrics(compliance_status, next_payment_due);
 
 CREATE TABLE client_files (
     file_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -127,6 +152,23 @@ CREATE TABLE payments (
     applied_start_quarter_year INTEGER,
     applied_end_quarter INTEGER,
     applied_end_quarter_year INTEGER,
+    -- Month ordinals (year * 12 + month - 1) of the first and last month covered
+    applied_start_ym INTEGER GENERATED ALWAYS AS (
+        CASE
+            WHEN applied_start_month IS NOT NULL
+                THEN applied_start_month_year * 12 + applied_start_month - 1
+            WHEN applied_start_quarter IS NOT NULL
+                THEN applied_start_quarter_year * 12 + (applied_start_quarter - 1) * 3
+        END
+    ) VIRTUAL,
+    applied_end_ym INTEGER GENERATED ALWAYS AS (
+        CASE
+            WHEN applied_end_month IS NOT NULL
+                THEN applied_end_month_year * 12 + applied_end_month - 1
+            WHEN applied_end_quarter IS NOT NULL
+                THEN applied_end_quarter_year * 12 + applied_end_quarter * 3 - 1
+        END
+    ) VIRTUAL,
     FOREIGN KEY(client_id) REFERENCES clients(client_id) ON DELETE CASCADE,
     FOREIGN KEY(contract_id) REFERENCES contracts(contract_id) ON DELETE CASCADE
 );
@@ -143,54 +185,36 @@ CREATE TABLE payment_files (
 CREATE INDEX idx_payments_client_id ON payments(client_id);
 CREATE INDEX idx_payments_contract_id ON payments(contract_id);
 CREATE INDEX idx_payments_date ON payments(client_id, received_date DESC);
+CREATE INDEX idx_payments_keyset ON payments(client_id, received_date DESC, payment_id DESC);
+
+CREATE INDEX idx_payments_applied_period ON payments(client_id, applied_start_ym, applied_end_ym);
+
+CREATE INDEX idx_clients_active_name ON clients(display_name) WHERE valid_to IS NULL;
+CREATE INDEX idx_contracts_active_client ON contracts(client_id, provider_name) WHERE valid_to IS NULL;
 
-CREATE INDEX idx_payments_applied_months ON payments (
-    client_id,
-    applied_start_month_year,
-    applied_start_month,
-    applied_end_month_year,
-    applied_end_month
+-- Full-text search over client names for the roster
+CREATE VIRTUAL TABLE clients_fts USING fts5(
+    display_name, full_name,
+    content='clients', content_rowid='client_id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
 );
 
--- Create triggers
-CREATE TRIGGER update_yearly_after_quarterly
-    AFTER INSERT ON quarterly_summaries
-    BEGIN
-        INSERT OR REPLACE INTO yearly_summaries 
-        (client_id, year, total_payments, total_assets, payment_count, avg_payment, yoy_growth, last_updated)
-        SELECT 
-            client_id, 
-            year, 
-            SUM(total_payments), 
-            AVG(total_assets), 
-            SUM(payment_count), 
-            AVG(avg_payment),
-            NULL,
-            datetime('now')
-        FROM quarterly_summaries 
-        WHERE client_id = NEW.client_id 
-            AND year = NEW.year
-        GROUP BY client_id, year;
-    END;
-
-CREATE TRIGGER update_quarterly_after_payment
-AFTER INSERT ON payments
-BEGIN
-    INSERT OR REPLACE INTO quarterly_summaries 
-    (client_id, year, quarter, total_payments, total_assets, payment_count, avg_payment, expected_total, last_updated)
-    SELECT 
-        client_id, 
-        applied_start_quarter_year, 
-        applied_start_quarter, 
-        SUM(actual_fee), 
-        AVG(total_assets), 
-        COUNT(*), 
-        AVG(actual_fee), 
-        MAX(expected_fee), 
-        datetime('now')
-    FROM payments 
-    WHERE client_id = NEW.client_id 
-      AND applied_start_quarter_year = NEW.applied_start_quarter_year 
-      AND applied_start_quarter = NEW.applied_start_quarter
-    GROUP BY client_id, applied_start_quarter_year, applied_start_quarter;
-END; 
\ No newline at end of file
+CREATE TRIGGER clients_fts_insert AFTER INSERT ON clients BEGIN
+    INSERT INTO clients_fts(rowid, display_name, full_name)
+    VALUES (new.client_id, new.display_name, new.full_name);
+END;
+
+CREATE TRIGGER clients_fts_delete AFTER DELETE ON clients BEGIN
+    INSERT INTO clients_fts(clients_fts, rowid, display_name, full_name)
+    VALUES ('delete', old.client_id, old.display_name, old.full_name);
+END;
+
+CREATE TRIGGER clients_fts_update AFTER UPDATE OF display_name, full_name ON clients BEGIN
+    INSERT INTO clients_fts(clients_fts, rowid, display_name, full_name)
+    VALUES ('delete', old.client_id, old.display_name, old.full_name);
+    INSERT INTO clients_fts(rowid, display_name, full_name)
+    VALUES (new.client_id, new.display_name, new.full_name);
+END;
+
+-- Keep in step with LATEST_VERSION in core/migrations.py
+PRAGMA user_version = 7;
@@ -1,14 +1,69 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from core.config import APP_NAME, APP_VERSION, ORIGINS
-from api import clients, contracts, payments
+from core.config import (
+    APP_NAME, APP_VERSION, ORIGINS, MAINTENANCE_INTERVAL, 
+    COMPRESSION_MINIMUM_SIZE, GZIP_LEVEL, BROTLI_QUALITY
+)
+from core.compression import CompressionMiddleware
+from core.database import (
+    get_pool, close_pool, get_executor, shutdown_executor, add_query_observer, add_acquire_observer
+)
+from core.http_cache import ETagMiddleware
+from core.responses import default_response_class
+from core.jobs import run_periodically
+from core.metrics import MetricsMiddleware, metrics
+from services.maintenance_service import run_maintenance
+from api import clients, contracts, payments, providers
+from api import metrics as metrics_api
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_pool()
+    get_executor()
+    
+    maintenance = None
+    if MAINTENANCE_INTERVAL > 0:
+        maintenance = asyncio.create_task(run_periodically(run_maintenance, MAINTENANCE_INTERVAL))
+    
+    yield
+    
+    if maintenance:
+        maintenance.cancel()
+        with suppress(asyncio.CancelledError):
+            await maintenance
+    shutdown_executor()
+    close_pool()
 
 app = FastAPI(
     title=APP_NAME,
     version=APP_VERSION,
     description="API for 401(k) payment tracking system",
+    lifespan=lifespan,
+    default_response_class=default_response_class(),
+)
+
+# Conditional GETs and compression; added before CORS so CORS stays the
+# outermost layer and compression sees the final ETag
+app.add_middleware(
+    ETagMiddleware, 
+    exclude=["/health", "/docs", "/redoc", "/openapi.json", "/metrics", "/debug"]
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,
+    gzip_level=GZIP_LEVEL,
+    brotli_quality=BROTLI_QUALITY,
+)
+
+# Per-route latency and per-statement timings for /metrics; outside the
+# caching layers so 304s and compression time are counted too
+app.add_middleware(MetricsMiddleware, registry=metrics)
+add_query_observer(metrics.observe_query)
+add_acquire_observer(metrics.observe_acquire)
 
 # Add CORS middleware first, before including routers
 app.add_middleware(
@@ -17,6 +72,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Content-Disposition", "ETag", "Last-Modified"],
 )
 
 # Include all routers
@@ -25,6 +81,8 @@ app.include_router(contracts.router)
 app.include_router(payments.router)
 app.include_router(payments.client_payments_router)
 app.include_router(payments.contracts_router)
+app.include_router(providers.router)
+app.include_router(metrics_api.router)
 
 @app.get("/")
 async def root():
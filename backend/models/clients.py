@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List, Dict, Any
 
 class ClientBase(BaseModel):
@@ -11,6 +11,7 @@ class ClientBase(BaseModel):
 class Client(ClientBase):
     compliance_status: Optional[str] = None
     compliance_reason: Optional[str] = None
+    next_payment_due: Optional[str] = None
     last_payment_date: Optional[str] = None
     last_payment_amount: Optional[float] = None
     provider_name: Optional[str] = None
@@ -29,4 +30,8 @@ class ClientSummary(BaseModel):
     metrics: Optional[ClientMetrics] = None
     contract: Optional[Dict[str, Any]] = None
     quarterly_summaries: Optional[List[Dict[str, Any]]] = None
-    yearly_summaries: Optional[List[Dict[str, Any]]] = None
\ No newline at end of file
+    yearly_summaries: Optional[List[Dict[str, Any]]] = None
+
+# Validate a whole result set in one call instead of one model at a time
+ClientList = TypeAdapter(List[Client])
+ClientSummaryList = TypeAdapter(List[ClientSummary])
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List, Dict, Any
 
 class PaymentBase(BaseModel):
@@ -48,5 +48,11 @@ class PaymentWithDetails(Payment):
     periods: Optional[List[Dict[str, Any]]] = None
     variance: Optional[Dict[str, Any]] = None
 
+PaymentWithDetailsList = TypeAdapter(List[PaymentWithDetails])
+
 class AvailablePeriods(BaseModel):
-    periods: List[Dict[str, Any]]
\ No newline at end of file
+    periods: List[Dict[str, Any]]
+
+class BulkPaymentResult(BaseModel):
+    inserted: int
+    client_ids: List[int]
\ No newline at end of file
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, TypeAdapter
+from typing import Optional, List
+
+class ProviderSummary(BaseModel):
+    provider_name: str
+    year: int
+    quarter: int
+    total_payments: float
+    expected_total: float
+    client_count: int
+    payment_count: int
+    # Payments by calculate_variance status
+    exact_count: int
+    acceptable_count: int
+    warning_count: int
+    alert_count: int
+    unknown_count: int
+    last_updated: Optional[str] = None
+
+ProviderSummaryList = TypeAdapter(List[ProviderSummary])
@@ -1,49 +1,151 @@
-from typing import List, Dict, Any, Optional
+import calendar
+import re
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
-from core.database import execute_query
-from models.clients import Client, ClientBase, ClientMetrics, ClientSummary
+from core.database import execute_query, execute_many, transaction
+from models.clients import Client, ClientList, ClientSummary, ClientSummaryList
+from services.contract_service import current_contracts_sql
 
-def get_all_clients(provider: Optional[str] = None) -> List[Client]:
-    query = """
-        SELECT c.client_id, c.display_name, c.full_name, c.ima_signed_date, c.onedrive_folder_path,
-               co.provider_name, cm.last_payment_date, cm.last_payment_amount
-        FROM clients c
-        LEFT JOIN (
-            SELECT client_id, provider_name
-            FROM contracts 
-            WHERE valid_to IS NULL
-            GROUP BY client_id
-        ) co ON c.client_id = co.client_id
-        LEFT JOIN client_metrics cm ON c.client_id = cm.client_id
-        WHERE c.valid_to IS NULL
-    """
+# Stored compliance from client_metrics; a client with no metrics row has no
+# payments, which is always red. NULL only until the first refresh has run.
+COMPLIANCE_STATUS_SQL = """
+    CASE 
+        WHEN cm.compliance_status IS NOT NULL THEN cm.compliance_status
+        WHEN cm.last_payment_date IS NULL THEN 'red'
+    END
+"""
+
+# Sort keys accepted by search_clients; display_name and client_id break ties
+# (NULLs sort last in either direction; status sorts by severity, red first)
+CLIENT_SORTS = {
+    "name": ["c.display_name"],
+    "status": [f"CASE {COMPLIANCE_STATUS_SQL} WHEN 'red' THEN 0 WHEN 'yellow' THEN 1 WHEN 'green' THEN 2 ELSE 3 END"],
+    "next_due": ["cm.next_payment_due IS NULL", "cm.next_payment_due"],
+    "last_payment": ["cm.last_payment_date IS NULL", "cm.last_payment_date"],
+    "provider": ["co.provider_name IS NULL", "co.provider_name"],
+    "relevance": ["fts.rank"],
+}
+
+def build_match_query(search: str) -> Optional[str]:
+    # Every word must match as a prefix; quoting keeps FTS5 operators and
+    # punctuation in user input from being parsed as query syntax
+    terms = re.findall(r"\w+", search)
+    if not terms:
+        return None
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+def get_all_clients(provider: Optional[str] = None, status: Optional[str] = None) -> List[Client]:
+    clients, _ = search_clients(provider=provider, status=status)
+    return clients
+
+def search_clients(
+    search: Optional[str] = None,
+    provider: Optional[str] = None,
+    status: Optional[str] = None,
+    fee_type: Optional[str] = None,
+    schedule: Optional[str] = None,
+    sort: Optional[str] = None,
+    descending: bool = False,
+    page: int = 1,
+    limit: Optional[int] = None
+) -> Tuple[List[Client], int]:
+    # Returns one page of the roster and the total number of matches. Name
+    # search is a prefix match on the clients_fts index; when that finds
+    # nothing it falls back to a substring match so partial names still hit.
+    match = build_match_query(search) if search else None
+    sort = sort or ("relevance" if match else "name")
+    if sort not in CLIENT_SORTS or (sort == "relevance" and not match):
+        raise ValueError(f"Invalid sort: {sort}")
+    
+    filters = []
     params = {}
     
     if provider:
-        query += " AND co.provider_name = :provider"
+        filters.append("co.provider_name = :provider")
         params["provider"] = provider
-        
-    query += " ORDER BY c.display_name"
+    if status:
+        filters.append(f"{COMPLIANCE_STATUS_SQL} = :status")
+        params["status"] = status
+    if fee_type:
+        filters.append("LOWER(co.fee_type) = LOWER(:fee_type)")
+        params["fee_type"] = fee_type
+    if schedule:
+        filters.append("LOWER(co.payment_schedule) = LOWER(:schedule)")
+        params["schedule"] = schedule
     
-    clients_data = execute_query(query, params)
+    def run(name_join: str, name_filter: Optional[str]) -> List[Dict[str, Any]]:
+        where = ["c.valid_to IS NULL", *filters] + ([name_filter] if name_filter else [])
+        direction = "DESC" if descending else "ASC"
+        order = ", ".join(
+            column if column.endswith("IS NULL") else f"{column} {direction}"
+            for column in CLIENT_SORTS[sort]
+        )
+        query = f"""
+            SELECT c.client_id, c.display_name, c.full_name, c.ima_signed_date, c.onedrive_folder_path,
+                   co.provider_name, co.payment_schedule, cm.last_payment_date, cm.last_payment_amount,
+                   {COMPLIANCE_STATUS_SQL} AS compliance_status,
+                   cm.compliance_reason, cm.next_payment_due,
+                   COUNT(*) OVER () AS total_count
+            FROM clients c
+            {name_join}
+            LEFT JOIN ({current_contracts_sql()}) co ON c.client_id = co.client_id
+            LEFT JOIN client_metrics cm ON c.client_id = cm.client_id
+            WHERE {" AND ".join(where)}
+            ORDER BY {order}, c.display_name, c.client_id /* plan:client-roster */
+        """
+        if limit is not None:
+            query += " LIMIT :limit OFFSET :offset"
+            params["limit"] = limit
+            params["offset"] = (page - 1) * limit
+        return execute_query(query, params)
     
-    clients = []
-    for client_data in clients_data:
-        client = Client(**client_data)
-        client.compliance_status = calculate_compliance_status(client_data)
-        clients.append(client)
-        
-    return clients
+    if match:
+        params["match"] = match
+        clients_data = run(
+            "JOIN (SELECT rowid AS client_id, rank FROM clients_fts WHERE clients_fts MATCH :match) fts "
+            "ON fts.client_id = c.client_id",
+            None
+        )
+        if not clients_data and (page == 1 or not execute_query(
+            "SELECT 1 FROM clients_fts WHERE clients_fts MATCH :match LIMIT 1", 
+            {"match": match}
+        )):
+            params["like"] = "%" + re.sub(r"([\\%_])", r"\\\1", search.strip()) + "%"
+            clients_data = run(
+                "CROSS JOIN (SELECT 0 AS rank) fts",
+                "(c.display_name LIKE :like ESCAPE '\\' OR c.full_name LIKE :like ESCAPE '\\')"
+            )
+    else:
+        clients_data = run("", None)
+    
+    total = clients_data[0]["total_count"] if clients_data else 0
+    clients = ClientList.validate_python(clients_data)
+    return [with_compliance(client, row) for client, row in zip(clients, clients_data)], total
+
+def client_from_row(client_data: Dict[str, Any]) -> Client:
+    return with_compliance(Client(**client_data), client_data)
+
+def with_compliance(client: Client, client_data: Dict[str, Any]) -> Client:
+    if client.compliance_status is None:
+        # Not refreshed yet (e.g. straight after the migration)
+        client.compliance_status, client.compliance_reason, client.next_payment_due = compute_compliance(
+            client_data.get("last_payment_date"), client_data.get("payment_schedule")
+        )
+    elif client.compliance_reason is None and client.compliance_status == "red":
+        client.compliance_reason = NO_PAYMENTS_REASON
+    return client
 
 def get_client_by_id(client_id: int) -> Optional[Client]:
-    query = """
+    query = f"""
         SELECT c.client_id, c.display_name, c.full_name, c.ima_signed_date, c.onedrive_folder_path,
                co.provider_name, co.payment_schedule, co.fee_type, 
                cm.last_payment_date, cm.last_payment_amount, cm.last_payment_quarter, 
-               cm.last_payment_year, cm.last_recorded_assets
+               cm.last_payment_year, cm.last_recorded_assets,
+               {COMPLIANCE_STATUS_SQL} AS compliance_status,
+               cm.compliance_reason, cm.next_payment_due
         FROM clients c
-        LEFT JOIN contracts co ON c.client_id = co.client_id AND co.valid_to IS NULL
+        LEFT JOIN ({current_contracts_sql("client_id = :client_id")}) co ON c.client_id = co.client_id
         LEFT JOIN client_metrics cm ON c.client_id = cm.client_id
         WHERE c.client_id = :client_id AND c.valid_to IS NULL
     """
@@ -52,97 +154,199 @@ def get_client_by_id(client_id: int) -> Optional[Client]:
     
     if not client_data:
         return None
-        
-    client = Client(**client_data)
-    client.compliance_status, client.compliance_reason = calculate_compliance_status(client_data, with_reason=True)
     
-    return client
+    return client_from_row(client_data)
+
+SUMMARY_QUARTERS = 8
+SUMMARY_YEARS = 5
 
 def get_client_summary(client_id: int) -> Optional[ClientSummary]:
-    client_query = """
-        SELECT client_id, display_name, full_name, ima_signed_date, onedrive_folder_path
-        FROM clients
-        WHERE client_id = :client_id AND valid_to IS NULL
-    """
-    client_data = execute_query(client_query, {"client_id": client_id}, fetch_one=True)
+    summaries = get_client_summaries([client_id])
+    return summaries[0] if summaries else None
+
+def get_client_summaries(client_ids: Optional[List[int]] = None) -> List[ClientSummary]:
+    # Set-based assembly for many clients: each section is one query over the
+    # whole batch, with window functions picking the latest quarters and years
+    # per client. None means every active client. All sections are read in
+    # one read transaction so they come from the same snapshot.
+    if client_ids is None:
+        client_filter = "client_id IN (SELECT client_id FROM clients WHERE valid_to IS NULL)"
+        params = {}
+    else:
+        client_ids = list(dict.fromkeys(client_ids))
+        if not client_ids:
+            return []
+        params = {f"id{i}": client_id for i, client_id in enumerate(client_ids)}
+        client_filter = f"client_id IN ({', '.join(':' + key for key in params)})"
     
-    if not client_data:
-        return None
+    with transaction(immediate=False):
+        client_query = f"""
+            SELECT client_id, display_name, full_name, ima_signed_date, onedrive_folder_path
+            FROM clients
+            WHERE {client_filter} AND valid_to IS NULL
+            ORDER BY display_name /* plan:client-summaries */
+        """
+        clients_data = execute_query(client_query, params)
         
-    metrics_query = """
-        SELECT last_payment_date, last_payment_amount, last_payment_quarter, 
-               last_payment_year, total_ytd_payments, avg_quarterly_payment, last_recorded_assets
-        FROM client_metrics
-        WHERE client_id = :client_id
-    """
-    metrics_data = execute_query(metrics_query, {"client_id": client_id}, fetch_one=True)
+        if not clients_data:
+            return []
+        
+        metrics_query = f"""
+            SELECT client_id, last_payment_date, last_payment_amount, last_payment_quarter, 
+                   last_payment_year, total_ytd_payments, avg_quarterly_payment, last_recorded_assets
+            FROM client_metrics
+            WHERE {client_filter}
+        """
+        metrics_data = execute_query(metrics_query, params)
+        
+        contract_data = execute_query(current_contracts_sql(client_filter), params)
+        
+        quarterly_query = f"""
+            SELECT client_id, year, quarter, total_payments, total_assets, 
+                   payment_count, avg_payment, expected_total
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY client_id ORDER BY year DESC, quarter DESC
+                ) AS rn
+                FROM quarterly_summaries
+                WHERE {client_filter}
+            )
+            WHERE rn <= {SUMMARY_QUARTERS}
+            ORDER BY client_id, year DESC, quarter DESC /* plan:summary-quarters */
+        """
+        quarterly_data = execute_query(quarterly_query, params)
+        
+        yearly_query = f"""
+            SELECT client_id, year, total_payments, total_assets, payment_count, avg_payment, yoy_growth
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY year DESC) AS rn
+                FROM yearly_summaries
+                WHERE {client_filter}
+            )
+            WHERE rn <= {SUMMARY_YEARS}
+            ORDER BY client_id, year DESC /* plan:summary-years */
+        """
+        yearly_data = execute_query(yearly_query, params)
     
-    contract_query = """
-        SELECT contract_id, provider_name, contract_number, contract_start_date,
-               fee_type, percent_rate, flat_rate, payment_schedule, num_people, notes
-        FROM contracts
-        WHERE client_id = :client_id AND valid_to IS NULL
-    """
-    contract_data = execute_query(contract_query, {"client_id": client_id}, fetch_one=True)
-    
-    quarterly_query = """
-        SELECT year, quarter, total_payments, total_assets, payment_count, avg_payment, expected_total
-        FROM quarterly_summaries
-        WHERE client_id = :client_id
-        ORDER BY year DESC, quarter DESC
-        LIMIT 8
-    """
-    quarterly_data = execute_query(quarterly_query, {"client_id": client_id})
-    
-    yearly_query = """
-        SELECT year, total_payments, total_assets, payment_count, avg_payment, yoy_growth
-        FROM yearly_summaries
-        WHERE client_id = :client_id
-        ORDER BY year DESC
-        LIMIT 5
-    """
-    yearly_data = execute_query(yearly_query, {"client_id": client_id})
-    
-    summary = ClientSummary(
-        client=ClientBase(**client_data),
-        metrics=ClientMetrics(**metrics_data) if metrics_data else None,
-        contract=contract_data,
-        quarterly_summaries=quarterly_data,
-        yearly_summaries=yearly_data
-    )
+    metrics_by_client = {row.pop("client_id"): row for row in metrics_data}
+    contracts_by_client = {row.pop("client_id"): row for row in contract_data}
+    quarterly_by_client = {}
+    for row in quarterly_data:
+        quarterly_by_client.setdefault(row.pop("client_id"), []).append(row)
+    yearly_by_client = {}
+    for row in yearly_data:
+        yearly_by_client.setdefault(row.pop("client_id"), []).append(row)
     
-    return summary
+    if client_ids is not None:
+        position = {client_id: i for i, client_id in enumerate(client_ids)}
+        clients_data.sort(key=lambda row: position[row["client_id"]])
+    
+    return ClientSummaryList.validate_python([
+        {
+            "client": client_data,
+            "metrics": metrics_by_client.get(client_data["client_id"]),
+            "contract": contracts_by_client.get(client_data["client_id"]),
+            "quarterly_summaries": quarterly_by_client.get(client_data["client_id"], []),
+            "yearly_summaries": yearly_by_client.get(client_data["client_id"], []),
+        }
+        for client_data in clients_data
+    ])
 
-def calculate_compliance_status(client_data: Dict[str, Any], with_reason: bool = False) -> str:
-    if not client_data.get("last_payment_date"):
-        reason = "No payment records found"
-        return ("red", reason) if with_reason else "red"
+NO_PAYMENTS_REASON = "No payment records found"
+
+def add_months(date: datetime, months: int) -> datetime:
+    # Clamps to the last day of the target month (Jan 31 + 1 month = Feb 28/29)
+    month_index = date.month - 1 + months
+    year = date.year + month_index // 12
+    month = month_index % 12 + 1
+    return date.replace(year=year, month=month, day=min(date.day, calendar.monthrange(year, month)[1]))
+
+def compute_compliance(
+    last_payment_date: Optional[str], 
+    payment_schedule: Optional[str], 
+    today: Optional[datetime] = None
+) -> Tuple[str, str, Optional[str]]:
+    if not last_payment_date:
+        return "red", NO_PAYMENTS_REASON, None
     
-    last_payment = datetime.strptime(client_data["last_payment_date"], "%Y-%m-%d")
-    today = datetime.now()
+    last_payment = datetime.strptime(last_payment_date, "%Y-%m-%d")
+    today = today or datetime.now()
     days_since_payment = (today - last_payment).days
     
-    payment_schedule = client_data.get("payment_schedule", "").lower()
-    
-    if payment_schedule == "monthly":
-        if days_since_payment <= 45:
-            status = "green"
-            reason = "Recent payment within acceptable timeframe"
-        elif days_since_payment <= 75:
-            status = "yellow"
-            reason = "Payment approaching due date"
-        else:
-            status = "red"
-            reason = "Payment overdue"
-    else:  # Quarterly or unspecified defaults to quarterly
-        if days_since_payment <= 135:
-            status = "green"
-            reason = "Recent payment within acceptable timeframe"
-        elif days_since_payment <= 195:
-            status = "yellow"
-            reason = "Payment approaching due date"
-        else:
-            status = "red"
-            reason = "Payment overdue"
-    
-    return (status, reason) if with_reason else status
\ No newline at end of file
+    # Quarterly or unspecified defaults to quarterly
+    is_monthly = (payment_schedule or "").lower() == "monthly"
+    green_days, yellow_days = (45, 75) if is_monthly else (135, 195)
+    
+    if days_since_payment <= green_days:
+        status = "green"
+        reason = "Recent payment within acceptable timeframe"
+    elif days_since_payment <= yellow_days:
+        status = "yellow"
+        reason = "Payment approaching due date"
+    else:
+        status = "red"
+        reason = "Payment overdue"
+    
+    next_due = add_months(last_payment, 1 if is_monthly else 3).strftime("%Y-%m-%d")
+    
+    return status, reason, next_due
+
+def calculate_compliance_status(client_data: Dict[str, Any], with_reason: bool = False) -> str:
+    status, reason, _ = compute_compliance(
+        client_data.get("last_payment_date"), 
+        client_data.get("payment_schedule")
+    )
+    return (status, reason) if with_reason else status
+
+COMPLIANCE_UPSERT_QUERY = """
+    INSERT INTO client_metrics (
+        client_id, compliance_status, compliance_reason, next_payment_due, compliance_as_of
+    ) VALUES (
+        :client_id, :compliance_status, :compliance_reason, :next_payment_due, :compliance_as_of
+    )
+    ON CONFLICT(client_id) DO UPDATE SET
+        compliance_status = excluded.compliance_status,
+        compliance_reason = excluded.compliance_reason,
+        next_payment_due = excluded.next_payment_due,
+        compliance_as_of = excluded.compliance_as_of
+"""
+
+def refresh_client_compliance(client_ids: Optional[List[int]] = None, today: Optional[datetime] = None) -> int:
+    # Recomputes stored compliance for the given clients, or every active
+    # client. Runs after each payment write and daily, since status also
+    # changes as days pass without a payment.
+    # The full refresh visits every active client by design and is tagged for
+    # the plan audit; the per-write refresh must seek, so it is not
+    params = {}
+    contract_filter, client_filter = None, " /* plan:compliance-refresh */"
+    if client_ids is not None:
+        if not client_ids:
+            return 0
+        params = {f"id{i}": client_id for i, client_id in enumerate(client_ids)}
+        contract_filter = f"client_id IN ({', '.join(':' + key for key in params)})"
+        client_filter = f" AND c.{contract_filter}"
+    
+    query = f"""
+        SELECT c.client_id, cm.last_payment_date, co.payment_schedule
+        FROM clients c
+        LEFT JOIN client_metrics cm ON cm.client_id = c.client_id
+        LEFT JOIN ({current_contracts_sql(contract_filter)}) co ON co.client_id = c.client_id
+        WHERE c.valid_to IS NULL{client_filter}
+    """
+    
+    today = today or datetime.now()
+    rows = {}
+    for row in execute_query(query, params):
+        status, reason, next_due = compute_compliance(row["last_payment_date"], row["payment_schedule"], today)
+        rows[row["client_id"]] = {
+            "client_id": row["client_id"],
+            "compliance_status": status,
+            "compliance_reason": reason,
+            "next_payment_due": next_due,
+            "compliance_as_of": today.strftime("%Y-%m-%d"),
+        }
+    
+    if rows:
+        execute_many(COMPLIANCE_UPSERT_QUERY, list(rows.values()))
+    
+    return len(rows)
\ No newline at end of file
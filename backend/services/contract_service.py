@@ -1,8 +1,85 @@
 from typing import Dict, Any, Optional
 from models.contracts import Contract, ExpectedFeeCalculation
-from core.database import execute_query
+from core.cache import TTLCache, MISSING
+from core.config import CONTRACT_CACHE_SIZE, CONTRACT_CACHE_TTL
+from core.database import execute_query, after_commit
+from core.versions import data_versions
+
+# Keyed by ("contract", contract_id) and ("client", client_id). Misses are not
+# cached so a newly added contract is visible immediately.
+contract_cache = TTLCache(CONTRACT_CACHE_SIZE, CONTRACT_CACHE_TTL)
+
+def cache_contract(contract: Contract, by_client: bool = False) -> Contract:
+    contract_cache.set(("contract", contract.contract_id), contract)
+    if by_client:
+        contract_cache.set(("client", contract.client_id), contract)
+    return contract
+
+def invalidate_contract_cache(
+    contract_id: Optional[int] = None, 
+    client_id: Optional[int] = None
+) -> None:
+    # Call after any contract write. With no arguments the whole cache is dropped.
+    # Entries are dropped now and again once the write commits, since a reader
+    # on another connection can cache the old row in between. HTTP validators
+    # move on commit: for the owning client when it is known, otherwise for
+    # every client.
+    if contract_id is None and client_id is None:
+        contract_cache.clear()
+        after_commit(contract_cache.clear)
+        after_commit(data_versions.bump)
+        return
+    
+    client_ids = set() if client_id is None else {client_id}
+    if contract_id is not None:
+        # The cache may hold the client's entry without this contract's
+        owner = execute_query(
+            "SELECT client_id FROM contracts WHERE contract_id = :contract_id",
+            {"contract_id": contract_id},
+            fetch_one=True
+        )
+        if owner is not None:
+            client_ids.add(owner["client_id"])
+    
+    def drop() -> None:
+        keys = [("client", cid) for cid in client_ids]
+        if contract_id is not None:
+            keys.append(("contract", contract_id))
+        for key in keys:
+            contract = contract_cache.pop(key)
+            if contract is not None:
+                contract_cache.pop(("contract", contract.contract_id))
+                contract_cache.pop(("client", contract.client_id))
+                client_ids.add(contract.client_id)
+    
+    drop()
+    after_commit(drop)
+    if client_ids:
+        after_commit(lambda: data_versions.bump(client_ids))
+    else:
+        after_commit(data_versions.bump)
+
+def current_contracts_sql(where: Optional[str] = None) -> str:
+    # Each client's current contract: the active one with the lowest
+    # contract_id. SQLite takes the bare columns from the row MIN() picks.
+    # The roster, client detail, summaries, compliance and
+    # get_client_contract all select through this so they never disagree.
+    return f"""
+        SELECT MIN(contract_id) AS contract_id, client_id, contract_number, provider_name,
+               contract_start_date, fee_type, percent_rate, flat_rate, payment_schedule, num_people, notes
+        FROM contracts
+        WHERE valid_to IS NULL{f" AND {where}" if where else ""}
+        GROUP BY client_id
+    """
+
+def get_contract_cache_stats() -> Dict[str, Any]:
+    return contract_cache.stats()
 
 def get_contract_by_id(contract_id: int) -> Optional[Contract]:
+    cached = contract_cache.get(("contract", contract_id))
+    if cached is not MISSING:
+        return cached
+    
     query = """
         SELECT contract_id, client_id, contract_number, provider_name, 
                contract_start_date, fee_type, percent_rate, flat_rate,
@@ -16,23 +93,21 @@ def get_contract_by_id(contract_id: int) -> Optional[Contract]:
     if not contract_data:
         return None
         
-    return Contract(**contract_data)
+    return cache_contract(Contract(**contract_data))
 
 def get_client_contract(client_id: int) -> Optional[Contract]:
-    query = """
-        SELECT contract_id, client_id, contract_number, provider_name, 
-               contract_start_date, fee_type, percent_rate, flat_rate,
-               payment_schedule, num_people, notes
-        FROM contracts
-        WHERE client_id = :client_id AND valid_to IS NULL
-    """
+    cached = contract_cache.get(("client", client_id))
+    if cached is not MISSING:
+        return cached
     
-    contract_data = execute_query(query, {"client_id": client_id}, fetch_one=True)
+    contract_data = execute_query(
+        current_contracts_sql("client_id = :client_id"), {"client_id": client_id}, fetch_one=True
+    )
     
     if not contract_data:
         return None
         
-    return Contract(**contract_data)
+    return cache_contract(Contract(**contract_data), by_client=True)
 
 def calculate_expected_fee(contract_id: int, total_assets: Optional[float] = None) -> ExpectedFeeCalculation:
     contract = get_contract_by_id(contract_id)
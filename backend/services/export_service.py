@@ -0,0 +1,188 @@
+import csv
+import io
+import math
+import re
+import zipfile
+from typing import List, Dict, Any, Optional, Iterator, Iterable
+from xml.sax.saxutils import escape
+
+from core.config import EXPORT_BATCH_SIZE
+from core.database import stream_query
+from services.payment_service import enrich_payments, MONTH_NAMES
+
+EXPORT_COLUMNS = [
+    "payment_id", "client_id", "client_name", "provider_name", "contract_id",
+    "received_date", "applied_period", "total_assets", "expected_fee", "actual_fee",
+    "method", "notes", "is_split_payment", "periods",
+    "variance_difference", "variance_percent", "variance_status", "variance_message",
+]
+
+EXPORT_QUERY = """
+    SELECT 
+        p.payment_id, p.contract_id, p.client_id, p.received_date, 
+        p.total_assets, p.expected_fee, p.actual_fee, p.method, p.notes,
+        p.applied_start_month, p.applied_start_month_year, 
+        p.applied_end_month, p.applied_end_month_year,
+        p.applied_start_quarter, p.applied_start_quarter_year, 
+        p.applied_end_quarter, p.applied_end_quarter_year,
+        c.display_name as client_name, co.provider_name, co.fee_type, 
+        co.percent_rate, co.flat_rate, co.payment_schedule
+    FROM payments p
+    JOIN clients c ON p.client_id = c.client_id
+    LEFT JOIN contracts co ON p.contract_id = co.contract_id
+    WHERE p.valid_to IS NULL
+"""
+
+# Characters that are not allowed anywhere in an XML document
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+def applied_period_label(row: Dict[str, Any]) -> Optional[str]:
+    if row.get("applied_start_quarter") is not None:
+        start = f"Q{row['applied_start_quarter']} {row['applied_start_quarter_year']}"
+        end = f"Q{row['applied_end_quarter']} {row['applied_end_quarter_year']}"
+    elif row.get("applied_start_month") is not None:
+        start = f"{MONTH_NAMES[row['applied_start_month'] - 1]} {row['applied_start_month_year']}"
+        end = f"{MONTH_NAMES[row['applied_end_month'] - 1]} {row['applied_end_month_year']}"
+    else:
+        return None
+    
+    return start if start == end else f"{start} - {end}"
+
+def export_row(row: Dict[str, Any]) -> List[Any]:
+    # Keep in step with EXPORT_COLUMNS
+    variance = row.get("variance") or {}
+    periods = row.get("periods")
+    return [
+        row["payment_id"], row["client_id"], row["client_name"], row["provider_name"], row["contract_id"],
+        row["received_date"], applied_period_label(row), row["total_assets"], row["expected_fee"], row["actual_fee"],
+        row["method"], row["notes"], row["is_split_payment"],
+        "; ".join(f"{p['period']}: {p['amount']:.2f}" for p in periods) if periods else None,
+        variance.get("difference"), variance.get("percent_difference"), 
+        variance.get("status"), variance.get("message"),
+    ]
+
+def iter_payment_export(
+    client_id: Optional[int] = None,
+    provider: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[List[List[Any]]]:
+    # Yields export rows a batch at a time; only one batch is held in memory
+    query = EXPORT_QUERY
+    params = {}
+    
+    if client_id is not None:
+        query += " AND p.client_id = :client_id"
+        params["client_id"] = client_id
+    if provider:
+        query += " AND co.provider_name = :provider /* plan:provider-export */"
+        params["provider"] = provider
+    if start_date:
+        query += " AND p.received_date >= :start_date"
+        params["start_date"] = start_date
+    if end_date:
+        query += " AND p.received_date <= :end_date"
+        params["end_date"] = end_date
+    
+    # Client by client, newest first: the order idx_payments_keyset is stored
+    # in, so the unfiltered and per-client exports stream without a sort
+    query += " ORDER BY p.client_id, p.received_date DESC, p.payment_id DESC"
+    
+    for batch in stream_query(query, params, batch_size):
+        yield [export_row(row) for row in enrich_payments(batch)]
+
+def csv_stream(batches: Iterable[List[List[Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+class ChunkSink(io.RawIOBase):
+    # Write-only, unseekable file object that zipfile streams into; drain()
+    # hands back whatever has been written since the last call
+    def __init__(self):
+        self.chunks = []
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+XLSX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+XLSX_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+XLSX_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Payments" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+XLSX_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+def xlsx_cell(value: Any) -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f"<c><v>{value!r}</v></c>" if math.isfinite(value) else "<c/>"
+    text = escape(INVALID_XML_CHARS.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def xlsx_row(values: List[Any]) -> str:
+    return "<row>" + "".join(xlsx_cell(value) for value in values) + "</row>"
+
+def xlsx_stream(batches: Iterable[List[List[Any]]]) -> Iterator[bytes]:
+    # A single-sheet workbook written straight into the response: inline
+    # strings avoid a shared-strings table, and the worksheet is a streamed
+    # zip member, so memory stays at one batch plus the deflate window.
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", XLSX_ROOT_RELS)
+        archive.writestr("xl/workbook.xml", XLSX_WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS)
+        
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(xlsx_row(EXPORT_COLUMNS).encode("utf-8"))
+            yield sink.drain()
+            
+            for batch in batches:
+                sheet.write("".join(xlsx_row(values) for values in batch).encode("utf-8"))
+                yield sink.drain()
+            
+            sheet.write(b"</sheetData></worksheet>")
+    
+    yield sink.drain()
\ No newline at end of file
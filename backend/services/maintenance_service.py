@@ -0,0 +1,19 @@
+from typing import Dict
+
+from core.versions import data_versions
+from services.client_service import refresh_client_compliance
+from services.payment_service import reconcile_client_metrics
+from services.provider_service import rebuild_provider_summaries
+from services.summary_service import rebuild_summaries
+
+def run_maintenance() -> Dict[str, int]:
+    # Order matters: metrics read quarterly_summaries, and compliance reads
+    # metrics. Compliance also rolls over here as days pass without payments.
+    result = {
+        "summaries_rebuilt": rebuild_summaries(),
+        "providers_rebuilt": rebuild_provider_summaries(),
+        "clients_reconciled": reconcile_client_metrics(),
+        "compliance_refreshed": refresh_client_compliance(),
+    }
+    data_versions.bump()
+    return result
\ No newline at end of file
@@ -1,19 +1,61 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import base64
+import csv
+import functools
+import io
+import json
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime
 
-from core.database import execute_query
-from models.payments import Payment, PaymentCreate, PaymentWithDetails, AvailablePeriods
+from pydantic import ValidationError
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: enrich_payments falls back to the scalar functions without it
+    np = None
+
+from core.database import execute_query, execute_many, transaction, after_commit
+from core.versions import data_versions
+from models.payments import (
+    Payment, PaymentCreate, PaymentWithDetails, PaymentWithDetailsList, AvailablePeriods, BulkPaymentResult
+)
+from services.client_service import refresh_client_compliance
 from services.contract_service import get_contract_by_id
+from services.provider_service import (
+    apply_payment_to_provider_summaries, add_payments_to_provider_summaries, client_provider_cells, payment_cells
+)
+from services.summary_service import apply_payment_to_summaries, payment_period_range, covered_quarters, refresh_periods
+from services.variance_service import calculate_variance, describe_variance, UNKNOWN_VARIANCE
+
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+def year_to_period_range(year: int) -> Tuple[int, int]:
+    # Month ordinals matching the applied_start_ym/applied_end_ym columns
+    return year * 12, year * 12 + 11
+
+def encode_payment_cursor(payment: Payment) -> str:
+    raw = json.dumps([payment.received_date, payment.payment_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_payment_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        received_date, payment_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(received_date), int(payment_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid payment cursor")
 
 def get_client_payments(
     client_id: int,
     page: int = 1,
     limit: int = 10,
-    year: Optional[int] = None
+    year: Optional[int] = None,
+    cursor: Optional[str] = None
 ) -> List[PaymentWithDetails]:
-    offset = (page - 1) * limit
-    
-    params = {"client_id": client_id, "limit": limit, "offset": offset}
+    params = {"client_id": client_id, "limit": limit}
     
     query = """
         SELECT 
@@ -32,26 +74,30 @@ def get_client_payments(
     """
     
     if year:
+        # Any payment whose applied period overlaps the year
         query += """ 
-            AND (
-                (p.applied_start_month_year = :year) OR 
-                (p.applied_end_month_year = :year) OR
-                (p.applied_start_quarter_year = :year) OR 
-                (p.applied_end_quarter_year = :year)
-            )
+            AND p.applied_start_ym <= :period_end
+            AND p.applied_end_ym >= :period_start /* plan:client-payments-year */
+        """
+        params["period_start"], params["period_end"] = year_to_period_range(year)
+    
+    # A cursor seeks straight to the last row seen via idx_payments_keyset, so
+    # deep pages cost the same as the first and are stable under new inserts
+    if cursor:
+        params["cursor_date"], params["cursor_id"] = decode_payment_cursor(cursor)
+        query += """
+            AND (p.received_date, p.payment_id) < (:cursor_date, :cursor_id)
         """
-        params["year"] = year
     
-    query += " ORDER BY p.received_date DESC LIMIT :limit OFFSET :offset"
+    query += " ORDER BY p.received_date DESC, p.payment_id DESC LIMIT :limit"
     
-    payment_data = execute_query(query, params)
+    if not cursor:
+        query += " OFFSET :offset"
+        params["offset"] = (page - 1) * limit
     
-    enhanced_payments = []
-    for payment in payment_data:
-        payment_with_details = enhance_payment_with_details(payment)
-        enhanced_payments.append(payment_with_details)
+    payment_data = execute_query(query, params)
     
-    return enhanced_payments
+    return PaymentWithDetailsList.validate_python(enrich_payments(payment_data))
 
 def get_payment_by_id(payment_id: int) -> Optional[PaymentWithDetails]:
     query = """
@@ -78,183 +124,345 @@ def get_payment_by_id(payment_id: int) -> Optional[PaymentWithDetails]:
     return enhance_payment_with_details(payment_data)
 
 def create_payment(payment: PaymentCreate) -> Payment:
-    contract = get_contract_by_id(payment.contract_id)
-    
-    is_monthly = contract.payment_schedule.lower() == "monthly"
-    
-    query = """
-        INSERT INTO payments (
-            contract_id, client_id, received_date, total_assets,
-            expected_fee, actual_fee, method, notes
-    """
-    
-    if is_monthly:
-        query += """,
-            applied_start_month, applied_start_month_year,
-            applied_end_month, applied_end_month_year
-        """
-    else:
-        query += """,
-            applied_start_quarter, applied_start_quarter_year,
-            applied_end_quarter, applied_end_quarter_year
-        """
-    
-    query += ") VALUES ("
-    query += ":contract_id, :client_id, :received_date, :total_assets, "
-    query += ":expected_fee, :actual_fee, :method, :notes"
-    
-    if is_monthly:
-        query += """,
-            :applied_start_month, :applied_start_month_year,
-            :applied_end_month, :applied_end_month_year
-        """
-    else:
-        query += """,
-            :applied_start_quarter, :applied_start_quarter_year,
-            :applied_end_quarter, :applied_end_quarter_year
+    with transaction():
+        contract = get_contract_by_id(payment.contract_id)
+        
+        is_monthly = contract.payment_schedule.lower() == "monthly"
+        
+        query = """
+            INSERT INTO payments (
+                contract_id, client_id, received_date, total_assets,
+                expected_fee, actual_fee, method, notes
         """
-    
-    query += ")"
-    
-    params = payment.dict(exclude_unset=True)
-    
-    result = execute_query(query, params)
-    
-    update_client_metrics(payment.client_id)
-    
-    created_payment = get_payment_by_id(result["lastrowid"])
-    
-    return Payment(**created_payment.dict())
+        
+        if is_monthly:
+            query += """,
+                applied_start_month, applied_start_month_year,
+                applied_end_month, applied_end_month_year
+            """
+        else:
+            query += """,
+                applied_start_quarter, applied_start_quarter_year,
+                applied_end_quarter, applied_end_quarter_year
+            """
+        
+        query += ") VALUES ("
+        query += ":contract_id, :client_id, :received_date, :total_assets, "
+        query += ":expected_fee, :actual_fee, :method, :notes"
+        
+        if is_monthly:
+            query += """,
+                :applied_start_month, :applied_start_month_year,
+                :applied_end_month, :applied_end_month_year
+            """
+        else:
+            query += """,
+                :applied_start_quarter, :applied_start_quarter_year,
+                :applied_end_quarter, :applied_end_quarter_year
+            """
+        
+        query += ")"
+        
+        params = payment.model_dump(exclude_unset=True)
+        
+        result = execute_query(query, params)
+        
+        apply_payment_change(
+            payment.client_id, 
+            new=get_payment_state(result["lastrowid"])
+        )
+        
+        created_payment = get_payment_by_id(result["lastrowid"])
+        
+        # Already a Payment; the route's response_model drops the detail fields
+        return created_payment
 
 def update_payment(payment_id: int, payment: PaymentCreate) -> Optional[Payment]:
-    existing = get_payment_by_id(payment_id)
-    if not existing:
-        return None
-    
-    contract = get_contract_by_id(payment.contract_id)
-    is_monthly = contract.payment_schedule.lower() == "monthly"
-    
-    query = """
-        UPDATE payments
-        SET contract_id = :contract_id,
-            client_id = :client_id,
-            received_date = :received_date,
-            total_assets = :total_assets,
-            expected_fee = :expected_fee,
-            actual_fee = :actual_fee,
-            method = :method,
-            notes = :notes
-    """
-    
-    if is_monthly:
-        query += """,
-            applied_start_month = :applied_start_month,
-            applied_start_month_year = :applied_start_month_year,
-            applied_end_month = :applied_end_month,
-            applied_end_month_year = :applied_end_month_year,
-            applied_start_quarter = NULL,
-            applied_start_quarter_year = NULL,
-            applied_end_quarter = NULL,
-            applied_end_quarter_year = NULL
-        """
-    else:
-        query += """,
-            applied_start_month = NULL,
-            applied_start_month_year = NULL,
-            applied_end_month = NULL,
-            applied_end_month_year = NULL,
-            applied_start_quarter = :applied_start_quarter,
-            applied_start_quarter_year = :applied_start_quarter_year,
-            applied_end_quarter = :applied_end_quarter,
-            applied_end_quarter_year = :applied_end_quarter_year
+    with transaction():
+        existing = get_payment_state(payment_id)
+        if not existing:
+            return None
+        
+        contract = get_contract_by_id(payment.contract_id)
+        is_monthly = contract.payment_schedule.lower() == "monthly"
+        
+        query = """
+            UPDATE payments
+            SET contract_id = :contract_id,
+                client_id = :client_id,
+                received_date = :received_date,
+                total_assets = :total_assets,
+                expected_fee = :expected_fee,
+                actual_fee = :actual_fee,
+                method = :method,
+                notes = :notes
         """
-    
-    query += " WHERE payment_id = :payment_id"
-    
-    params = payment.dict(exclude_unset=True)
-    params["payment_id"] = payment_id
-    
-    execute_query(query, params)
-    
-    update_client_metrics(payment.client_id)
-    
-    updated_payment = get_payment_by_id(payment_id)
-    
-    return Payment(**updated_payment.dict())
+        
+        if is_monthly:
+            query += """,
+                applied_start_month = :applied_start_month,
+                applied_start_month_year = :applied_start_month_year,
+                applied_end_month = :applied_end_month,
+                applied_end_month_year = :applied_end_month_year,
+                applied_start_quarter = NULL,
+                applied_start_quarter_year = NULL,
+                applied_end_quarter = NULL,
+                applied_end_quarter_year = NULL
+            """
+        else:
+            query += """,
+                applied_start_month = NULL,
+                applied_start_month_year = NULL,
+                applied_end_month = NULL,
+                applied_end_month_year = NULL,
+                applied_start_quarter = :applied_start_quarter,
+                applied_start_quarter_year = :applied_start_quarter_year,
+                applied_end_quarter = :applied_end_quarter,
+                applied_end_quarter_year = :applied_end_quarter_year
+            """
+        
+        query += " WHERE payment_id = :payment_id"
+        
+        params = payment.model_dump(exclude_unset=True)
+        params["payment_id"] = payment_id
+        
+        execute_query(query, params)
+        
+        updated = get_payment_state(payment_id)
+        if existing["client_id"] == payment.client_id:
+            apply_payment_change(payment.client_id, old=existing, new=updated)
+        else:
+            apply_payment_change(existing["client_id"], old=existing)
+            apply_payment_change(payment.client_id, new=updated)
+        
+        updated_payment = get_payment_by_id(payment_id)
+        
+        return updated_payment
 
 def delete_payment(payment_id: int) -> bool:
-    payment = get_payment_by_id(payment_id)
-    if not payment:
-        return False
-    
-    query = """
-        UPDATE payments
-        SET valid_to = CURRENT_TIMESTAMP
-        WHERE payment_id = :payment_id
-    """
+    with transaction():
+        payment = get_payment_state(payment_id)
+        if not payment:
+            return False
+        
+        query = """
+            UPDATE payments
+            SET valid_to = CURRENT_TIMESTAMP
+            WHERE payment_id = :payment_id
+        """
+        
+        result = execute_query(query, {"payment_id": payment_id})
+        
+        apply_payment_change(payment["client_id"], old=payment)
+        
+        return result["rowcount"] > 0
+
+BULK_INSERT_QUERY = """
+    INSERT INTO payments (
+        contract_id, client_id, received_date, total_assets,
+        expected_fee, actual_fee, method, notes,
+        applied_start_month, applied_start_month_year,
+        applied_end_month, applied_end_month_year,
+        applied_start_quarter, applied_start_quarter_year,
+        applied_end_quarter, applied_end_quarter_year
+    ) VALUES (
+        :contract_id, :client_id, :received_date, :total_assets,
+        :expected_fee, :actual_fee, :method, :notes,
+        :applied_start_month, :applied_start_month_year,
+        :applied_end_month, :applied_end_month_year,
+        :applied_start_quarter, :applied_start_quarter_year,
+        :applied_end_quarter, :applied_end_quarter_year
+    )
+"""
+
+MONTH_FIELDS = (
+    "applied_start_month", "applied_start_month_year",
+    "applied_end_month", "applied_end_month_year",
+)
+
+QUARTER_FIELDS = (
+    "applied_start_quarter", "applied_start_quarter_year",
+    "applied_end_quarter", "applied_end_quarter_year",
+)
+
+def bulk_create_payments(payments: List[PaymentCreate]) -> BulkPaymentResult:
+    if not payments:
+        return BulkPaymentResult(inserted=0, client_ids=[])
+    
+    with transaction():
+        contract_ids = sorted({payment.contract_id for payment in payments})
+        placeholders = ", ".join("?" for _ in contract_ids)
+        contracts = execute_query(
+            f"""
+                SELECT contract_id, client_id, payment_schedule, provider_name, fee_type, percent_rate
+                FROM contracts
+                WHERE contract_id IN ({placeholders}) AND valid_to IS NULL
+            """,
+            contract_ids
+        )
+        contracts = {c["contract_id"]: c for c in contracts}
+        schedules = {contract_id: (c["payment_schedule"] or "").lower() for contract_id, c in contracts.items()}
+        
+        rows = []
+        for index, payment in enumerate(payments):
+            if payment.contract_id not in schedules:
+                raise ValueError(f"Row {index + 1}: contract {payment.contract_id} not found")
+            if contracts[payment.contract_id]["client_id"] != payment.client_id:
+                raise ValueError(
+                    f"Row {index + 1}: contract {payment.contract_id} does not belong to client {payment.client_id}"
+                )
+            
+            row = payment.model_dump()
+            # Same column rule as create/update: only the contract's schedule is stored
+            cleared = QUARTER_FIELDS if schedules[payment.contract_id] == "monthly" else MONTH_FIELDS
+            for field in cleared:
+                row[field] = None
+            rows.append(row)
+        
+        quarters_by_client = {}
+        states_by_client = {}
+        for row in rows:
+            quarters = quarters_by_client.setdefault(row["client_id"], set())
+            period = payment_period_range(row)
+            if period:
+                quarters |= covered_quarters(*period)
+            contract = contracts[row["contract_id"]]
+            states_by_client.setdefault(row["client_id"], []).append({
+                **row,
+                "applied_start_ym": period[0] if period else None,
+                "applied_end_ym": period[1] if period else None,
+                "provider_name": contract["provider_name"],
+                "fee_type": contract["fee_type"],
+                "percent_rate": contract["percent_rate"],
+            })
+        
+        # Provider client counts need to know who already paid in each quarter
+        provider_cells_before = {
+            client_id: client_provider_cells(
+                client_id, set().union(*(payment_cells(state) for state in states))
+            )
+            for client_id, states in states_by_client.items()
+        }
+        
+        result = execute_many(BULK_INSERT_QUERY, rows)
+        
+        client_ids = sorted(quarters_by_client)
+        for client_id in client_ids:
+            refresh_periods(client_id, quarters_by_client[client_id])
+            add_payments_to_provider_summaries(
+                client_id, states_by_client[client_id], provider_cells_before[client_id]
+            )
+            update_client_metrics(client_id)
+        refresh_client_compliance(client_ids)
+        after_commit(lambda: data_versions.bump(client_ids))
     
-    result = execute_query(query, {"payment_id": payment_id})
+    return BulkPaymentResult(inserted=result["rowcount"], client_ids=client_ids)
+
+def parse_payments_csv(text: str) -> List[PaymentCreate]:
+    reader = csv.DictReader(io.StringIO(text))
+    payments = []
+    errors = []
+    
+    # Row numbers count the header as line 1 so they match the spreadsheet
+    for line_number, row in enumerate(reader, start=2):
+        values = {
+            key.strip(): (value.strip() if value and value.strip() else None)
+            for key, value in row.items() if key
+        }
+        try:
+            payments.append(PaymentCreate(**values))
+        except ValidationError as e:
+            messages = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            errors.append(f"Line {line_number}: {messages}")
     
-    update_client_metrics(payment.client_id)
+    if errors:
+        raise ValueError("\n".join(errors))
     
-    return result["rowcount"] > 0
+    return payments
+
+LATEST_PAYMENT_QUERY = """
+    SELECT 
+        received_date, actual_fee, 
+        CASE 
+            WHEN applied_start_quarter IS NOT NULL THEN applied_start_quarter
+            ELSE (CAST((applied_start_month - 1) / 3 AS INT) + 1)
+        END as quarter,
+        CASE 
+            WHEN applied_start_quarter_year IS NOT NULL THEN applied_start_quarter_year
+            ELSE applied_start_month_year
+        END as year,
+        total_assets
+    FROM payments
+    WHERE client_id = :client_id AND valid_to IS NULL
+    ORDER BY received_date DESC, payment_id DESC
+    LIMIT 1
+"""
+
+# Averages the most recent 8 quarters; the LIMIT has to sit inside the
+# subquery or it would apply to the single aggregate row instead
+AVG_QUARTERLY_QUERY = """
+    SELECT AVG(total_payments) as average
+    FROM (
+        SELECT total_payments
+        FROM quarterly_summaries
+        WHERE client_id = :client_id
+        ORDER BY year DESC, quarter DESC
+        LIMIT 8
+    )
+"""
+
+PAYMENT_STATE_QUERY = """
+    SELECT p.payment_id, p.client_id, p.received_date, p.actual_fee, p.expected_fee, p.total_assets,
+           p.applied_start_ym, p.applied_end_ym, co.provider_name, co.fee_type, co.percent_rate
+    FROM payments p
+    LEFT JOIN contracts co ON co.contract_id = p.contract_id
+    WHERE p.payment_id = :payment_id AND p.valid_to IS NULL
+"""
+
+def get_payment_state(payment_id: int) -> Optional[Dict[str, Any]]:
+    return execute_query(PAYMENT_STATE_QUERY, {"payment_id": payment_id}, fetch_one=True)
+
+def apply_payment_change(
+    client_id: int,
+    old: Optional[Dict[str, Any]] = None,
+    new: Optional[Dict[str, Any]] = None
+) -> None:
+    # Summaries first: the metrics average reads quarterly_summaries, and
+    # compliance reads the metrics' last payment date
+    apply_payment_to_summaries(client_id, old=old, new=new)
+    apply_payment_to_provider_summaries(client_id, old=old, new=new)
+    apply_payment_to_metrics(client_id, old=old, new=new)
+    refresh_client_compliance([client_id])
+    after_commit(lambda: data_versions.bump([client_id]))
 
 def update_client_metrics(client_id: int) -> None:
-    latest_payment_query = """
-        SELECT 
-            received_date, actual_fee, 
-            CASE 
-                WHEN applied_start_quarter IS NOT NULL THEN applied_start_quarter
-                ELSE (CAST((applied_start_month - 1) / 3 AS INT) + 1)
-            END as quarter,
-            CASE 
-                WHEN applied_start_quarter_year IS NOT NULL THEN applied_start_quarter_year
-                ELSE applied_start_month_year
-            END as year,
-            total_assets
-        FROM payments
-        WHERE client_id = :client_id AND valid_to IS NULL
-        ORDER BY received_date DESC
-        LIMIT 1
-    """
-    
+    # A client with no live payments keeps a row with the last payment cleared
     latest_payment = execute_query(
-        latest_payment_query, 
+        LATEST_PAYMENT_QUERY, 
         {"client_id": client_id}, 
         fetch_one=True
-    )
-    
-    if not latest_payment:
-        return
+    ) or {}
     
     current_year = datetime.now().year
+    year_start, year_end = year_to_period_range(current_year)
     ytd_query = """
         SELECT SUM(actual_fee) as total
         FROM payments
         WHERE client_id = :client_id 
         AND valid_to IS NULL
-        AND (
-            (applied_start_quarter_year = :year) OR 
-            (applied_start_month_year = :year)
-        )
+        AND applied_start_ym BETWEEN :year_start AND :year_end
     """
     
     ytd_result = execute_query(
         ytd_query, 
-        {"client_id": client_id, "year": current_year}, 
+        {"client_id": client_id, "year_start": year_start, "year_end": year_end}, 
         fetch_one=True
     )
     
-    avg_query = """
-        SELECT AVG(total_payments) as average
-        FROM quarterly_summaries
-        WHERE client_id = :client_id
-        ORDER BY year DESC, quarter DESC
-        LIMIT 8
-    """
-    
     avg_result = execute_query(
-        avg_query, 
+        AVG_QUARTERLY_QUERY, 
         {"client_id": client_id}, 
         fetch_one=True
     )
@@ -263,12 +471,12 @@ def update_client_metrics(client_id: int) -> None:
         INSERT INTO client_metrics (
             client_id, last_payment_date, last_payment_amount, 
             last_payment_quarter, last_payment_year, 
-            total_ytd_payments, avg_quarterly_payment, 
+            total_ytd_payments, ytd_year, avg_quarterly_payment, 
             last_recorded_assets, last_updated
         ) VALUES (
             :client_id, :last_payment_date, :last_payment_amount,
             :last_payment_quarter, :last_payment_year,
-            :total_ytd_payments, :avg_quarterly_payment,
+            :total_ytd_payments, :ytd_year, :avg_quarterly_payment,
             :last_recorded_assets, CURRENT_TIMESTAMP
         )
         ON CONFLICT(client_id) DO UPDATE SET
@@ -277,6 +485,7 @@ def update_client_metrics(client_id: int) -> None:
             last_payment_quarter = :last_payment_quarter,
             last_payment_year = :last_payment_year,
             total_ytd_payments = :total_ytd_payments,
+            ytd_year = :ytd_year,
             avg_quarterly_payment = :avg_quarterly_payment,
             last_recorded_assets = :last_recorded_assets,
             last_updated = CURRENT_TIMESTAMP
@@ -289,12 +498,99 @@ def update_client_metrics(client_id: int) -> None:
         "last_payment_quarter": latest_payment.get("quarter"),
         "last_payment_year": latest_payment.get("year"),
         "total_ytd_payments": ytd_result.get("total") if ytd_result else None,
+        "ytd_year": current_year,
         "avg_quarterly_payment": avg_result.get("average") if avg_result else None,
         "last_recorded_assets": latest_payment.get("total_assets"),
     }
     
     execute_query(upsert_query, params)
 
+def apply_payment_to_metrics(
+    client_id: int,
+    old: Optional[Dict[str, Any]] = None,
+    new: Optional[Dict[str, Any]] = None
+) -> None:
+    # Delta maintenance for a single payment write. `old` and `new` are
+    # get_payment_state() rows from before and after the write; every query
+    # here is a bounded index lookup, so cost does not grow with history.
+    metrics = execute_query(
+        """
+            SELECT last_payment_date, total_ytd_payments, ytd_year
+            FROM client_metrics
+            WHERE client_id = :client_id
+        """,
+        {"client_id": client_id},
+        fetch_one=True
+    )
+    
+    current_year = datetime.now().year
+    if not metrics or metrics["ytd_year"] != current_year:
+        # No baseline to apply a delta to (new client or year rollover)
+        update_client_metrics(client_id)
+        return
+    
+    year_start, year_end = year_to_period_range(current_year)
+    total_ytd = metrics["total_ytd_payments"] or 0
+    for fields, sign in ((old, -1), (new, 1)):
+        if (
+            fields and 
+            fields["applied_start_ym"] is not None and 
+            year_start <= fields["applied_start_ym"] <= year_end
+        ):
+            total_ytd += sign * (fields["actual_fee"] or 0)
+    
+    params = {
+        "client_id": client_id,
+        "total_ytd_payments": total_ytd,
+        "avg_quarterly_payment": execute_query(
+            AVG_QUARTERLY_QUERY, {"client_id": client_id}, fetch_one=True
+        )["average"],
+    }
+    query = """
+        UPDATE client_metrics
+        SET total_ytd_payments = :total_ytd_payments,
+            avg_quarterly_payment = :avg_quarterly_payment,
+            last_updated = CURRENT_TIMESTAMP
+    """
+    
+    last_date = metrics["last_payment_date"]
+    old_was_latest = old and old["received_date"] and (not last_date or old["received_date"] >= last_date)
+    new_is_latest = new and new["received_date"] and (not last_date or new["received_date"] >= last_date)
+    
+    if old_was_latest or new_is_latest:
+        latest = execute_query(LATEST_PAYMENT_QUERY, {"client_id": client_id}, fetch_one=True)
+        if not latest:
+            # The last payment is gone; update_client_metrics' SUM over no rows is NULL
+            params["total_ytd_payments"] = None
+            latest = {}
+        params.update({
+            "last_payment_date": latest.get("received_date"),
+            "last_payment_amount": latest.get("actual_fee"),
+            "last_payment_quarter": latest.get("quarter"),
+            "last_payment_year": latest.get("year"),
+            "last_recorded_assets": latest.get("total_assets"),
+        })
+        query += """,
+            last_payment_date = :last_payment_date,
+            last_payment_amount = :last_payment_amount,
+            last_payment_quarter = :last_payment_quarter,
+            last_payment_year = :last_payment_year,
+            last_recorded_assets = :last_recorded_assets
+        """
+    
+    query += " WHERE client_id = :client_id"
+    execute_query(query, params)
+
+def reconcile_client_metrics() -> int:
+    clients = execute_query("SELECT client_id FROM clients WHERE valid_to IS NULL")
+    
+    # One short transaction per client so writers are never held off for long
+    for client in clients:
+        with transaction():
+            update_client_metrics(client["client_id"])
+    
+    return len(clients)
+
 def enhance_payment_with_details(payment_data: Dict[str, Any] | PaymentWithDetails) -> PaymentWithDetails:
     # If payment_data is already a PaymentWithDetails, use it directly
     if isinstance(payment_data, PaymentWithDetails):
@@ -303,6 +599,16 @@ def enhance_payment_with_details(payment_data: Dict[str, Any] | PaymentWithDetai
         # Otherwise, create a new PaymentWithDetails from the dictionary
         payment = PaymentWithDetails(**payment_data)
     
+    payment.is_split_payment = is_split_payment(payment)
+    
+    if payment.is_split_payment:
+        payment.periods = calculate_periods(payment)
+    
+    payment.variance = calculate_variance(payment)
+    
+    return payment
+
+def is_split_payment(payment: PaymentWithDetails) -> bool:
     is_split_monthly = (
         payment.applied_start_month is not None and
         payment.applied_end_month is not None and
@@ -321,14 +627,7 @@ def enhance_payment_with_details(payment_data: Dict[str, Any] | PaymentWithDetai
         )
     )
     
-    payment.is_split_payment = is_split_monthly or is_split_quarterly
-    
-    if payment.is_split_payment:
-        payment.periods = calculate_periods(payment)
-    
-    payment.variance = calculate_variance(payment)
-    
-    return payment
+    return is_split_monthly or is_split_quarterly
 
 def calculate_periods(payment: PaymentWithDetails) -> List[Dict[str, Any]]:
     periods = []
@@ -366,131 +665,196 @@ def calculate_periods(payment: PaymentWithDetails) -> List[Dict[str, Any]]:
             current_month = ((start_month + i - 1) % 12) + 1
             current_year = start_year + ((start_month + i - 1) // 12)
             
-            month_name = [
-                "January", "February", "March", "April", "May", "June",
-                "July", "August", "September", "October", "November", "December"
-            ][current_month - 1]
-            
             periods.append({
-                "period": f"{month_name} {current_year}",
+                "period": f"{MONTH_NAMES[current_month - 1]} {current_year}",
                 "amount": amount_per_period
             })
     
     return periods
 
-def calculate_variance(payment: PaymentWithDetails) -> Dict[str, Any]:
-    effective_expected_fee = payment.expected_fee
-    
-    if (
-        payment.expected_fee is None and 
-        payment.total_assets is not None and 
-        payment.fee_type == "percentage" and
-        payment.percent_rate is not None
-    ):
-        effective_expected_fee = payment.total_assets * payment.percent_rate
-    
-    # If either expected fee or actual fee is missing, we can't calculate variance
-    if effective_expected_fee is None or payment.actual_fee is None:
-        return {
-            "difference": None,
-            "percent_difference": None,
-            "status": "unknown",
-            "message": "Cannot calculate"
-        }
+def enrich_payments(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Column-wise counterpart of enhance_payment_with_details for whole result
+    # sets. Fills is_split_payment, periods and variance on each row dict with
+    # the same values the scalar functions produce, without building a model
+    # per row. The arithmetic runs over NumPy arrays when NumPy is installed.
+    if not rows:
+        return rows
+    
+    if np is None:
+        for row in rows:
+            payment = _RowView(row)
+            row["is_split_payment"] = is_split_payment(payment)
+            row["periods"] = calculate_periods(payment) if row["is_split_payment"] else None
+            row["variance"] = calculate_variance(payment)
+        return rows
+    
+    def column(name):
+        return np.array([row.get(name) for row in rows], dtype=float)
+    
+    def present(values):
+        return ~np.isnan(values)
+    
+    def differs(a, b):
+        # None != None is False in the scalar code, but nan != nan is True
+        return (a != b) & ~(np.isnan(a) & np.isnan(b))
+    
+    start_month, end_month = column("applied_start_month"), column("applied_end_month")
+    start_month_year, end_month_year = column("applied_start_month_year"), column("applied_end_month_year")
+    start_quarter, end_quarter = column("applied_start_quarter"), column("applied_end_quarter")
+    start_quarter_year, end_quarter_year = column("applied_start_quarter_year"), column("applied_end_quarter_year")
+    
+    split = (
+        present(start_month) & present(end_month) &
+        (differs(start_month, end_month) | differs(start_month_year, end_month_year))
+    ) | (
+        present(start_quarter) & present(end_quarter) &
+        (differs(start_quarter, end_quarter) | differs(start_quarter_year, end_quarter_year))
+    )
     
-    difference = payment.actual_fee - effective_expected_fee
-    percent_difference = (difference / effective_expected_fee) * 100 if effective_expected_fee != 0 else 0
-    abs_percent_difference = abs(percent_difference)
-    
-    if payment.actual_fee == effective_expected_fee:
-        status = "exact"
-        message = "Exact Match"
-    elif abs_percent_difference <= 5:
-        status = "acceptable"
-        message = f"${difference:.2f} ({percent_difference:.2f}%) ✓"
-    elif abs_percent_difference <= 15:
-        status = "warning"
-        message = f"${difference:.2f} ({percent_difference:.2f}%)"
-    else:
-        status = "alert"
-        message = f"${difference:.2f} ({percent_difference:.2f}%)"
-    
-    return {
-        "difference": difference,
-        "percent_difference": percent_difference,
-        "status": status,
-        "message": message
-    }
+    actual = column("actual_fee")
+    expected = column("expected_fee")
+    assets = column("total_assets")
+    rate = column("percent_rate")
+    is_percentage = np.array([row.get("fee_type") == "percentage" for row in rows])
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Quarter fields take precedence, as in calculate_periods
+        total_periods = np.where(
+            present(start_quarter),
+            (end_quarter_year - start_quarter_year) * 4 + (end_quarter - start_quarter) + 1,
+            (end_month_year - start_month_year) * 12 + (end_month - start_month) + 1
+        )
+        amount_per_period = np.where(
+            total_periods > 0, np.nan_to_num(actual) / total_periods, 0.0
+        )
+        
+        effective = np.where(
+            ~present(expected) & present(assets) & present(rate) & is_percentage,
+            assets * rate,
+            expected
+        )
+        known = present(effective) & present(actual)
+        difference = actual - effective
+        percent_difference = np.where(effective != 0, (difference / effective) * 100, 0.0)
+        exact = actual == effective
+    
+    columns = zip(
+        rows, split.tolist(), amount_per_period.tolist(), known.tolist(),
+        difference.tolist(), percent_difference.tolist(), exact.tolist()
+    )
+    for row, is_split, amount, is_known, diff, percent, is_exact in columns:
+        row["is_split_payment"] = is_split
+        row["periods"] = split_periods(row, amount) if is_split else None
+        row["variance"] = describe_variance(diff, percent, is_exact) if is_known else dict(UNKNOWN_VARIANCE)
+    
+    return rows
 
-def get_available_periods(contract_id: int, client_id: int) -> AvailablePeriods:
-    # Get contract details
-    contract_query = """
-        SELECT contract_id, contract_start_date, payment_schedule
-        FROM contracts
-        WHERE contract_id = :contract_id 
-        AND client_id = :client_id
-        AND valid_to IS NULL
-    """
+def split_periods(row: Dict[str, Any], amount: float) -> List[Dict[str, Any]]:
+    if row.get("applied_start_quarter") is not None:
+        start, start_year = row["applied_start_quarter"], row["applied_start_quarter_year"]
+        total = (row["applied_end_quarter_year"] - start_year) * 4 + (row["applied_end_quarter"] - start) + 1
+        return [
+            {
+                "period": f"Q{(start + i - 1) % 4 + 1} {start_year + (start + i - 1) // 4}",
+                "amount": amount
+            }
+            for i in range(total)
+        ]
+    
+    if row.get("applied_start_month") is not None:
+        start, start_year = row["applied_start_month"], row["applied_start_month_year"]
+        total = (row["applied_end_month_year"] - start_year) * 12 + (row["applied_end_month"] - start) + 1
+        return [
+            {
+                "period": f"{MONTH_NAMES[(start + i - 1) % 12]} {start_year + (start + i - 1) // 12}",
+                "amount": amount
+            }
+            for i in range(total)
+        ]
+    
+    return []
+
+class _RowView:
+    # Attribute access over a row dict for the scalar helpers
+    def __init__(self, row: Dict[str, Any]):
+        self.__dict__.update(row)
     
-    contract_data = execute_query(
-        contract_query, 
-        {"contract_id": contract_id, "client_id": client_id}, 
-        fetch_one=True
+    def __getattr__(self, name: str) -> Any:
+        return None
+
+# Periods are months or quarters as ranges of year * 12 + month - 1, the
+# encoding of the applied_start_ym/applied_end_ym generated columns
+PAID_RANGES_QUERY = """
+    SELECT applied_start_ym, applied_end_ym
+    FROM payments
+    WHERE client_id = :client_id
+    AND applied_end_ym >= :first_ym
+    AND applied_start_ym <= :last_ym
+    AND contract_id = :contract_id
+    AND valid_to IS NULL
+"""
+
+@functools.lru_cache(maxsize=256)
+def period_catalogue(schedule: str, start_ym: int, current_ym: int) -> Tuple[Tuple[str, str, int, int], ...]:
+    # (label, value, first ym, last ym) for each period from the contract start
+    # through the current one. current_ym is part of the key, so the calendar
+    # extends itself when the month turns over.
+    if schedule == "monthly":
+        return tuple(
+            (f"{MONTH_NAMES[ym % 12]} {ym // 12}", f"{ym % 12 + 1}-{ym // 12}", ym, ym)
+            for ym in range(start_ym, current_ym + 1)
+        )
+    return tuple(
+        (f"Q{(ym % 12) // 3 + 1} {ym // 12}", f"{(ym % 12) // 3 + 1}-{ym // 12}", ym, ym + 2)
+        for ym in range(start_ym - start_ym % 3, current_ym + 1, 3)
     )
-    
-    if not contract_data:
+
+def get_available_periods(
+    contract_id: int, 
+    client_id: int, 
+    unpaid_only: bool = False, 
+    today: Optional[date] = None
+) -> AvailablePeriods:
+    contract = get_contract_by_id(contract_id)
+    if not contract or contract.client_id != client_id:
         return AvailablePeriods(periods=[])
-        
+    
+    today = today or date.today()
     contract_start = None
-    if contract_data.get("contract_start_date"):
+    if contract.contract_start_date:
         try:
-            contract_start = datetime.strptime(
-                contract_data["contract_start_date"], 
-                "%Y-%m-%d"
-            )
+            contract_start = datetime.strptime(contract.contract_start_date, "%Y-%m-%d")
         except ValueError:
             pass
     
     if not contract_start:
-        contract_start = datetime(datetime.now().year, 1, 1)
+        contract_start = datetime(today.year, 1, 1)
     
-    current_date = datetime.now()
-    periods = []
+    catalogue = period_catalogue(
+        (contract.payment_schedule or "").lower(),
+        contract_start.year * 12 + contract_start.month - 1,
+        today.year * 12 + today.month - 1
+    )
+    if not catalogue:
+        return AvailablePeriods(periods=[])
     
-    if contract_data["payment_schedule"].lower() == "monthly":
-        for year in range(contract_start.year, current_date.year + 1):
-            start_month = 1
-            end_month = 12
-            
-            if year == contract_start.year:
-                start_month = contract_start.month
-            if year == current_date.year:
-                end_month = current_date.month
-            
-            for month in range(start_month, end_month + 1):
-                month_name = [
-                    "January", "February", "March", "April", "May", "June",
-                    "July", "August", "September", "October", "November", "December"
-                ][month - 1]
-                
-                periods.append({
-                    "label": f"{month_name} {year}",
-                    "value": f"{month}-{year}"
-                })
-    else:
-        for year in range(contract_start.year, current_date.year + 1):
-            start_quarter = 1
-            end_quarter = 4
-            
-            if year == contract_start.year:
-                start_quarter = (contract_start.month - 1) // 3 + 1
-            if year == current_date.year:
-                end_quarter = (current_date.month - 1) // 3 + 1
-            
-            for quarter in range(start_quarter, end_quarter + 1):
-                periods.append({
-                    "label": f"Q{quarter} {year}",
-                    "value": f"{quarter}-{year}"
-                })
+    first_ym, last_ym = catalogue[0][2], catalogue[-1][3]
+    paid_months = set()
+    for row in execute_query(PAID_RANGES_QUERY, {
+        "client_id": client_id, 
+        "contract_id": contract_id, 
+        "first_ym": first_ym, 
+        "last_ym": last_ym,
+    }):
+        paid_months.update(range(
+            max(row["applied_start_ym"], first_ym), 
+            min(row["applied_end_ym"], last_ym) + 1
+        ))
+    
+    periods = []
+    for label, value, start_ym, end_ym in catalogue:
+        paid = not paid_months.isdisjoint(range(start_ym, end_ym + 1))
+        if not (paid and unpaid_only):
+            periods.append({"label": label, "value": value, "paid": paid})
     
     return AvailablePeriods(periods=periods)
\ No newline at end of file
@@ -0,0 +1,250 @@
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import List, Dict, Any, Optional, Iterable, Set, Tuple
+
+from core.database import execute_query, execute_many, transaction
+from models.providers import ProviderSummary, ProviderSummaryList
+from services.summary_service import apportion, covered_quarters, quarter_range
+from services.variance_service import calculate_variance
+
+# Quarterly rollups by provider. A payment counts toward its contract's
+# provider in every quarter it covers, with fees spread over the months as in
+# quarterly_summaries, and is tallied under the status calculate_variance
+# gives it. Payment writes add and subtract deltas for just the quarters the
+# payment touches; the maintenance job rebuilds everything from payments.
+
+Cell = Tuple[str, int, int]
+
+VARIANCE_STATUSES = ("exact", "acceptable", "warning", "alert", "unknown")
+VARIANCE_FIELDS = ("actual_fee", "expected_fee", "total_assets", "fee_type", "percent_rate")
+COUNT_COLUMNS = ("client_count", "payment_count") + tuple(f"{status}_count" for status in VARIANCE_STATUSES)
+
+PROVIDER_DELTA_QUERY = """
+    INSERT INTO provider_summaries (
+        provider_name, year, quarter, total_payments, expected_total, client_count, payment_count,
+        exact_count, acceptable_count, warning_count, alert_count, unknown_count, last_updated
+    ) VALUES (
+        :provider_name, :year, :quarter, :total_payments, :expected_total, :client_count, :payment_count,
+        :exact_count, :acceptable_count, :warning_count, :alert_count, :unknown_count, datetime('now')
+    )
+    ON CONFLICT(provider_name, year, quarter) DO UPDATE SET
+        total_payments = total_payments + excluded.total_payments,
+        expected_total = expected_total + excluded.expected_total,
+        client_count = client_count + excluded.client_count,
+        payment_count = payment_count + excluded.payment_count,
+        exact_count = exact_count + excluded.exact_count,
+        acceptable_count = acceptable_count + excluded.acceptable_count,
+        warning_count = warning_count + excluded.warning_count,
+        alert_count = alert_count + excluded.alert_count,
+        unknown_count = unknown_count + excluded.unknown_count,
+        last_updated = excluded.last_updated
+"""
+
+# Other live payments of one client over a month range, with their provider
+CLIENT_PROVIDER_PAYMENTS_QUERY = """
+    SELECT p.applied_start_ym, p.applied_end_ym, co.provider_name
+    FROM payments p
+    JOIN contracts co ON co.contract_id = p.contract_id
+    WHERE p.client_id = :client_id
+    AND p.valid_to IS NULL
+    AND p.applied_start_ym <= :range_end
+    AND p.applied_end_ym >= :range_start
+    AND p.payment_id != :exclude_id
+"""
+
+PROVIDER_PAYMENTS_QUERY = """
+    SELECT p.client_id, p.actual_fee, p.expected_fee, p.total_assets,
+           p.applied_start_ym, p.applied_end_ym,
+           co.provider_name, co.fee_type, co.percent_rate
+    FROM contracts co
+    JOIN payments p ON p.contract_id = co.contract_id
+    WHERE co.provider_name = :provider_name
+    AND p.valid_to IS NULL
+    AND p.applied_start_ym IS NOT NULL
+    AND p.applied_end_ym IS NOT NULL
+"""
+
+SUMMARY_COLUMNS = """
+    provider_name, year, quarter, total_payments, expected_total, client_count, payment_count,
+    exact_count, acceptable_count, warning_count, alert_count, unknown_count, last_updated
+"""
+
+def empty_delta() -> Dict[str, float]:
+    return {"total_payments": 0.0, "expected_total": 0.0, **dict.fromkeys(COUNT_COLUMNS, 0)}
+
+def payment_cells(payment: Optional[Dict[str, Any]]) -> Set[Cell]:
+    if (
+        not payment or
+        payment.get("provider_name") is None or
+        payment.get("applied_start_ym") is None or
+        payment.get("applied_end_ym") is None
+    ):
+        return set()
+    return {
+        (payment["provider_name"], year, quarter)
+        for year, quarter in covered_quarters(payment["applied_start_ym"], payment["applied_end_ym"])
+    }
+
+def variance_status(payment: Dict[str, Any]) -> str:
+    return calculate_variance(SimpleNamespace(**{field: payment.get(field) for field in VARIANCE_FIELDS}))["status"]
+
+def add_payment(deltas: Dict[Cell, Dict[str, float]], payment: Dict[str, Any], sign: int) -> None:
+    status = variance_status(payment)
+    for cell in payment_cells(payment):
+        range_start, range_end = quarter_range(cell[1], cell[2])
+        delta = deltas[cell]
+        delta["total_payments"] += sign * apportion(payment["actual_fee"], payment, range_start, range_end)
+        delta["expected_total"] += sign * apportion(payment["expected_fee"], payment, range_start, range_end)
+        delta["payment_count"] += sign
+        delta[f"{status}_count"] += sign
+
+def write_deltas(deltas: Dict[Cell, Dict[str, float]]) -> None:
+    rows = [
+        {"provider_name": provider_name, "year": year, "quarter": quarter, **delta}
+        for (provider_name, year, quarter), delta in deltas.items()
+        if any(delta.values())
+    ]
+    if not rows:
+        return
+
+    execute_many(PROVIDER_DELTA_QUERY, rows)
+    execute_many(
+        """
+            DELETE FROM provider_summaries
+            WHERE provider_name = :provider_name AND year = :year AND quarter = :quarter
+            AND payment_count <= 0
+        """,
+        [{"provider_name": row["provider_name"], "year": row["year"], "quarter": row["quarter"]} for row in rows]
+    )
+
+def client_provider_cells(client_id: int, cells: Set[Cell], exclude_id: int = 0) -> Set[Cell]:
+    # Which of `cells` the client has live payments in, not counting exclude_id
+    if not cells:
+        return set()
+
+    ranges = [quarter_range(year, quarter) for _, year, quarter in cells]
+    payments = execute_query(CLIENT_PROVIDER_PAYMENTS_QUERY, {
+        "client_id": client_id,
+        "range_start": min(start for start, _ in ranges),
+        "range_end": max(end for _, end in ranges),
+        "exclude_id": exclude_id,
+    })
+
+    present = set()
+    for payment in payments:
+        present |= payment_cells(payment)
+    return present & cells
+
+def apply_payment_to_provider_summaries(
+    client_id: int,
+    old: Optional[Dict[str, Any]] = None,
+    new: Optional[Dict[str, Any]] = None
+) -> None:
+    # `old` and `new` are get_payment_state() rows from before and after a
+    # write. A quarter's client count changes only when this payment was or
+    # becomes the client's sole payment with that provider there.
+    if not old and not new:
+        return
+
+    old_cells, new_cells = payment_cells(old), payment_cells(new)
+    others = client_provider_cells(client_id, old_cells | new_cells, exclude_id=(new or old)["payment_id"])
+
+    deltas = defaultdict(empty_delta)
+    if old:
+        add_payment(deltas, old, -1)
+    if new:
+        add_payment(deltas, new, 1)
+    for cell in old_cells | new_cells:
+        deltas[cell]["client_count"] += (cell in new_cells or cell in others) - (cell in old_cells or cell in others)
+
+    write_deltas(deltas)
+
+def add_payments_to_provider_summaries(
+    client_id: int,
+    payments: Iterable[Dict[str, Any]],
+    present_before: Set[Cell]
+) -> None:
+    # Batch counterpart for newly inserted payments of one client;
+    # present_before is client_provider_cells() taken before the insert
+    deltas = defaultdict(empty_delta)
+    cells = set()
+    for payment in payments:
+        add_payment(deltas, payment, 1)
+        cells |= payment_cells(payment)
+    for cell in cells - present_before:
+        deltas[cell]["client_count"] += 1
+
+    write_deltas(deltas)
+
+def rebuild_provider_summaries(provider_name: Optional[str] = None) -> int:
+    if provider_name is not None:
+        providers = [provider_name]
+    else:
+        providers = [
+            row["provider_name"]
+            for row in execute_query(
+                "SELECT DISTINCT provider_name FROM contracts WHERE provider_name IS NOT NULL"
+            )
+        ]
+        execute_query("""
+            DELETE FROM provider_summaries
+            WHERE provider_name NOT IN (SELECT provider_name FROM contracts WHERE provider_name IS NOT NULL) /* plan:provider-cleanup */
+        """)
+
+    # One transaction per provider so writers are never held off for long
+    for name in providers:
+        with transaction():
+            deltas = defaultdict(empty_delta)
+            clients = defaultdict(set)
+            for payment in execute_query(PROVIDER_PAYMENTS_QUERY, {"provider_name": name}):
+                add_payment(deltas, payment, 1)
+                for cell in payment_cells(payment):
+                    clients[cell].add(payment["client_id"])
+            for cell, client_ids in clients.items():
+                deltas[cell]["client_count"] = len(client_ids)
+
+            execute_query("DELETE FROM provider_summaries WHERE provider_name = :provider_name", {"provider_name": name})
+            write_deltas(deltas)
+
+    return len(providers)
+
+def provider_exists(provider_name: str) -> bool:
+    return execute_query(
+        "SELECT 1 AS found FROM contracts WHERE provider_name = :provider_name LIMIT 1",
+        {"provider_name": provider_name},
+        fetch_one=True
+    ) is not None
+
+def get_provider_summary(
+    provider_name: str,
+    year: Optional[int] = None,
+    quarter: Optional[int] = None
+) -> Optional[List[ProviderSummary]]:
+    # None when no contract has this provider, [] when it has no payments yet
+    rows = execute_query(
+        f"""
+            SELECT {SUMMARY_COLUMNS}
+            FROM provider_summaries
+            WHERE provider_name = :provider_name
+            AND (:year IS NULL OR year = :year)
+            AND (:quarter IS NULL OR quarter = :quarter)
+            ORDER BY year, quarter
+        """,
+        {"provider_name": provider_name, "year": year, "quarter": quarter}
+    )
+    if not rows and not provider_exists(provider_name):
+        return None
+    return ProviderSummaryList.validate_python(rows)
+
+def get_provider_summaries(year: int, quarter: Optional[int] = None) -> List[ProviderSummary]:
+    rows = execute_query(
+        f"""
+            SELECT {SUMMARY_COLUMNS}
+            FROM provider_summaries
+            WHERE year = :year
+            AND (:quarter IS NULL OR quarter = :quarter)
+            ORDER BY quarter, total_payments DESC, provider_name /* plan:provider-ranking */
+        """,
+        {"year": year, "quarter": quarter}
+    )
+    return ProviderSummaryList.validate_python(rows)
@@ -0,0 +1,253 @@
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Iterable, Set, Tuple
+
+from core.database import execute_query, execute_many, transaction
+
+# Summaries are built from the applied_start_ym/applied_end_ym month ordinals
+# (year * 12 + month - 1). A payment's fee is spread evenly over the months it
+# covers, so a split monthly payment and a multi-quarter payment both land in
+# every quarter and year they apply to, in the same proportions that
+# calculate_periods reports.
+
+OVERLAPPING_PAYMENTS_QUERY = """
+    SELECT payment_id, actual_fee, expected_fee, total_assets,
+           applied_start_ym, applied_end_ym
+    FROM payments
+    WHERE client_id = :client_id 
+    AND valid_to IS NULL
+    AND applied_start_ym <= :range_end
+    AND applied_end_ym >= :range_start
+"""
+
+QUARTERLY_UPSERT_QUERY = """
+    INSERT INTO quarterly_summaries (
+        client_id, year, quarter, total_payments, total_assets,
+        payment_count, avg_payment, expected_total, last_updated
+    ) VALUES (
+        :client_id, :year, :quarter, :total_payments, :total_assets,
+        :payment_count, :avg_payment, :expected_total, datetime('now')
+    )
+    ON CONFLICT(client_id, year, quarter) DO UPDATE SET
+        total_payments = excluded.total_payments,
+        total_assets = excluded.total_assets,
+        payment_count = excluded.payment_count,
+        avg_payment = excluded.avg_payment,
+        expected_total = excluded.expected_total,
+        last_updated = excluded.last_updated
+"""
+
+YEARLY_UPSERT_QUERY = """
+    INSERT INTO yearly_summaries (
+        client_id, year, total_payments, total_assets,
+        payment_count, avg_payment, yoy_growth, last_updated
+    ) VALUES (
+        :client_id, :year, :total_payments, :total_assets,
+        :payment_count, :avg_payment, :yoy_growth, datetime('now')
+    )
+    ON CONFLICT(client_id, year) DO UPDATE SET
+        total_payments = excluded.total_payments,
+        total_assets = excluded.total_assets,
+        payment_count = excluded.payment_count,
+        avg_payment = excluded.avg_payment,
+        yoy_growth = excluded.yoy_growth,
+        last_updated = excluded.last_updated
+"""
+
+def quarter_range(year: int, quarter: int) -> Tuple[int, int]:
+    start = year * 12 + (quarter - 1) * 3
+    return start, start + 2
+
+def year_range(year: int) -> Tuple[int, int]:
+    return year * 12, year * 12 + 11
+
+def payment_period_range(payment: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    # Python mirror of the applied_start_ym/applied_end_ym generated columns,
+    # for rows that have not been read back from the database
+    if payment.get("applied_start_month") is not None:
+        start = payment["applied_start_month_year"] * 12 + payment["applied_start_month"] - 1
+    elif payment.get("applied_start_quarter") is not None:
+        start = payment["applied_start_quarter_year"] * 12 + (payment["applied_start_quarter"] - 1) * 3
+    else:
+        return None
+    
+    if payment.get("applied_end_month") is not None:
+        end = payment["applied_end_month_year"] * 12 + payment["applied_end_month"] - 1
+    elif payment.get("applied_end_quarter") is not None:
+        end = payment["applied_end_quarter_year"] * 12 + payment["applied_end_quarter"] * 3 - 1
+    else:
+        return None
+    
+    return start, end
+
+def covered_quarters(start_ym: int, end_ym: int) -> Set[Tuple[int, int]]:
+    return {(ym // 12, (ym % 12) // 3 + 1) for ym in range(start_ym, end_ym + 1)}
+
+def apportion(amount: Optional[float], payment: Dict[str, Any], range_start: int, range_end: int) -> float:
+    if amount is None:
+        return 0.0
+    
+    start, end = payment["applied_start_ym"], payment["applied_end_ym"]
+    months = end - start + 1
+    if months <= 0:
+        return 0.0
+    
+    overlap = min(end, range_end) - max(start, range_start) + 1
+    return amount * max(overlap, 0) / months
+
+def summarize(payments: List[Dict[str, Any]], range_start: int, range_end: int) -> Optional[Dict[str, Any]]:
+    touching = [
+        p for p in payments 
+        if p["applied_start_ym"] <= range_end and p["applied_end_ym"] >= range_start
+    ]
+    if not touching:
+        return None
+    
+    total = sum(apportion(p["actual_fee"], p, range_start, range_end) for p in touching)
+    expected = [p for p in touching if p["expected_fee"] is not None]
+    assets = [p["total_assets"] for p in touching if p["total_assets"] is not None]
+    
+    return {
+        "total_payments": total,
+        "total_assets": sum(assets) / len(assets) if assets else None,
+        "payment_count": len(touching),
+        "avg_payment": total / len(touching),
+        "expected_total": (
+            sum(apportion(p["expected_fee"], p, range_start, range_end) for p in expected)
+            if expected else None
+        ),
+    }
+
+def yoy_growth(total: Optional[float], previous_total: Optional[float]) -> Optional[float]:
+    if total is None or not previous_total:
+        return None
+    return (total - previous_total) / previous_total * 100
+
+def get_overlapping_payments(client_id: int, range_start: int, range_end: int) -> List[Dict[str, Any]]:
+    return execute_query(
+        OVERLAPPING_PAYMENTS_QUERY,
+        {"client_id": client_id, "range_start": range_start, "range_end": range_end}
+    )
+
+def get_yearly_total(client_id: int, year: int) -> Optional[float]:
+    row = execute_query(
+        "SELECT total_payments FROM yearly_summaries WHERE client_id = :client_id AND year = :year",
+        {"client_id": client_id, "year": year},
+        fetch_one=True
+    )
+    return row["total_payments"] if row else None
+
+def refresh_quarter(client_id: int, year: int, quarter: int) -> None:
+    range_start, range_end = quarter_range(year, quarter)
+    summary = summarize(get_overlapping_payments(client_id, range_start, range_end), range_start, range_end)
+    
+    if summary is None:
+        execute_query(
+            "DELETE FROM quarterly_summaries WHERE client_id = :client_id AND year = :year AND quarter = :quarter",
+            {"client_id": client_id, "year": year, "quarter": quarter}
+        )
+        return
+    
+    execute_query(QUARTERLY_UPSERT_QUERY, {"client_id": client_id, "year": year, "quarter": quarter, **summary})
+
+def refresh_year(client_id: int, year: int) -> None:
+    range_start, range_end = year_range(year)
+    summary = summarize(get_overlapping_payments(client_id, range_start, range_end), range_start, range_end)
+    
+    if summary is None:
+        execute_query(
+            "DELETE FROM yearly_summaries WHERE client_id = :client_id AND year = :year",
+            {"client_id": client_id, "year": year}
+        )
+        total = None
+    else:
+        summary["yoy_growth"] = yoy_growth(summary["total_payments"], get_yearly_total(client_id, year - 1))
+        execute_query(YEARLY_UPSERT_QUERY, {"client_id": client_id, "year": year, **summary})
+        total = summary["total_payments"]
+    
+    # The following year's growth is measured against this one
+    execute_query(
+        """
+            UPDATE yearly_summaries
+            SET yoy_growth = CASE 
+                    WHEN :total IS NULL OR :total = 0 THEN NULL
+                    ELSE (total_payments - :total) / :total * 100
+                END,
+                last_updated = datetime('now')
+            WHERE client_id = :client_id AND year = :next_year
+        """,
+        {"client_id": client_id, "next_year": year + 1, "total": total}
+    )
+
+def refresh_periods(client_id: int, quarters: Iterable[Tuple[int, int]]) -> None:
+    quarters = set(quarters)
+    for year, quarter in sorted(quarters):
+        refresh_quarter(client_id, year, quarter)
+    for year in sorted({year for year, _ in quarters}):
+        refresh_year(client_id, year)
+
+def apply_payment_to_summaries(
+    client_id: int,
+    old: Optional[Dict[str, Any]] = None,
+    new: Optional[Dict[str, Any]] = None
+) -> None:
+    # `old` and `new` are payment rows (with applied_start_ym/applied_end_ym)
+    # from before and after a write; only the quarters and years they cover
+    # are recomputed, each from an indexed range read.
+    quarters = set()
+    for state in (old, new):
+        if state and state.get("applied_start_ym") is not None and state.get("applied_end_ym") is not None:
+            quarters |= covered_quarters(state["applied_start_ym"], state["applied_end_ym"])
+    
+    refresh_periods(client_id, quarters)
+
+def rebuild_client_summaries(client_id: int) -> None:
+    payments = execute_query(
+        """
+            SELECT payment_id, actual_fee, expected_fee, total_assets,
+                   applied_start_ym, applied_end_ym
+            FROM payments
+            WHERE client_id = :client_id AND valid_to IS NULL
+            AND applied_start_ym IS NOT NULL AND applied_end_ym IS NOT NULL
+        """,
+        {"client_id": client_id}
+    )
+    
+    quarters = set()
+    for payment in payments:
+        quarters |= covered_quarters(payment["applied_start_ym"], payment["applied_end_ym"])
+    
+    quarterly_rows = []
+    for year, quarter in sorted(quarters):
+        summary = summarize(payments, *quarter_range(year, quarter))
+        quarterly_rows.append({"client_id": client_id, "year": year, "quarter": quarter, **summary})
+    
+    yearly_rows = []
+    previous_total = None
+    previous_year = None
+    for year in sorted({year for year, _ in quarters}):
+        summary = summarize(payments, *year_range(year))
+        growth = yoy_growth(summary["total_payments"], previous_total) if previous_year == year - 1 else None
+        yearly_rows.append({"client_id": client_id, "year": year, "yoy_growth": growth, **summary})
+        previous_total, previous_year = summary["total_payments"], year
+    
+    execute_query("DELETE FROM quarterly_summaries WHERE client_id = :client_id", {"client_id": client_id})
+    execute_query("DELETE FROM yearly_summaries WHERE client_id = :client_id", {"client_id": client_id})
+    if quarterly_rows:
+        execute_many(QUARTERLY_UPSERT_QUERY, quarterly_rows)
+    if yearly_rows:
+        execute_many(YEARLY_UPSERT_QUERY, yearly_rows)
+
+def rebuild_summaries(client_id: Optional[int] = None) -> int:
+    if client_id is not None:
+        client_ids = [client_id]
+    else:
+        client_ids = [
+            row["client_id"] 
+            for row in execute_query("SELECT client_id FROM clients WHERE valid_to IS NULL")
+        ]
+    
+    for cid in client_ids:
+        with transaction():
+            rebuild_client_summaries(cid)
+    
+    return len(client_ids)
\ No newline at end of file
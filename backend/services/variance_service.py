@@ -0,0 +1,58 @@
+from typing import Any, Dict
+
+from models.payments import PaymentWithDetails
+
+def calculate_variance(payment: PaymentWithDetails) -> Dict[str, Any]:
+    effective_expected_fee = payment.expected_fee
+    
+    if (
+        payment.expected_fee is None and 
+        payment.total_assets is not None and 
+        payment.fee_type == "percentage" and
+        payment.percent_rate is not None
+    ):
+        effective_expected_fee = payment.total_assets * payment.percent_rate
+    
+    # If either expected fee or actual fee is missing, we can't calculate variance
+    if effective_expected_fee is None or payment.actual_fee is None:
+        return {
+            "difference": None,
+            "percent_difference": None,
+            "status": "unknown",
+            "message": "Cannot calculate"
+        }
+    
+    difference = payment.actual_fee - effective_expected_fee
+    percent_difference = (difference / effective_expected_fee) * 100 if effective_expected_fee != 0 else 0
+    
+    return describe_variance(difference, percent_difference, payment.actual_fee == effective_expected_fee)
+
+def describe_variance(difference: float, percent_difference: float, is_exact: bool) -> Dict[str, Any]:
+    abs_percent_difference = abs(percent_difference)
+    
+    if is_exact:
+        status = "exact"
+        message = "Exact Match"
+    elif abs_percent_difference <= 5:
+        status = "acceptable"
+        message = f"${difference:.2f} ({percent_difference:.2f}%) ✓"
+    elif abs_percent_difference <= 15:
+        status = "warning"
+        message = f"${difference:.2f} ({percent_difference:.2f}%)"
+    else:
+        status = "alert"
+        message = f"${difference:.2f} ({percent_difference:.2f}%)"
+    
+    return {
+        "difference": difference,
+        "percent_difference": percent_difference,
+        "status": status,
+        "message": message
+    }
+
+UNKNOWN_VARIANCE = {
+    "difference": None,
+    "percent_difference": None,
+    "status": "unknown",
+    "message": "Cannot calculate"
+}
@@ -0,0 +1,233 @@
+"""Audit the query plan of every SQL statement the services issue.
+
+Drives each service function against a generated database, captures the
+statements through the execute_query observer hook, and runs EXPLAIN QUERY
+PLAN on each. Full table scans and temp B-trees fail the audit unless the
+statement carries a /* plan:<name> */ tag that ALLOWED_PLANS lists with a
+reason. Tags sit next to the clause that causes the step. Run from the
+backend directory:
+
+    python -m tools.query_audit --clients 500 --years 5
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from benchmarks.generator import REFERENCE_DATE, generate_database, use_database
+from core.database import add_query_observer, execute_query, remove_query_observer
+from core.metrics import normalize_statement
+
+_NAMED_PARAM = re.compile(r"(?<!:):(\w+)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_PLAN_TAG = re.compile(r"/\*\s*plan:([\w-]+)\s*\*/")
+_KEYWORDS = {"WHERE", "ON", "JOIN", "LEFT", "INNER", "CROSS", "GROUP", "ORDER", "LIMIT", "SET", "VALUES", "USING"}
+
+@dataclass
+class PlanProblem:
+    statement: str
+    detail: str
+    plan: List[str]
+
+def table_aliases(conn: sqlite3.Connection, statement: str) -> Dict[str, str]:
+    # Plan steps name tables by alias; map each alias (and bare name) that
+    # refers to a base table, so subquery and CTE aliases are not flagged
+    tables = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(statement):
+        if table in tables:
+            aliases[table] = table
+            if alias and alias.upper() not in _KEYWORDS:
+                aliases[alias] = table
+    return aliases
+
+def plan_problems(plan: List[str], aliases: Dict[str, str]) -> List[str]:
+    problems = []
+    for detail in plan:
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            target = detail.split()[1]
+            if target in aliases and "VIRTUAL TABLE" not in detail:
+                problems.append(f"SCAN {aliases[target]}")
+        elif detail.startswith("USE TEMP B-TREE"):
+            problems.append(detail)
+    return problems
+
+def explain(conn: sqlite3.Connection, statement: str) -> List[str]:
+    # Parameters only matter to the planner through their position, so bind NULLs
+    text = _STRING_LITERAL.sub("''", statement)
+    names = _NAMED_PARAM.findall(text)
+    params = {name: None for name in names} if names else (None,) * text.count("?")
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()
+    return [row["detail"] for row in rows]
+
+def run_workload() -> None:
+    # One call per code path, so every statement the API can issue is seen
+    from models.payments import PaymentCreate
+    from services import client_service, contract_service, export_service, payment_service, provider_service
+    from services.maintenance_service import run_maintenance
+    
+    run_maintenance()
+    first, second = execute_query("""
+        SELECT client_id, contract_id, provider_name FROM contracts 
+        WHERE payment_schedule = 'monthly' AND valid_to IS NULL 
+        ORDER BY client_id LIMIT 2
+    """)
+    client_id, contract_id = first["client_id"], first["contract_id"]
+    
+    for sort in client_service.CLIENT_SORTS:
+        if sort != "relevance":
+            client_service.search_clients(sort=sort, page=2, limit=25)
+    client_service.search_clients(search="cedar dent", sort="relevance")
+    client_service.search_clients(
+        search="plan", provider=first["provider_name"], status="green", fee_type="flat", schedule="quarterly"
+    )
+    client_service.search_clients(search="zzzz")
+    client_service.get_client_by_id(client_id)
+    client_service.get_client_summary(client_id)
+    client_service.get_client_summaries([client_id, second["client_id"], 3])
+    client_service.get_client_summaries()
+    
+    contract_service.invalidate_contract_cache()
+    contract_service.get_contract_by_id(contract_id)
+    contract_service.get_client_contract(second["client_id"])
+    contract_service.calculate_expected_fee(contract_id, 1000000.0)
+    
+    first_page = payment_service.get_client_payments(client_id, limit=10)
+    payment_service.get_client_payments(client_id, page=3, limit=10)
+    payment_service.get_client_payments(client_id, year=REFERENCE_DATE.year - 1)
+    payment_service.get_client_payments(client_id, cursor=payment_service.encode_payment_cursor(first_page[-1]))
+    payment_service.get_payment_by_id(first_page[0].payment_id)
+    payment_service.get_available_periods(contract_id, client_id)
+    provider_service.get_provider_summary(first["provider_name"], year=REFERENCE_DATE.year - 1)
+    provider_service.get_provider_summary("No Such Provider")
+    provider_service.get_provider_summaries(REFERENCE_DATE.year - 1, quarter=1)
+    
+    for batch in export_service.iter_payment_export():
+        pass
+    for batch in export_service.iter_payment_export(
+        client_id=client_id, provider=first["provider_name"], start_date="2022-01-01", end_date="2022-12-31"
+    ):
+        pass
+    for batch in export_service.iter_payment_export(
+        provider=first["provider_name"], start_date="2022-01-01", end_date="2022-12-31"
+    ):
+        pass
+    
+    monthly = dict(
+        contract_id=contract_id, client_id=client_id, received_date="2024-12-20", total_assets=1000000.0,
+        expected_fee=500.0, actual_fee=500.0, method="ACH", notes=None,
+        applied_start_month=11, applied_start_month_year=2024,
+        applied_end_month=12, applied_end_month_year=2024,
+        applied_start_quarter=None, applied_start_quarter_year=None,
+        applied_end_quarter=None, applied_end_quarter_year=None,
+    )
+    created = payment_service.create_payment(PaymentCreate(**monthly))
+    payment_service.update_payment(created.payment_id, PaymentCreate(**{**monthly, "actual_fee": 450.0}))
+    payment_service.update_payment(created.payment_id, PaymentCreate(
+        **{**monthly, "client_id": second["client_id"], "contract_id": second["contract_id"]}
+    ))
+    payment_service.delete_payment(created.payment_id)
+    payment_service.bulk_create_payments([PaymentCreate(**{**monthly, "received_date": "2024-12-21"})])
+
+def collect_statements(workload: Callable[[], None]) -> Dict[str, str]:
+    # Normalized statement -> first raw text seen
+    statements: Dict[str, str] = {}
+    def observe(query: str, seconds: float, rows: int) -> None:
+        statements.setdefault(normalize_statement(query), query)
+    
+    add_query_observer(observe)
+    try:
+        workload()
+    finally:
+        remove_query_observer(observe)
+    return statements
+
+def plan_tags(statement: str) -> Set[str]:
+    return set(_PLAN_TAG.findall(statement))
+
+def is_allowed(statement: str, detail: str, allowed: List[Tuple[str, str, str]]) -> bool:
+    tags = plan_tags(statement)
+    return any(tag in tags and detail.startswith(step) for tag, step, _ in allowed)
+
+def audit(db_path: str, allowed: Optional[List[Tuple[str, str, str]]] = None) -> List[PlanProblem]:
+    allowed = ALLOWED_PLANS if allowed is None else allowed
+    with use_database(db_path) as pool:
+        statements = collect_statements(run_workload)
+        conn = pool.acquire()
+        try:
+            problems = []
+            for statement, raw in sorted(statements.items()):
+                if not statement.upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+                    continue
+                plan = explain(conn, raw)
+                for detail in plan_problems(plan, table_aliases(conn, statement)):
+                    if not is_allowed(statement, detail, allowed):
+                        problems.append(PlanProblem(statement, detail, plan))
+            return problems
+        finally:
+            pool.release(conn)
+
+# (plan tag, flagged plan step, reason). Both must match, so a new scan or
+# sort showing up in a tagged statement still fails the audit.
+ALLOWED_PLANS: List[Tuple[str, str, str]] = [
+    (
+        "client-roster", "USE TEMP B-TREE FOR ORDER BY",
+        "Roster sorts on user-chosen columns after the window count; bounded by the active roster",
+    ),
+    (
+        "client-summaries", "USE TEMP B-TREE FOR ORDER BY",
+        "Batch summaries order the requested clients by name",
+    ),
+    (
+        "summary-quarters", "USE TEMP B-TREE",
+        "Sorts at most SUMMARY_QUARTERS rows per client after the index seek",
+    ),
+    (
+        "summary-years", "USE TEMP B-TREE",
+        "Sorts at most SUMMARY_YEARS rows per client after the index seek",
+    ),
+    (
+        "client-payments-year", "USE TEMP B-TREE FOR ORDER BY",
+        "Year filter seeks idx_payments_applied_period, then sorts one client-year of payments",
+    ),
+    (
+        "compliance-refresh", "SCAN clients",
+        "Compliance refresh visits every active client by design",
+    ),
+    (
+        "provider-export", "USE TEMP B-TREE FOR ORDER BY",
+        "Provider exports seek idx_contracts_provider, then sort that provider's payments into client order",
+    ),
+    (
+        "provider-cleanup", "SCAN provider_summaries",
+        "Maintenance drops rollups of providers no contract uses; one row per provider and quarter",
+    ),
+    (
+        "provider-ranking", "USE TEMP B-TREE",
+        "Ranks one year of provider rollups by fees; at most four rows per provider",
+    ),
+]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "audit.db")
+        generate_database(path, args.clients, args.years, derived=False)
+        problems = audit(path)
+    
+    for problem in problems:
+        print(f"{problem.detail}\n    {problem.statement[:300]}\n    plan: {' | '.join(problem.plan)}\n")
+    print(f"{len(problems)} plan problem(s)")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.services.payment_service import get_available_periods, period_catalogue
+
+TODAY = date(2024, 5, 20)
+
+def test_monthly_periods_mark_paid(pooled_db):
+    """Test that the monthly calendar runs to the current month and marks paid months."""
+    # Act
+    result = get_available_periods(1, 1, today=TODAY)
+
+    # Assert
+    assert [p["value"] for p in result.periods] == ["1-2024", "2-2024", "3-2024", "4-2024", "5-2024"]
+    assert result.periods[0] == {"label": "January 2024", "value": "1-2024", "paid": True}
+    assert [p["paid"] for p in result.periods[1:]] == [False] * 4
+
+def test_split_payment_marks_every_covered_period(pooled_db):
+    """Test that a payment spanning several months marks each of them paid."""
+    # Act
+    result = get_available_periods(3, 3, unpaid_only=True, today=TODAY)
+
+    # Assert
+    assert [p["value"] for p in result.periods] == ["4-2024", "5-2024"]
+
+def test_quarterly_unpaid_only(pooled_db):
+    """Test the quarterly calendar with paid quarters filtered out."""
+    # Act
+    result = get_available_periods(2, 2, unpaid_only=True, today=TODAY)
+
+    # Assert
+    assert result.periods == [{"label": "Q2 2024", "value": "2-2024", "paid": False}]
+
+def test_contract_of_another_client_returns_nothing(pooled_db):
+    """Test that the contract must belong to the requested client."""
+    # Act
+    result = get_available_periods(2, 1, today=TODAY)
+
+    # Assert
+    assert result.periods == []
+
+def test_catalogue_is_cached_per_month():
+    """Test that the period calendar is generated once per schedule, start and month."""
+    # Arrange
+    period_catalogue.cache_clear()
+
+    # Act
+    first = period_catalogue("quarterly", 2020 * 12 + 4, 2024 * 12 + 4)
+    second = period_catalogue("quarterly", 2020 * 12 + 4, 2024 * 12 + 4)
+    next_month = period_catalogue("quarterly", 2020 * 12 + 4, 2024 * 12 + 5)
+
+    # Assert
+    assert second is first
+    assert period_catalogue.cache_info().hits == 1
+    assert first[0][:2] == ("Q2 2020", "2-2020")
+    assert len(next_month) == len(first)
+
+def test_periods_endpoint_unpaid_only(pooled_db):
+    """Test GET /contracts/{id}/periods with unpaid_only."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    everything = client.get("/contracts/1/periods?client_id=1").json()["periods"]
+    unpaid = client.get("/contracts/1/periods?client_id=1&unpaid_only=true").json()["periods"]
+
+    # Assert
+    assert everything and all("paid" in p for p in everything)
+    assert unpaid == [p for p in everything if not p["paid"]]
@@ -0,0 +1,168 @@
+import pytest
+from fastapi.testclient import TestClient
+from core.database import execute_query
+from backend.main import app
+from backend.services import payment_service
+from backend.services.payment_service import bulk_create_payments, parse_payments_csv
+from backend.models.payments import PaymentCreate
+
+def quarterly_payment(quarter, fee=3750.0):
+    """Build a quarterly payment for the flat quarterly test client."""
+    return PaymentCreate(
+        contract_id=2,
+        client_id=2,
+        received_date=f"2023-{quarter * 3:02d}-20",
+        expected_fee=3750.0,
+        actual_fee=fee,
+        method="wire",
+        applied_start_quarter=quarter,
+        applied_start_quarter_year=2023,
+        applied_end_quarter=quarter,
+        applied_end_quarter_year=2023
+    )
+
+def test_bulk_create_inserts_all_rows(pooled_db):
+    """Test that every payment in the batch is inserted."""
+    # Act
+    result = bulk_create_payments([quarterly_payment(q) for q in range(1, 5)])
+
+    # Assert
+    assert result.inserted == 4
+    assert result.client_ids == [2]
+    rows = execute_query(
+        "SELECT COUNT(*) AS n FROM payments WHERE client_id = 2 AND applied_start_quarter_year = 2023",
+        fetch_one=True
+    )
+    assert rows["n"] == 4
+
+def test_bulk_create_updates_metrics_once_per_client(pooled_db, monkeypatch):
+    """Test that client metrics are recomputed per client, not per row."""
+    # Arrange
+    calls = []
+    original = payment_service.update_client_metrics
+    monkeypatch.setattr(
+        payment_service, "update_client_metrics",
+        lambda client_id: calls.append(client_id) or original(client_id)
+    )
+    monthly = PaymentCreate(
+        contract_id=1,
+        client_id=1,
+        received_date="2023-02-15",
+        total_assets=90000.0,
+        actual_fee=37.5,
+        applied_start_month=1,
+        applied_start_month_year=2023,
+        applied_end_month=1,
+        applied_end_month_year=2023
+    )
+
+    # Act
+    bulk_create_payments([quarterly_payment(q) for q in range(1, 5)] + [monthly])
+
+    # Assert
+    assert calls == [1, 2]
+
+def test_bulk_create_stores_only_schedule_columns(pooled_db):
+    """Test that quarter fields are dropped for monthly contracts, as in create_payment."""
+    # Arrange
+    payment = PaymentCreate(
+        contract_id=1,
+        client_id=1,
+        received_date="2023-02-15",
+        actual_fee=37.5,
+        applied_start_month=1,
+        applied_start_month_year=2023,
+        applied_end_month=1,
+        applied_end_month_year=2023,
+        applied_start_quarter=1,
+        applied_start_quarter_year=2023,
+        applied_end_quarter=1,
+        applied_end_quarter_year=2023
+    )
+
+    # Act
+    bulk_create_payments([payment])
+
+    # Assert
+    row = execute_query(
+        "SELECT applied_start_month, applied_start_quarter FROM payments WHERE received_date = '2023-02-15'",
+        fetch_one=True
+    )
+    assert row["applied_start_month"] == 1
+    assert row["applied_start_quarter"] is None
+
+def test_bulk_create_unknown_contract_inserts_nothing(pooled_db):
+    """Test that one bad row rolls back the whole batch."""
+    # Arrange
+    bad = quarterly_payment(2)
+    bad.contract_id = 999
+
+    # Act
+    with pytest.raises(ValueError, match="Row 2"):
+        bulk_create_payments([quarterly_payment(1), bad])
+
+    # Assert
+    rows = execute_query("SELECT COUNT(*) AS n FROM payments WHERE client_id = 2", fetch_one=True)
+    assert rows["n"] == 1
+
+def test_bulk_create_rejects_another_clients_contract(pooled_db):
+    """Test that a row whose contract belongs to a different client rejects the batch."""
+    # Arrange
+    mismatched = quarterly_payment(2)
+    mismatched.client_id = 3
+
+    # Act
+    with pytest.raises(ValueError, match="Row 2: contract 2 does not belong to client 3"):
+        bulk_create_payments([quarterly_payment(1), mismatched])
+
+    # Assert
+    rows = execute_query("SELECT COUNT(*) AS n FROM payments WHERE client_id IN (2, 3)", fetch_one=True)
+    assert rows["n"] == 2
+
+def test_parse_payments_csv_treats_blanks_as_null():
+    """Test CSV parsing of optional columns."""
+    # Arrange
+    text = (
+        "contract_id,client_id,received_date,actual_fee,total_assets,"
+        "applied_start_quarter,applied_start_quarter_year,applied_end_quarter,applied_end_quarter_year\n"
+        "2,2,2023-04-20,3750,,1,2023,1,2023\n"
+    )
+
+    # Act
+    payments = parse_payments_csv(text)
+
+    # Assert
+    assert len(payments) == 1
+    assert payments[0].actual_fee == 3750.0
+    assert payments[0].total_assets is None
+
+def test_parse_payments_csv_reports_line_numbers():
+    """Test that validation errors name the offending CSV line."""
+    # Arrange
+    text = (
+        "contract_id,client_id,received_date,actual_fee\n"
+        "2,2,2023-04-20,3750\n"
+        "two,2,2023-07-20,3750\n"
+    )
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="Line 3: contract_id"):
+        parse_payments_csv(text)
+
+def test_bulk_csv_endpoint(pooled_db):
+    """Test POST /payments/bulk/csv."""
+    # Arrange
+    client = TestClient(app)
+    text = (
+        "contract_id,client_id,received_date,actual_fee,"
+        "applied_start_quarter,applied_start_quarter_year,applied_end_quarter,applied_end_quarter_year\n"
+        "2,2,2023-04-20,3750,1,2023,1,2023\n"
+        "2,2,2023-07-20,3750,2,2023,2,2023\n"
+    )
+
+    # Act
+    response = client.post("/payments/bulk/csv", content=text, headers={"Content-Type": "text/csv"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 2, "client_ids": [2]}
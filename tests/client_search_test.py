@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from core.database import execute_query
+from backend.main import app
+from backend.services.client_service import search_clients, refresh_client_compliance, build_match_query
+
+def ids(clients):
+    return [client.client_id for client in clients]
+
+def test_prefix_search_uses_fts(pooled_db):
+    """Test that each word matches as a prefix of a name word."""
+    # Act
+    clients, total = search_clients(search="quar")
+    both, _ = search_clients(search="per mon")
+
+    # Assert
+    assert ids(clients) == [2]
+    assert total == 1
+    assert ids(both) == [1]
+
+def test_search_falls_back_to_substring(pooled_db):
+    """Test that a partial word inside a name still matches."""
+    # Act
+    clients, _ = search_clients(search="uarter")
+
+    # Assert
+    assert ids(clients) == [2]
+
+def test_search_index_follows_renames(pooled_db):
+    """Test that the FTS index is kept in step with the clients table."""
+    # Arrange
+    execute_query("UPDATE clients SET display_name = 'Zephyr Holdings' WHERE client_id = 3")
+
+    # Act
+    clients, _ = search_clients(search="zeph")
+
+    # Assert
+    assert ids(clients) == [3]
+
+def test_search_input_is_not_fts_syntax():
+    """Test that operators and quotes in user input are quoted away."""
+    # Act & Assert
+    assert build_match_query('smith" OR NEAR(') == '"smith"* "OR"* "NEAR"*'
+    assert build_match_query("--") is None
+
+def test_filters_on_fee_type_and_schedule(pooled_db):
+    """Test case-insensitive contract filters."""
+    # Act
+    flat, _ = search_clients(fee_type="FLAT")
+    monthly_flat, _ = search_clients(fee_type="flat", schedule="Monthly")
+
+    # Assert
+    assert ids(flat) == [2, 3]
+    assert ids(monthly_flat) == [3]
+
+def test_sort_and_paginate(pooled_db):
+    """Test sorting by compliance severity and paging with a total count."""
+    # Clients 1 and 3 are yellow on that date (ties go by name), client 2 is green
+    # Arrange
+    refresh_client_compliance(today=datetime(2024, 3, 25))
+
+    # Act
+    first_page, total = search_clients(sort="status", limit=2)
+    second_page, _ = search_clients(sort="status", limit=2, page=2)
+    by_name_desc, _ = search_clients(sort="name", descending=True)
+
+    # Assert
+    assert total == 3
+    assert ids(first_page) == [1, 3]
+    assert ids(second_page) == [2]
+    assert ids(by_name_desc) == [3, 1, 2]
+
+def test_invalid_sort_is_rejected(pooled_db):
+    """Test that unknown sort keys raise instead of reaching SQL."""
+    with pytest.raises(ValueError):
+        search_clients(sort="client_id; DROP TABLE clients")
+
+def test_clients_endpoint_search_and_total_header(pooled_db):
+    """Test GET /clients/ query parameters and X-Total-Count."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    response = client.get("/clients/", params={"q": "client", "limit": 2, "sort": "name"})
+    everyone = client.get("/clients/")
+    invalid = client.get("/clients/", params={"sort": "bogus"})
+
+    # Assert
+    assert response.status_code == 200
+    assert [c["client_id"] for c in response.json()] == [2, 1]
+    assert response.headers["X-Total-Count"] == "3"
+    assert len(everyone.json()) == 3
+    assert invalid.status_code == 400
@@ -0,0 +1,141 @@
+import pytest
+from fastapi.testclient import TestClient
+from core.database import execute_query, execute_many
+from backend.main import app
+from backend.services import client_service
+from backend.services.client_service import get_client_by_id, get_client_summary, get_client_summaries, search_clients
+from backend.services.summary_service import rebuild_summaries
+
+@pytest.fixture
+def summaries(pooled_db):
+    """Seed data with summaries built and the file in WAL mode."""
+    rebuild_summaries()
+    conn = pooled_db.acquire()
+    conn.execute("PRAGMA journal_mode = WAL")
+    pooled_db.release(conn)
+    return pooled_db
+
+def test_summary_uses_one_connection(summaries, monkeypatch):
+    """Test that all sections of the summary are read on one pooled connection."""
+    # Arrange
+    checkouts = []
+    original = summaries.acquire
+    monkeypatch.setattr(summaries, "acquire", lambda: checkouts.append(1) or original())
+
+    # Act
+    summary = get_client_summary(3)
+
+    # Assert
+    assert summary.client.client_id == 3
+    assert summary.quarterly_summaries[0]["total_payments"] == pytest.approx(5000.0)
+    assert len(checkouts) == 1
+
+def test_summary_is_snapshot_consistent(summaries, monkeypatch):
+    """Test that a write committed mid-summary is not seen by later sections."""
+    # Arrange
+    original = client_service.execute_query
+    calls = []
+
+    def write_after_first_read(query, params=None, fetch_one=False):
+        result = original(query, params, fetch_one)
+        calls.append(query)
+        if len(calls) == 1:
+            writer = summaries.acquire()
+            writer.execute("UPDATE quarterly_summaries SET total_payments = 1 WHERE client_id = 3")
+            writer.execute("UPDATE client_metrics SET last_payment_amount = 1 WHERE client_id = 3")
+            writer.commit()
+            summaries.release(writer)
+        return result
+
+    monkeypatch.setattr(client_service, "execute_query", write_after_first_read)
+
+    # Act
+    summary = get_client_summary(3)
+
+    # Assert
+    assert summary.quarterly_summaries[0]["total_payments"] == pytest.approx(5000.0)
+    assert summary.metrics.last_payment_amount != 1
+
+def test_batch_matches_single_summaries(summaries):
+    """Test that the batch path returns the same sections as one-by-one reads."""
+    # Act
+    batch = get_client_summaries([3, 1, 2])
+
+    # Assert
+    assert [s.client.client_id for s in batch] == [3, 1, 2]
+    assert batch == [get_client_summary(client_id) for client_id in (3, 1, 2)]
+
+def test_batch_limits_quarters_and_years_per_client(summaries):
+    """Test the last-8-quarters and last-5-years windows are applied per client."""
+    # Arrange
+    execute_many(
+        """
+            INSERT INTO quarterly_summaries (client_id, year, quarter, total_payments)
+            VALUES (:client_id, :year, :quarter, 100)
+        """,
+        [
+            {"client_id": client_id, "year": year, "quarter": quarter}
+            for client_id in (1, 2)
+            for year in range(2015, 2020)
+            for quarter in range(1, 5)
+        ]
+    )
+    execute_many(
+        "INSERT INTO yearly_summaries (client_id, year, total_payments) VALUES (:client_id, :year, 400)",
+        [{"client_id": client_id, "year": year} for client_id in (1, 2) for year in range(2015, 2020)]
+    )
+
+    # Act
+    batch = get_client_summaries([1, 2])
+
+    # Assert
+    for summary in batch:
+        assert len(summary.quarterly_summaries) == 8
+        assert len(summary.yearly_summaries) == 5
+    assert batch[1].quarterly_summaries[0]["year"] == 2024
+    assert batch[1].yearly_summaries[-1]["year"] == 2016
+
+def test_all_active_mode_skips_inactive_clients(summaries):
+    """Test that omitting ids returns every active client."""
+    # Arrange
+    execute_query("UPDATE clients SET valid_to = CURRENT_TIMESTAMP WHERE client_id = 2")
+
+    # Act
+    batch = get_client_summaries()
+
+    # Assert
+    assert sorted(s.client.client_id for s in batch) == [1, 3]
+
+def test_summaries_endpoint(summaries):
+    """Test GET /clients/summaries with ids and in all-clients mode."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    by_ids = client.get("/clients/summaries", params={"ids": "2,999,1"})
+    everyone = client.get("/clients/summaries")
+    invalid = client.get("/clients/summaries", params={"ids": "1,x"})
+
+    # Assert
+    assert by_ids.status_code == 200
+    assert [s["client"]["client_id"] for s in by_ids.json()] == [2, 1]
+    assert len(everyone.json()) == 3
+    assert invalid.status_code == 400
+
+def test_roster_and_summary_pick_the_same_contract(summaries):
+    """Test that a client with two active contracts shows the same one in the roster, detail and summary."""
+    # Arrange
+    execute_query("""
+        INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people)
+        VALUES (10, 3, 'Second Provider', 'flat', NULL, 900.0, 'quarterly', 5)
+    """)
+
+    # Act
+    clients, _ = search_clients()
+    roster = next(client for client in clients if client.client_id == 3)
+    detail = get_client_by_id(3)
+    summary = get_client_summary(3)
+
+    # Assert
+    assert summary.contract["contract_id"] == 3
+    assert roster.provider_name == detail.provider_name == summary.contract["provider_name"] == "Test Provider"
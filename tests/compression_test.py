@@ -0,0 +1,109 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from backend.main import app
+from core.compression import CompressionMiddleware, choose_encoding
+from core.http_cache import ETagMiddleware
+
+ROWS = [{"payment_id": i, "client_name": f"Client {i}", "actual_fee": 1250.5} for i in range(200)]
+
+@pytest.fixture
+def client():
+    """Build a small app with the production middleware stack."""
+    small = FastAPI()
+
+    @small.get("/rows")
+    def rows():
+        return ROWS
+
+    @small.get("/tiny")
+    def tiny():
+        return {"ok": True}
+
+    @small.get("/stream")
+    def stream():
+        return StreamingResponse((f"line {i}\n" for i in range(5000)), media_type="text/csv")
+
+    @small.get("/zip")
+    def archive():
+        return StreamingResponse(iter([b"PK" * 2000]), media_type="application/zip")
+
+    small.add_middleware(ETagMiddleware)
+    small.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(small)
+
+def test_large_json_is_gzipped(client):
+    """Test that a response over the threshold is compressed when gzip is accepted."""
+    # Act
+    response = client.get("/rows", headers={"Accept-Encoding": "gzip"})
+
+    # Assert
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == ROWS
+
+def test_small_response_is_not_compressed(client):
+    """Test that responses under the threshold are sent as-is."""
+    # Act
+    response = client.get("/tiny", headers={"Accept-Encoding": "gzip"})
+
+    # Assert
+    assert "content-encoding" not in response.headers
+
+def test_identity_when_not_accepted(client):
+    """Test that nothing is compressed without a matching Accept-Encoding."""
+    # Act
+    response = client.get("/rows", headers={"Accept-Encoding": "identity"})
+
+    # Assert
+    assert "content-encoding" not in response.headers
+    assert response.json() == ROWS
+
+def test_streaming_response_is_compressed(client):
+    """Test that the streaming CSV path is compressed chunk by chunk."""
+    # Act
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    # Assert
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.splitlines()[-1] == "line 4999"
+
+def test_binary_types_are_skipped(client):
+    """Test that already-compressed formats are passed through."""
+    # Act
+    response = client.get("/zip", headers={"Accept-Encoding": "gzip"})
+
+    # Assert
+    assert "content-encoding" not in response.headers
+
+def test_compressed_etag_is_weak_and_revalidates(client):
+    """Test that an encoded response carries a weak ETag that still yields 304."""
+    # Arrange
+    etag = client.get("/rows", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+    # Act
+    response = client.get("/rows", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    # Assert
+    assert etag.startswith('W/"')
+    assert response.status_code == 304
+
+def test_choose_encoding_honours_q_values():
+    """Test Accept-Encoding negotiation."""
+    # Act & Assert
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*") in ("br", "gzip")
+    assert choose_encoding("") is None
+
+def test_routes_use_fast_json_response():
+    """Test that main.py wires the orjson response class when orjson is installed."""
+    # Arrange
+    pytest.importorskip("orjson")
+
+    # Act
+    route = next(r for r in app.routes if getattr(r, "path", None) == "/clients/")
+
+    # Assert
+    assert route.response_class is ORJSONResponse
@@ -8,19 +8,62 @@ from datetime import datetime, timedelta
 from backend.core.database import dict_factory
 from backend.models.payments import PaymentCreate
 
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "backend", "data", "clean_schema.sql")
+
+TEST_DATA_SQL = """
+    INSERT INTO clients (client_id, display_name, full_name, ima_signed_date) 
+    VALUES (1, 'Percentage Monthly', 'PERCENTAGE MONTHLY CLIENT', '2020-01-01');
+    
+    INSERT INTO clients (client_id, display_name, full_name, ima_signed_date) 
+    VALUES (2, 'Flat Quarterly', 'FLAT QUARTERLY CLIENT', '2020-01-01');
+    
+    INSERT INTO clients (client_id, display_name, full_name, ima_signed_date) 
+    VALUES (3, 'Split Payment', 'SPLIT PAYMENT CLIENT', '2020-01-01');
+    
+    -- Insert contracts
+    INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people) 
+    VALUES (1, 1, 'Test Provider', 'percentage', 0.000417, NULL, 'monthly', 10);
+    
+    INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people) 
+    VALUES (2, 2, 'Test Provider', 'flat', NULL, 3750.0, 'quarterly', 25);
+    
+    INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people) 
+    VALUES (3, 3, 'Test Provider', 'flat', NULL, 1250.0, 'monthly', 50);
+    
+    -- Insert client_metrics
+    INSERT INTO client_metrics (id, client_id, last_payment_date, last_payment_amount, last_payment_quarter, last_payment_year, last_recorded_assets) 
+    VALUES (1, 1, '2024-01-15', 40.0, 1, 2024, 96000.0);
+    
+    INSERT INTO client_metrics (id, client_id, last_payment_date, last_payment_amount, last_payment_quarter, last_payment_year) 
+    VALUES (2, 2, '2024-02-15', 3750.0, 1, 2024);
+    
+    INSERT INTO client_metrics (id, client_id, last_payment_date, last_payment_amount, last_payment_quarter, last_payment_year) 
+    VALUES (3, 3, '2024-01-10', 5000.0, 1, 2024);
+    
+    -- Insert payments
+    -- Regular monthly percentage payment
+    INSERT INTO payments (payment_id, contract_id, client_id, received_date, total_assets, expected_fee, actual_fee, applied_start_month, applied_start_month_year, applied_end_month, applied_end_month_year)
+    VALUES (1, 1, 1, '2024-01-15', 96000.0, 40.0, 40.0, 1, 2024, 1, 2024);
+    
+    -- Regular quarterly flat payment
+    INSERT INTO payments (payment_id, contract_id, client_id, received_date, expected_fee, actual_fee, applied_start_quarter, applied_start_quarter_year, applied_end_quarter, applied_end_quarter_year)
+    VALUES (2, 2, 2, '2024-02-15', 3750.0, 3750.0, 1, 2024, 1, 2024);
+    
+    -- Split payment covering 3 months
+    INSERT INTO payments (payment_id, contract_id, client_id, received_date, expected_fee, actual_fee, applied_start_month, applied_start_month_year, applied_end_month, applied_end_month_year)
+    VALUES (3, 3, 3, '2024-01-10', 3750.0, 5000.0, 1, 2024, 3, 2024);
+"""
+
 # Create database fixture
 @pytest.fixture
 def test_db():
     """Create an in-memory SQLite database for testing."""
-    # Get the schema from the DB schema file
-    schema_path = os.path.join(os.path.dirname(__file__), "..", "backend", "data", "clean_schema.sql")
-    
     # Create in-memory database
     conn = sqlite3.connect(":memory:")
     conn.row_factory = dict_factory
     
     # Load and execute schema
-    with open(schema_path, "r") as f:
+    with open(SCHEMA_PATH, "r") as f:
         schema_sql = f.read()
         conn.executescript(schema_sql)
     
@@ -71,48 +114,33 @@ def mock_execute_query(mock_db_connection, monkeypatch):
 def setup_test_data(mock_db_connection):
     """Insert test data into the database."""
     # Insert test clients
-    mock_db_connection.executescript("""
-        INSERT INTO clients (client_id, display_name, full_name, ima_signed_date) 
-        VALUES (1, 'Percentage Monthly', 'PERCENTAGE MONTHLY CLIENT', '2020-01-01');
-        
-        INSERT INTO clients (client_id, display_name, full_name, ima_signed_date) 
-        VALUES (2, 'Flat Quarterly', 'FLAT QUARTERLY CLIENT', '2020-01-01');
-        
-        INSERT INTO clients (client_id, display_name, full_name, ima_signed_date) 
-        VALUES (3, 'Split Payment', 'SPLIT PAYMENT CLIENT', '2020-01-01');
-        
-        -- Insert contracts
-        INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people) 
-        VALUES (1, 1, 'Test Provider', 'percentage', 0.000417, NULL, 'monthly', 10);
-        
-        INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people) 
-        VALUES (2, 2, 'Test Provider', 'flat', NULL, 3750.0, 'quarterly', 25);
-        
-        INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people) 
-        VALUES (3, 3, 'Test Provider', 'flat', NULL, 1250.0, 'monthly', 50);
-        
-        -- Insert client_metrics
-        INSERT INTO client_metrics (id, client_id, last_payment_date, last_payment_amount, last_payment_quarter, last_payment_year, last_recorded_assets) 
-        VALUES (1, 1, '2024-01-15', 40.0, 1, 2024, 96000.0);
-        
-        INSERT INTO client_metrics (id, client_id, last_payment_date, last_payment_amount, last_payment_quarter, last_payment_year) 
-        VALUES (2, 2, '2024-02-15', 3750.0, 1, 2024);
-        
-        INSERT INTO client_metrics (id, client_id, last_payment_date, last_payment_amount, last_payment_quarter, last_payment_year) 
-        VALUES (3, 3, '2024-01-10', 5000.0, 1, 2024);
-        
-        -- Insert payments
-        -- Regular monthly percentage payment
-        INSERT INTO payments (payment_id, contract_id, client_id, received_date, total_assets, expected_fee, actual_fee, applied_start_month, applied_start_month_year, applied_end_month, applied_end_month_year)
-        VALUES (1, 1, 1, '2024-01-15', 96000.0, 40.0, 40.0, 1, 2024, 1, 2024);
-        
-        -- Regular quarterly flat payment
-        INSERT INTO payments (payment_id, contract_id, client_id, received_date, expected_fee, actual_fee, applied_start_quarter, applied_start_quarter_year, applied_end_quarter, applied_end_quarter_year)
-        VALUES (2, 2, 2, '2024-02-15', 3750.0, 3750.0, 1, 2024, 1, 2024);
-        
-        -- Split payment covering 3 months
-        INSERT INTO payments (payment_id, contract_id, client_id, received_date, expected_fee, actual_fee, applied_start_month, applied_start_month_year, applied_end_month, applied_end_month_year)
-        VALUES (3, 3, 3, '2024-01-10', 3750.0, 5000.0, 1, 2024, 3, 2024);
-    """)
+    mock_db_connection.executescript(TEST_DATA_SQL)
     
-    return mock_db_connection
\ No newline at end of file
+    return mock_db_connection
+
+def clear_contract_caches():
+    """Drop cached contracts from both import paths of the contract service."""
+    from services import contract_service
+    from backend.services import contract_service as backend_contract_service
+
+    contract_service.invalidate_contract_cache()
+    backend_contract_service.invalidate_contract_cache()
+
+@pytest.fixture
+def pooled_db(tmp_path, monkeypatch):
+    """Serve the app's pooled connections from a file-backed copy of the test data."""
+    from core import database
+
+    db_path = str(tmp_path / "test.db")
+    conn = sqlite3.connect(db_path)
+    with open(SCHEMA_PATH, "r") as f:
+        conn.executescript(f.read())
+    conn.executescript(TEST_DATA_SQL)
+    conn.close()
+
+    pool = database.ConnectionPool(db_path, size=2, timeout=5)
+    monkeypatch.setattr(database, "_pool", pool)
+    clear_contract_caches()
+    yield pool
+    pool.close()
+    clear_contract_caches()
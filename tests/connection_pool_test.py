@@ -0,0 +1,159 @@
+import pytest
+import asyncio
+import sqlite3
+import threading
+import time
+from backend.core.database import ConnectionPool, run_db
+from core import database
+
+@pytest.fixture
+def pool(tmp_path):
+    """Create a small pool over a file-backed database."""
+    db_path = str(tmp_path / "pool_test.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+
+    pool = ConnectionPool(db_path, size=2, timeout=0.2)
+    yield pool
+    pool.close()
+
+def test_pool_reuses_released_connection(pool):
+    """Test that a released connection is handed out again instead of reopening."""
+    # Act
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    # Assert
+    assert second is first
+    assert pool.stats()["open"] == 1
+    pool.release(second)
+
+def test_pool_is_bounded(pool):
+    """Test that the pool never opens more than its configured size."""
+    # Arrange
+    held = [pool.acquire(), pool.acquire()]
+
+    # Act & Assert
+    with pytest.raises(sqlite3.OperationalError):
+        pool.acquire()
+
+    for conn in held:
+        pool.release(conn)
+
+def test_pool_waiter_gets_released_connection(pool):
+    """Test that a thread blocked on a full pool receives the next released connection."""
+    # Arrange
+    held = [pool.acquire(), pool.acquire()]
+    pool.timeout = 5
+    received = []
+    waiter = threading.Thread(target=lambda: received.append(pool.acquire()))
+
+    # Act
+    waiter.start()
+    pool.release(held[0])
+    waiter.join(timeout=5)
+
+    # Assert
+    assert received == [held[0]]
+    pool.release(held[1])
+    pool.release(received[0])
+
+def test_pool_replaces_broken_connection(pool):
+    """Test that a connection failing its health check is discarded."""
+    # Arrange
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+
+    # Act
+    replacement = pool.acquire()
+
+    # Assert
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1 AS ok").fetchone()["ok"] == 1
+    pool.release(replacement)
+
+def test_pool_rolls_back_uncommitted_work_on_release(pool):
+    """Test that a connection returned mid-transaction does not leak its writes."""
+    # Arrange
+    conn = pool.acquire()
+    conn.execute("INSERT INTO items (name) VALUES ('pending')")
+
+    # Act
+    pool.release(conn)
+    conn = pool.acquire()
+
+    # Assert
+    assert conn.execute("SELECT COUNT(*) AS n FROM items").fetchone()["n"] == 0
+    pool.release(conn)
+
+def test_pool_close_rejects_new_acquires(pool):
+    """Test that a closed pool refuses new work."""
+    # Act
+    pool.close()
+
+    # Assert
+    with pytest.raises(sqlite3.ProgrammingError):
+        pool.acquire()
+
+def test_pool_applies_configured_pragmas(tmp_path):
+    """Test that tuning pragmas are applied when a pooled connection is opened."""
+    # Arrange
+    pool = ConnectionPool(
+        str(tmp_path / "pragma_test.db"),
+        size=1,
+        pragmas={"journal_mode": "WAL", "busy_timeout": 1234, "temp_store": "MEMORY"}
+    )
+
+    # Act
+    conn = pool.acquire()
+
+    # Assert
+    assert conn.execute("PRAGMA journal_mode").fetchone()["journal_mode"] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()["timeout"] == 1234
+    assert conn.execute("PRAGMA temp_store").fetchone()["temp_store"] == 2
+    pool.release(conn)
+    pool.close()
+
+def test_run_db_executes_off_the_event_loop():
+    """Test that blocking database work is handed to the dedicated worker threads."""
+    # Act
+    thread_name = asyncio.run(run_db(lambda: threading.current_thread().name))
+
+    # Assert
+    assert thread_name.startswith("db-worker")
+
+def test_run_db_overlaps_concurrent_calls():
+    """Test that several awaited database calls run in parallel rather than serially."""
+    # Arrange
+    async def run_three():
+        started = time.perf_counter()
+        await asyncio.gather(*(run_db(time.sleep, 0.2) for _ in range(3)))
+        return time.perf_counter() - started
+
+    # Act
+    elapsed = asyncio.run(run_three())
+
+    # Assert
+    assert elapsed < 0.5
+
+def test_streams_wait_for_a_slot(pooled_db, monkeypatch):
+    """Test that streams beyond DB_STREAM_LIMIT wait instead of taking more pooled connections."""
+    # Arrange
+    monkeypatch.setattr(database, "_stream_slots", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(database, "DB_POOL_TIMEOUT", 0.1)
+    first = database.stream_query("SELECT client_id FROM clients", batch_size=1)
+    next(first)
+
+    # Act
+    with pytest.raises(sqlite3.OperationalError, match="stream slot"):
+        next(database.stream_query("SELECT client_id FROM clients"))
+    first.close()
+    second = next(database.stream_query("SELECT client_id FROM clients"))
+
+    # Assert
+    assert second
+    assert pooled_db.stats()["idle"] == pooled_db.stats()["open"]
@@ -0,0 +1,173 @@
+import pytest
+from core.cache import TTLCache, MISSING
+from core.database import execute_query, transaction
+from backend.services import contract_service
+from backend.services.contract_service import (
+    get_contract_by_id, get_client_contract, invalidate_contract_cache, get_contract_cache_stats
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def counted_queries(pooled_db, monkeypatch):
+    """Count the SQL statements the contract service sends to SQLite."""
+    calls = []
+    original = contract_service.execute_query
+
+    def counting(query, params=None, fetch_one=False):
+        calls.append(query)
+        return original(query, params, fetch_one)
+
+    monkeypatch.setattr(contract_service, "execute_query", counting)
+    return calls
+
+def test_cache_expires_entries_after_ttl():
+    """Test that entries are served until their TTL elapses."""
+    # Arrange
+    clock = FakeClock()
+    cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+    cache.set("a", 1)
+
+    # Act
+    clock.now = 9.9
+    fresh = cache.get("a")
+    clock.now = 10.0
+    expired = cache.get("a")
+
+    # Assert
+    assert fresh == 1
+    assert expired is MISSING
+    assert cache.stats()["size"] == 0
+
+def test_cache_evicts_least_recently_used():
+    """Test that reads refresh recency so the coldest entry is evicted."""
+    # Arrange
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    # Act
+    cache.set("c", 3)
+
+    # Assert
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+def test_cache_counts_hits_and_misses():
+    """Test the hit and miss counters."""
+    # Arrange
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+
+    # Act
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+
+    # Assert
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+def test_repeated_contract_lookup_skips_sqlite(counted_queries):
+    """Test that a hot contract is read from SQLite once."""
+    # Act
+    first = get_contract_by_id(1)
+    second = get_contract_by_id(1)
+
+    # Assert
+    assert second == first
+    assert len(counted_queries) == 1
+
+def test_client_contract_lookup_is_cached(counted_queries):
+    """Test that the client lookup also fills the contract_id entry."""
+    # Act
+    by_client = get_client_contract(2)
+    by_id = get_contract_by_id(by_client.contract_id)
+    get_client_contract(2)
+
+    # Assert
+    assert by_id == by_client
+    assert len(counted_queries) == 1
+
+def test_missing_contract_is_not_cached(counted_queries):
+    """Test that a lookup miss goes back to SQLite next time."""
+    # Act
+    get_contract_by_id(999)
+    get_contract_by_id(999)
+
+    # Assert
+    assert len(counted_queries) == 2
+
+def test_invalidation_drops_both_keys(counted_queries):
+    """Test that invalidating a contract forces a reload of its id and client entries."""
+    # Arrange
+    get_client_contract(1)
+
+    # Act
+    invalidate_contract_cache(contract_id=1)
+    get_contract_by_id(1)
+    get_client_contract(1)
+
+    # Assert: the load, the owner lookup and both reloads
+    assert len(counted_queries) == 4
+
+def test_invalidation_finds_the_client_entry_in_the_database(counted_queries):
+    """Test that invalidating by contract id drops a client entry the contract entry no longer points to."""
+    # Arrange
+    get_client_contract(1)
+    contract_service.contract_cache.pop(("contract", 1))
+
+    # Act
+    invalidate_contract_cache(contract_id=1)
+
+    # Assert
+    assert contract_service.contract_cache.get(("client", 1)) is MISSING
+
+def test_invalidation_repeats_after_commit(counted_queries):
+    """Test that an entry cached while the write is still open is dropped when it commits."""
+    # Arrange
+    get_contract_by_id(1)
+
+    # Act
+    with transaction():
+        invalidate_contract_cache(contract_id=1)
+        get_contract_by_id(1)
+        during = contract_service.contract_cache.get(("contract", 1))
+
+    # Assert
+    assert during is not MISSING
+    assert contract_service.contract_cache.get(("contract", 1)) is MISSING
+
+def test_contract_cache_stats(counted_queries):
+    """Test that the service exposes cache counters."""
+    # Act
+    get_contract_by_id(1)
+    get_contract_by_id(1)
+
+    # Assert
+    stats = get_contract_cache_stats()
+    assert stats["hits"] >= 1
+    assert stats["misses"] >= 1
+    assert stats["size"] >= 1
+
+def test_client_contract_is_the_current_contract(pooled_db):
+    """Test that the per-client lookup caches the same contract the roster and summaries report."""
+    # Arrange
+    execute_query("""
+        INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people)
+        VALUES (10, 1, 'Second Provider', 'flat', NULL, 900.0, 'quarterly', 5)
+    """)
+
+    # Act
+    contract = get_client_contract(1)
+
+    # Assert
+    assert contract.contract_id == 1
+    assert contract_service.contract_cache.get(("client", 1)).contract_id == 1
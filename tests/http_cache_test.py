@@ -0,0 +1,201 @@
+import math
+import time
+import pytest
+from email.utils import formatdate
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from backend.main import app
+from api import clients as clients_api
+from backend.services.payment_service import create_payment, delete_payment
+from backend.models.payments import PaymentCreate
+from core import http_cache, versions
+from core.database import transaction, after_commit
+from core.versions import DataVersions, data_versions
+
+def quarterly_payment():
+    """Build a valid Q2 2024 payment for the flat quarterly test client."""
+    return PaymentCreate(
+        contract_id=2,
+        client_id=2,
+        received_date="2024-05-15",
+        total_assets=None,
+        expected_fee=3750.0,
+        actual_fee=3750.0,
+        method="check",
+        notes=None,
+        applied_start_quarter=2,
+        applied_start_quarter_year=2024,
+        applied_end_quarter=2,
+        applied_end_quarter_year=2024
+    )
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.time() for the versions and the middleware."""
+    clock = SimpleNamespace(now=time.time() + 5)
+    fake_time = SimpleNamespace(time=lambda: clock.now)
+    monkeypatch.setattr(versions, "time", fake_time)
+    monkeypatch.setattr(http_cache, "time", fake_time)
+    return clock
+
+def test_get_returns_validators(pooled_db, clock):
+    """Test that a read endpoint carries ETag and Last-Modified."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    response = client.get("/clients/1")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert "last-modified" in response.headers
+    assert response.headers["cache-control"] == "private, no-cache"
+
+def test_matching_etag_skips_services(pooled_db, monkeypatch):
+    """Test that If-None-Match answers 304 without calling the service layer."""
+    # Arrange
+    client = TestClient(app)
+    etag = client.get("/clients/1").headers["etag"]
+    def fail(*args, **kwargs):
+        raise AssertionError("service called")
+    monkeypatch.setattr(clients_api, "get_client_by_id", fail)
+
+    # Act
+    response = client.get("/clients/1", headers={"If-None-Match": etag})
+
+    # Assert
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+def test_etag_differs_per_url(pooled_db):
+    """Test that different query strings get different validators."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    first = client.get("/clients/?sort=name").headers["etag"]
+    second = client.get("/clients/?sort=status").headers["etag"]
+
+    # Assert
+    assert first != second
+
+def test_payment_write_changes_client_etag(pooled_db):
+    """Test that a payment write invalidates its client and the roster, but not other clients."""
+    # Arrange
+    client = TestClient(app)
+    before = {path: client.get(path).headers["etag"] for path in ("/clients/1", "/clients/2", "/clients/")}
+
+    # Act
+    create_payment(quarterly_payment())
+    responses = {
+        path: client.get(path, headers={"If-None-Match": etag}) for path, etag in before.items()
+    }
+
+    # Assert
+    assert responses["/clients/1"].status_code == 304
+    assert responses["/clients/2"].status_code == 200
+    assert responses["/clients/"].status_code == 200
+    assert responses["/clients/2"].headers["etag"] != before["/clients/2"]
+
+def test_delete_changes_client_etag(pooled_db):
+    """Test that deleting a payment moves its client's validator."""
+    # Arrange
+    client = TestClient(app)
+    etag = client.get("/clients/2/payments").headers["etag"]
+
+    # Act
+    delete_payment(2)
+    response = client.get("/clients/2/payments", headers={"If-None-Match": etag})
+
+    # Assert
+    assert response.status_code == 200
+
+def test_if_modified_since_returns_304(pooled_db, clock):
+    """Test the Last-Modified fallback for clients that do not send ETags."""
+    # Arrange
+    client = TestClient(app)
+    last_modified = client.get("/clients/3").headers["last-modified"]
+
+    # Act
+    response = client.get("/clients/3", headers={"If-Modified-Since": last_modified})
+
+    # Assert
+    assert response.status_code == 304
+
+def test_same_second_write_is_not_hidden_by_if_modified_since(pooled_db, clock):
+    """Test that a write in the same second as a cached response is not answered with 304."""
+    # Arrange
+    client = TestClient(app)
+    clock.now = math.floor(clock.now) + 0.2
+    data_versions.bump([2])
+    clock.now += 0.2
+    first = client.get("/clients/2")
+    clock.now += 0.2
+    create_payment(quarterly_payment())
+
+    # Act
+    clock.now += 0.2
+    response = client.get("/clients/2", headers={"If-Modified-Since": formatdate(math.floor(clock.now), usegmt=True)})
+
+    # Assert
+    assert "last-modified" not in first.headers
+    assert response.status_code == 200
+
+def test_if_modified_since_sees_write_after_the_second(pooled_db, clock):
+    """Test that a Last-Modified date stops matching once a later write lands."""
+    # Arrange
+    client = TestClient(app)
+    clock.now = math.floor(clock.now) + 0.2
+    data_versions.bump([2])
+    clock.now += 1
+    last_modified = client.get("/clients/2").headers["last-modified"]
+    cached = client.get("/clients/2", headers={"If-Modified-Since": last_modified})
+    create_payment(quarterly_payment())
+
+    # Act
+    response = client.get("/clients/2", headers={"If-Modified-Since": last_modified})
+
+    # Assert
+    assert cached.status_code == 304
+    assert response.status_code == 200
+
+def test_writes_and_excluded_paths_are_untouched(pooled_db):
+    """Test that only GET/HEAD on data routes get validators."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    health = client.get("/health")
+
+    # Assert
+    assert "etag" not in health.headers
+
+def test_rolled_back_write_keeps_version(pooled_db):
+    """Test that versions are bumped only after a commit."""
+    # Arrange
+    before = data_versions.current(1)[0]
+
+    # Act
+    with pytest.raises(RuntimeError):
+        with transaction():
+            after_commit(lambda: data_versions.bump([1]))
+            raise RuntimeError("boom")
+
+    # Assert
+    assert data_versions.current(1)[0] == before
+
+def test_bump_all_moves_every_scope():
+    """Test that a bump without client ids invalidates every client."""
+    # Arrange
+    versions = DataVersions()
+    client_before = versions.current(7)[0]
+    global_before = versions.current()[0]
+
+    # Act
+    versions.bump()
+
+    # Assert
+    assert versions.current(7)[0] != client_before
+    assert versions.current()[0] != global_before
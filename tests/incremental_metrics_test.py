@@ -0,0 +1,146 @@
+import pytest
+from datetime import datetime
+from core.database import execute_query
+from backend.services import payment_service
+from backend.services.payment_service import (
+    create_payment, update_payment, delete_payment,
+    update_client_metrics, reconcile_client_metrics
+)
+from backend.models.payments import PaymentCreate
+
+YEAR = datetime.now().year
+
+def monthly_payment(month, fee, received_day=15, year=YEAR):
+    """Build a fully populated monthly payment for client 1."""
+    return PaymentCreate(
+        contract_id=1,
+        client_id=1,
+        received_date=f"{year}-{month:02d}-{received_day:02d}",
+        total_assets=fee * 2400,
+        expected_fee=fee,
+        actual_fee=fee,
+        method="check",
+        notes=None,
+        applied_start_month=month,
+        applied_start_month_year=year,
+        applied_end_month=month,
+        applied_end_month_year=year
+    )
+
+def read_metrics(client_id=1):
+    return execute_query(
+        """
+            SELECT last_payment_date, last_payment_amount, last_payment_quarter, last_payment_year,
+                   total_ytd_payments, avg_quarterly_payment, last_recorded_assets
+            FROM client_metrics WHERE client_id = :client_id
+        """,
+        {"client_id": client_id},
+        fetch_one=True
+    )
+
+def full_recompute(client_id=1):
+    update_client_metrics(client_id)
+    return read_metrics(client_id)
+
+@pytest.fixture
+def baseline(pooled_db, monkeypatch):
+    """Reconcile once, then forbid full recomputes so only deltas run."""
+    reconcile_client_metrics()
+
+    def no_full_recompute(client_id):
+        raise AssertionError("full recompute on the write path")
+
+    monkeypatch.setattr(payment_service, "update_client_metrics", no_full_recompute)
+    return pooled_db
+
+def test_create_applies_delta(baseline):
+    """Test that a new payment updates YTD and last payment without a recompute."""
+    # Act
+    create_payment(monthly_payment(1, 40.0))
+    create_payment(monthly_payment(2, 45.0))
+    metrics = read_metrics()
+
+    # Assert
+    assert metrics["total_ytd_payments"] == pytest.approx(85.0)
+    assert metrics["last_payment_date"] == f"{YEAR}-02-15"
+    assert metrics["last_payment_amount"] == 45.0
+    assert metrics["last_payment_quarter"] == 1
+    assert metrics["last_payment_year"] == YEAR
+
+def test_older_payment_keeps_latest(baseline):
+    """Test that back-filling an old payment does not replace the latest one."""
+    # Arrange
+    create_payment(monthly_payment(3, 50.0))
+
+    # Act
+    create_payment(monthly_payment(1, 40.0))
+    metrics = read_metrics()
+
+    # Assert
+    assert metrics["last_payment_date"] == f"{YEAR}-03-15"
+    assert metrics["total_ytd_payments"] == pytest.approx(90.0)
+
+def test_delete_latest_falls_back(baseline):
+    """Test that deleting the latest payment promotes the previous one."""
+    # Arrange
+    create_payment(monthly_payment(1, 40.0))
+    latest = create_payment(monthly_payment(2, 45.0))
+
+    # Act
+    delete_payment(latest.payment_id)
+    metrics = read_metrics()
+
+    # Assert
+    assert metrics["last_payment_date"] == f"{YEAR}-01-15"
+    assert metrics["total_ytd_payments"] == pytest.approx(40.0)
+
+def test_delete_last_payment_matches_full_recompute(baseline):
+    """Test that deleting a client's last payment clears it exactly as a full recompute does."""
+    # Arrange
+    seeded = execute_query("SELECT payment_id FROM payments WHERE client_id = 1 AND valid_to IS NULL")
+    created = create_payment(monthly_payment(1, 40.0))
+    for row in seeded:
+        delete_payment(row["payment_id"])
+
+    # Act
+    delete_payment(created.payment_id)
+    incremental = read_metrics()
+    execute_query("UPDATE client_metrics SET last_payment_date = '2020-01-01', total_ytd_payments = 1 WHERE client_id = 1")
+    recomputed = full_recompute()
+
+    # Assert
+    assert incremental["last_payment_date"] is None
+    assert incremental["last_payment_amount"] is None
+    assert incremental["total_ytd_payments"] is None
+    assert incremental == recomputed
+
+def test_deltas_match_full_recompute(pooled_db):
+    """Test that a sequence of writes leaves the same metrics as a full recompute."""
+    # Arrange
+    reconcile_client_metrics()
+    first = create_payment(monthly_payment(1, 40.0))
+    second = create_payment(monthly_payment(2, 45.0))
+    create_payment(monthly_payment(12, 30.0, year=YEAR - 1))
+    update_payment(first.payment_id, monthly_payment(4, 60.0, received_day=20))
+    delete_payment(second.payment_id)
+
+    # Act
+    incremental = read_metrics()
+    recomputed = full_recompute()
+
+    # Assert
+    assert incremental == pytest.approx(recomputed)
+
+def test_reconcile_repairs_drift(pooled_db):
+    """Test that the reconcile job restores metrics from the payments table."""
+    # Arrange
+    reconcile_client_metrics()
+    create_payment(monthly_payment(1, 40.0))
+    execute_query("UPDATE client_metrics SET total_ytd_payments = 9999 WHERE client_id = 1")
+
+    # Act
+    reconciled = reconcile_client_metrics()
+
+    # Assert
+    assert reconciled == 3
+    assert read_metrics()["total_ytd_payments"] == pytest.approx(40.0)
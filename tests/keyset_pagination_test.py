@@ -0,0 +1,95 @@
+import pytest
+from fastapi.testclient import TestClient
+from core.database import execute_query
+from backend.main import app
+from backend.services.payment_service import (
+    get_client_payments, encode_payment_cursor, decode_payment_cursor
+)
+
+@pytest.fixture
+def many_payments(pooled_db):
+    """Add 24 monthly payments for client 1, two per received date."""
+    for i in range(24):
+        month = i // 2 + 1
+        execute_query(
+            """
+                INSERT INTO payments (contract_id, client_id, received_date, actual_fee,
+                                      applied_start_month, applied_start_month_year,
+                                      applied_end_month, applied_end_month_year)
+                VALUES (1, 1, :received_date, 40.0, :month, 2023, :month, 2023)
+            """,
+            {"received_date": f"2023-{month:02d}-15", "month": month}
+        )
+    return pooled_db
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes back to the row it was built from."""
+    # Arrange
+    class Row:
+        received_date = "2024-01-15"
+        payment_id = 42
+
+    # Act & Assert
+    assert decode_payment_cursor(encode_payment_cursor(Row)) == ("2024-01-15", 42)
+
+def test_invalid_cursor_rejected():
+    """Test that a tampered cursor raises a ValueError."""
+    with pytest.raises(ValueError):
+        decode_payment_cursor("not-a-cursor")
+
+def test_cursor_pages_cover_every_payment_once(many_payments):
+    """Test that walking the cursor returns the same rows as one large page."""
+    # Arrange
+    expected = [p.payment_id for p in get_client_payments(1, limit=100)]
+
+    # Act
+    seen = []
+    cursor = None
+    while True:
+        page = get_client_payments(1, limit=5, cursor=cursor)
+        seen.extend(p.payment_id for p in page)
+        if len(page) < 5:
+            break
+        cursor = encode_payment_cursor(page[-1])
+
+    # Assert
+    assert seen == expected
+    assert len(seen) == 25
+
+def test_cursor_page_stable_when_new_payment_added(many_payments):
+    """Test that a payment inserted after page one does not shift page two."""
+    # Arrange
+    page1 = get_client_payments(1, limit=5)
+    cursor = encode_payment_cursor(page1[-1])
+    expected_page2 = [p.payment_id for p in get_client_payments(1, limit=5, cursor=cursor)]
+
+    execute_query(
+        """
+            INSERT INTO payments (contract_id, client_id, received_date, actual_fee,
+                                  applied_start_month, applied_start_month_year,
+                                  applied_end_month, applied_end_month_year)
+            VALUES (1, 1, '2024-06-15', 40.0, 6, 2024, 6, 2024)
+        """
+    )
+
+    # Act
+    page2 = get_client_payments(1, limit=5, cursor=cursor)
+
+    # Assert
+    assert [p.payment_id for p in page2] == expected_page2
+
+def test_payments_endpoint_returns_next_cursor(many_payments):
+    """Test that GET /clients/{id}/payments exposes the next cursor header."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    first = client.get("/clients/1/payments?limit=10")
+    second = client.get(f"/clients/1/payments?limit=10&cursor={first.headers['X-Next-Cursor']}")
+    bad = client.get("/clients/1/payments?cursor=garbage")
+
+    # Assert
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert not {p["payment_id"] for p in first.json()} & {p["payment_id"] for p in second.json()}
+    assert bad.status_code == 400
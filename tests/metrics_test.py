@@ -0,0 +1,100 @@
+import pytest
+from fastapi.testclient import TestClient
+from backend.main import app
+from core.database import execute_query
+from core.metrics import MetricsRegistry, metrics, normalize_statement
+from services.contract_service import get_contract_cache_stats
+
+@pytest.fixture
+def client(pooled_db):
+    """A test client with empty metrics."""
+    metrics.reset()
+    yield TestClient(app)
+    metrics.reset()
+
+def test_requests_are_labelled_by_route_template(client):
+    """Test that latency series use the route path, not the concrete URL."""
+    # Act
+    client.get("/clients/1")
+    client.get("/clients/2")
+    body = client.get("/metrics").text
+
+    # Assert
+    assert 'http_request_duration_seconds_count{method="GET",route="/clients/{client_id}",status="200"} 2' in body
+    assert 'route="/clients/1"' not in body
+
+def test_not_modified_responses_are_counted(client):
+    """Test that 304s answered before routing still get a route label."""
+    # Arrange
+    etag = client.get("/clients/1").headers["etag"]
+
+    # Act
+    client.get("/clients/1", headers={"If-None-Match": etag})
+    body = client.get("/metrics").text
+
+    # Assert
+    assert 'route="/clients/{client_id}",status="304"} 1' in body
+
+def test_query_timings_and_rows_are_recorded(client):
+    """Test the execute_query hook: per-statement histograms, row counts and acquire time."""
+    # Act
+    client.get("/clients/")
+    body = client.get("/metrics").text
+
+    # Assert
+    assert "db_query_duration_seconds_bucket{query=" in body
+    assert "db_query_rows_total{query=" in body
+    assert "db_connection_acquire_seconds_count" in body
+    assert 'db_pool_connections{state="open"}' in body
+
+def test_contract_cache_counters_are_exposed(client):
+    """Test that /metrics reports the contract cache's hits, misses and size."""
+    # Arrange
+    client.get("/contracts/1")
+    client.get("/contracts/1")
+
+    # Act
+    body = client.get("/metrics").text
+
+    # Assert
+    stats = get_contract_cache_stats()
+    assert f'cache_lookups_total{{cache="contract",result="hit"}} {stats["hits"]}' in body
+    assert f'cache_lookups_total{{cache="contract",result="miss"}} {stats["misses"]}' in body
+    assert stats["hits"] >= 1
+    assert f'cache_entries{{cache="contract",state="max"}} {stats["maxsize"]}' in body
+
+def test_slow_queries_endpoint(client):
+    """Test that statements over the threshold land in the ring buffer, newest first."""
+    # Arrange
+    original = metrics.slow_query_seconds
+    metrics.slow_query_seconds = 0
+
+    # Act
+    try:
+        execute_query("SELECT client_id FROM clients WHERE client_id IN (?, ?, ?)", (1, 2, 3))
+        execute_query("SELECT COUNT(*) AS n FROM payments")
+    finally:
+        metrics.slow_query_seconds = original
+    entries = client.get("/debug/slow-queries").json()
+
+    # Assert
+    assert entries[0]["statement"] == "SELECT COUNT(*) AS n FROM payments"
+    assert entries[1]["statement"] == "SELECT client_id FROM clients WHERE client_id IN (?...)"
+    assert entries[1]["rows"] == 3
+
+def test_slow_query_log_is_bounded():
+    """Test that the ring buffer keeps only the newest entries."""
+    # Arrange
+    registry = MetricsRegistry(slow_query_ms=0, slow_query_log_size=2)
+
+    # Act
+    for n in range(5):
+        registry.observe_query(f"SELECT {n}", 0.01, 1)
+
+    # Assert
+    assert [entry["statement"] for entry in registry.slow_queries()] == ["SELECT 4", "SELECT 3"]
+
+def test_normalize_statement_folds_whitespace_and_in_lists():
+    """Test that variable-length batches share one series."""
+    # Act & Assert
+    assert normalize_statement("SELECT *\n    FROM t WHERE id IN (?,?, ?)") == "SELECT * FROM t WHERE id IN (?...)"
@@ -0,0 +1,75 @@
+import os
+import shutil
+import sqlite3
+from backend.core.database import dict_factory
+from backend.core.migrations import apply_migrations, get_schema_version, LATEST_VERSION
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "..", "backend", "data", "401k_payments.db")
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "backend", "data", "clean_schema.sql")
+
+def open_copy(tmp_path):
+    """Open a scratch copy of the shipped database."""
+    path = tmp_path / "copy.db"
+    shutil.copy(DB_PATH, path)
+    conn = sqlite3.connect(path)
+    conn.row_factory = dict_factory
+    return conn
+
+def index_names(conn):
+    return {r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+def test_existing_database_is_migrated(tmp_path):
+    """Test that the shipped database is brought up to the latest schema version."""
+    # Arrange
+    conn = open_copy(tmp_path)
+
+    # Act
+    version = apply_migrations(conn)
+
+    # Assert
+    assert version == LATEST_VERSION
+    assert get_schema_version(conn) == LATEST_VERSION
+    assert "idx_payments_keyset" in index_names(conn)
+    assert "idx_payments_applied_period" in index_names(conn)
+    assert "idx_payments_applied_months" not in index_names(conn)
+
+def test_migrated_period_columns_cover_existing_payments(tmp_path):
+    """Test that every existing payment gets an applied period range."""
+    # Arrange
+    conn = open_copy(tmp_path)
+
+    # Act
+    apply_migrations(conn)
+
+    # Assert
+    row = conn.execute("""
+        SELECT COUNT(*) AS missing FROM payments
+        WHERE applied_start_ym IS NULL OR applied_end_ym < applied_start_ym
+    """).fetchone()
+    assert row["missing"] == 0
+
+def test_migrations_are_idempotent(tmp_path):
+    """Test that re-running migrations on an up-to-date database is a no-op."""
+    # Arrange
+    conn = open_copy(tmp_path)
+    apply_migrations(conn)
+    before = index_names(conn)
+
+    # Act
+    apply_migrations(conn)
+
+    # Assert
+    assert index_names(conn) == before
+
+def test_clean_schema_is_at_latest_version():
+    """Test that clean_schema.sql stays in step with the migration list."""
+    # Arrange
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = dict_factory
+
+    # Act
+    with open(SCHEMA_PATH, "r") as f:
+        conn.executescript(f.read())
+
+    # Assert
+    assert get_schema_version(conn) == LATEST_VERSION
@@ -0,0 +1,77 @@
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+
+from hypothesis import HealthCheck, given, settings, strategies as st
+from backend.services import payment_service
+from backend.services.payment_service import enrich_payments, enhance_payment_with_details
+
+fees = st.one_of(
+    st.none(),
+    st.floats(min_value=-1e6, max_value=1e6, allow_nan=False, allow_infinity=False),
+    st.sampled_from([0.0, 40.0, 3750.0]),
+)
+
+def month_fields(draw):
+    return {
+        "applied_start_month": draw(st.integers(1, 12)),
+        "applied_start_month_year": draw(st.integers(2015, 2030)),
+        "applied_end_month": draw(st.integers(1, 12)),
+        "applied_end_month_year": draw(st.integers(2015, 2030)),
+    }
+
+def quarter_fields(draw):
+    return {
+        "applied_start_quarter": draw(st.integers(1, 4)),
+        "applied_start_quarter_year": draw(st.integers(2015, 2030)),
+        "applied_end_quarter": draw(st.integers(1, 4)),
+        "applied_end_quarter_year": draw(st.integers(2015, 2030)),
+    }
+
+@st.composite
+def payment_rows(draw, payment_id=st.integers(1, 10**6)):
+    row = {
+        "payment_id": draw(payment_id),
+        "contract_id": 1,
+        "client_id": 1,
+        "received_date": "2024-01-15",
+        "expected_fee": draw(fees),
+        "total_assets": draw(st.one_of(st.none(), st.floats(0, 1e8, allow_nan=False))),
+        "fee_type": draw(st.sampled_from(["percentage", "percent", "flat", None])),
+        "percent_rate": draw(st.one_of(st.none(), st.floats(0, 0.05, allow_nan=False))),
+    }
+    # Sometimes pay exactly the expected fee so the exact-match branch is hit
+    row["actual_fee"] = row["expected_fee"] if draw(st.booleans()) else draw(fees)
+
+    kind = draw(st.sampled_from(["month", "quarter", "both", "none"]))
+    if kind in ("month", "both"):
+        row.update(month_fields(draw))
+    if kind in ("quarter", "both"):
+        row.update(quarter_fields(draw))
+    return row
+
+def enrichment_fields(row):
+    return {key: row[key] for key in ("is_split_payment", "periods", "variance")}
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+# monkeypatch only toggles the NumPy path, which is the same for every example
+@settings(max_examples=300, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(rows=st.lists(payment_rows(), max_size=40))
+def test_enrich_payments_matches_scalar(monkeypatch, use_numpy, rows):
+    """Property: the batch path agrees with enhance_payment_with_details on every row."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(payment_service, "np", None)
+
+    # Act
+    enriched = enrich_payments([dict(row) for row in rows])
+
+    # Assert
+    for row, result in zip(rows, enriched):
+        scalar = enhance_payment_with_details(dict(row))
+        assert enrichment_fields(result) == {
+            "is_split_payment": scalar.is_split_payment,
+            "periods": scalar.periods,
+            "variance": scalar.variance,
+        }
@@ -0,0 +1,103 @@
+import pytest
+from backend.services import payment_service
+from backend.services.payment_service import (
+    enrich_payments, enhance_payment_with_details, get_client_payments, create_payment
+)
+from backend.models.payments import PaymentCreate
+
+def scalar_enrichment(row):
+    """Run the row-by-row functions and return the fields enrich_payments fills."""
+    payment = enhance_payment_with_details(dict(row))
+    return {
+        "is_split_payment": payment.is_split_payment,
+        "periods": payment.periods,
+        "variance": payment.variance,
+    }
+
+def vector_enrichment(rows):
+    enriched = enrich_payments([dict(row) for row in rows])
+    return [
+        {key: row[key] for key in ("is_split_payment", "periods", "variance")}
+        for row in enriched
+    ]
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run each test with and without NumPy."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(payment_service, "np", None)
+    return request.param
+
+EXAMPLES = [
+    # Single month, exact match
+    {"applied_start_month": 1, "applied_start_month_year": 2024, "applied_end_month": 1,
+     "applied_end_month_year": 2024, "expected_fee": 40.0, "actual_fee": 40.0},
+    # Monthly split across a year boundary
+    {"applied_start_month": 11, "applied_start_month_year": 2024, "applied_end_month": 1,
+     "applied_end_month_year": 2025, "expected_fee": 100.0, "actual_fee": 300.0},
+    # Quarterly split, within 5%
+    {"applied_start_quarter": 4, "applied_start_quarter_year": 2023, "applied_end_quarter": 1,
+     "applied_end_quarter_year": 2024, "expected_fee": 7500.0, "actual_fee": 7600.0},
+    # Expected fee derived from assets for percentage contracts
+    {"applied_start_quarter": 2, "applied_start_quarter_year": 2024, "applied_end_quarter": 2,
+     "applied_end_quarter_year": 2024, "total_assets": 100000.0, "fee_type": "percentage",
+     "percent_rate": 0.001, "actual_fee": 120.0},
+    # Nothing to compare against
+    {"actual_fee": None, "expected_fee": 50.0},
+    # Zero expected fee
+    {"applied_start_month": 3, "applied_start_month_year": 2024, "applied_end_month": 3,
+     "applied_end_month_year": 2024, "expected_fee": 0.0, "actual_fee": 10.0},
+]
+
+def test_enrich_payments_matches_scalar_functions(backend):
+    """Test that the batch path reproduces enhance_payment_with_details exactly."""
+    # Arrange
+    rows = [
+        {"payment_id": i, "contract_id": 1, "client_id": 1, "received_date": "2024-01-15", **example}
+        for i, example in enumerate(EXAMPLES, start=1)
+    ]
+
+    # Act
+    enriched = vector_enrichment(rows)
+
+    # Assert
+    assert enriched == [scalar_enrichment(row) for row in rows]
+    assert [e["variance"]["status"] for e in enriched] == [
+        "exact", "alert", "acceptable", "alert", "unknown", "acceptable"
+    ]
+    assert [p["period"] for p in enriched[1]["periods"]] == [
+        "November 2024", "December 2024", "January 2025"
+    ]
+
+def test_enrich_payments_empty():
+    """Test the empty result set."""
+    assert enrich_payments([]) == []
+
+def test_client_payments_use_batch_enrichment(pooled_db, backend):
+    """Test that payment history rows carry the same details as the scalar path."""
+    # Arrange
+    create_payment(PaymentCreate(
+        contract_id=3,
+        client_id=3,
+        received_date="2024-04-10",
+        total_assets=None,
+        expected_fee=3750.0,
+        actual_fee=3600.0,
+        method="check",
+        notes=None,
+        applied_start_month=4,
+        applied_start_month_year=2024,
+        applied_end_month=6,
+        applied_end_month_year=2024
+    ))
+
+    # Act
+    payments = get_client_payments(3)
+
+    # Assert
+    assert len(payments) == 2
+    for payment in payments:
+        expected = enhance_payment_with_details(payment.dict())
+        assert payment == expected
@@ -0,0 +1,104 @@
+import csv
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+import pytest
+from fastapi.testclient import TestClient
+from core.database import execute_query
+from backend.main import app
+from backend.services.export_service import (
+    iter_payment_export, csv_stream, xlsx_stream, EXPORT_COLUMNS
+)
+
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+@pytest.fixture
+def client(pooled_db):
+    return TestClient(app)
+
+def read_csv(response):
+    return list(csv.DictReader(io.StringIO(response.text)))
+
+def test_csv_export_includes_enrichment(client):
+    """Test that every payment is exported with its periods and variance."""
+    # Act
+    response = client.get("/payments/export")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="payments.csv"' in response.headers["content-disposition"]
+    rows = read_csv(response)
+    assert [int(row["payment_id"]) for row in rows] == [1, 2, 3]
+    split = rows[2]
+    assert split["is_split_payment"] == "True"
+    assert split["applied_period"] == "January 2024 - March 2024"
+    assert split["periods"].startswith("January 2024: 1666.67")
+    assert split["variance_status"] == "alert"
+    assert rows[0]["variance_status"] == "exact"
+
+def test_export_filters(client):
+    """Test the client, provider and date range filters."""
+    # Arrange
+    execute_query("UPDATE contracts SET provider_name = 'Other Provider' WHERE contract_id = 2")
+
+    # Act
+    by_client = read_csv(client.get("/payments/export", params={"client_id": 3}))
+    by_provider = read_csv(client.get("/payments/export", params={"provider": "Other Provider"}))
+    by_dates = read_csv(client.get(
+        "/payments/export", params={"start_date": "2024-01-11", "end_date": "2024-01-31"}
+    ))
+
+    # Assert
+    assert [row["client_id"] for row in by_client] == ["3"]
+    assert [row["client_id"] for row in by_provider] == ["2"]
+    assert [row["payment_id"] for row in by_dates] == ["1"]
+
+def test_export_rejects_bad_parameters(client):
+    """Test validation happens before the stream starts."""
+    # Act & Assert
+    assert client.get("/payments/export", params={"format": "pdf"}).status_code == 400
+    assert client.get("/payments/export", params={"start_date": "01/02/2024"}).status_code == 400
+
+def test_xlsx_export_is_a_valid_workbook(client):
+    """Test that the streamed workbook unzips into a sheet with every row."""
+    # Act
+    response = client.get("/payments/export", params={"format": "xlsx", "client_id": 3})
+
+    # Assert
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    assert "xl/workbook.xml" in archive.namelist()
+    sheet = ET.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    rows = sheet.findall("s:sheetData/s:row", SHEET_NS)
+    assert len(rows) == 2
+    header = [cell.findtext("s:is/s:t", namespaces=SHEET_NS) for cell in rows[0]]
+    assert header == EXPORT_COLUMNS
+    assert rows[1][EXPORT_COLUMNS.index("actual_fee")].findtext("s:v", namespaces=SHEET_NS) == "5000.0"
+
+def test_export_streams_one_batch_at_a_time(pooled_db):
+    """Test that rows are fetched and written in fixed-size batches on one connection."""
+    # Arrange
+    batches = iter_payment_export(batch_size=1)
+
+    # Act
+    chunks = list(csv_stream(batches))
+
+    # Assert
+    assert len(chunks) == 3
+    assert chunks[0].decode().startswith("payment_id,")
+    assert pooled_db.stats()["idle"] == pooled_db.stats()["open"]
+
+def test_closing_export_releases_connection(pooled_db):
+    """Test that abandoning a stream part-way returns its pooled connection."""
+    # Arrange
+    stream = xlsx_stream(iter_payment_export(batch_size=1))
+    next(stream)
+    next(stream)
+
+    # Act
+    stream.close()
+
+    # Assert
+    assert pooled_db.stats()["idle"] == pooled_db.stats()["open"]
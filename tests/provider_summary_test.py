@@ -0,0 +1,161 @@
+import pytest
+from fastapi.testclient import TestClient
+from core.database import execute_query
+from backend.main import app
+from backend.services.payment_service import (
+    create_payment, update_payment, delete_payment, bulk_create_payments
+)
+from backend.services.provider_service import rebuild_provider_summaries, get_provider_summary
+from backend.models.payments import PaymentCreate
+
+def quarterly_payment(quarter, year=2024, fee=3750.0, expected=3750.0):
+    """Build a quarterly payment for the flat quarterly test client."""
+    return PaymentCreate(
+        contract_id=2,
+        client_id=2,
+        received_date=f"{year}-{quarter * 3:02d}-20",
+        total_assets=None,
+        expected_fee=expected,
+        actual_fee=fee,
+        method="wire",
+        notes=None,
+        applied_start_quarter=quarter,
+        applied_start_quarter_year=year,
+        applied_end_quarter=quarter,
+        applied_end_quarter_year=year
+    )
+
+def provider_rows():
+    """Return provider_summaries keyed by (provider, year, quarter), without timestamps."""
+    return {
+        (row["provider_name"], row["year"], row["quarter"]): {
+            key: value for key, value in row.items() if key not in ("id", "last_updated")
+        }
+        for row in execute_query("SELECT * FROM provider_summaries")
+    }
+
+def assert_matches_rebuild():
+    """Check that incrementally maintained rows equal a full rebuild."""
+    incremental = provider_rows()
+    rebuild_provider_summaries()
+    rebuilt = provider_rows()
+
+    assert incremental.keys() == rebuilt.keys()
+    for cell, row in rebuilt.items():
+        assert incremental[cell] == pytest.approx(row)
+
+def test_rebuild_rolls_up_quarter(pooled_db):
+    """Test totals, client count and variance counts for the seeded quarter."""
+    # Act
+    rebuild_provider_summaries()
+
+    # Assert
+    row = provider_rows()[("Test Provider", 2024, 1)]
+    assert row["total_payments"] == pytest.approx(40.0 + 3750.0 + 5000.0)
+    assert row["expected_total"] == pytest.approx(40.0 + 3750.0 + 3750.0)
+    assert row["client_count"] == 3
+    assert row["payment_count"] == 3
+    assert row["exact_count"] == 2
+    assert row["alert_count"] == 1
+
+def test_create_payment_updates_rollup(pooled_db):
+    """Test that a new payment is added to its provider's quarter."""
+    # Arrange
+    rebuild_provider_summaries()
+
+    # Act
+    create_payment(quarterly_payment(2, fee=3600.0))
+
+    # Assert
+    row = provider_rows()[("Test Provider", 2024, 2)]
+    assert row["total_payments"] == pytest.approx(3600.0)
+    assert row["client_count"] == 1
+    assert row["acceptable_count"] == 1
+    assert_matches_rebuild()
+
+def test_second_payment_in_quarter_keeps_client_count(pooled_db):
+    """Test that a client is counted once per quarter however many payments it has."""
+    # Arrange
+    rebuild_provider_summaries()
+
+    # Act
+    payment = create_payment(quarterly_payment(1, fee=100.0, expected=None))
+
+    # Assert
+    row = provider_rows()[("Test Provider", 2024, 1)]
+    assert row["client_count"] == 3
+    assert row["payment_count"] == 4
+    assert row["unknown_count"] == 1
+    delete_payment(payment.payment_id)
+    assert provider_rows()[("Test Provider", 2024, 1)]["client_count"] == 3
+    assert_matches_rebuild()
+
+def test_update_payment_moves_rollup(pooled_db):
+    """Test that moving a payment to another quarter moves its totals and client."""
+    # Arrange
+    rebuild_provider_summaries()
+
+    # Act
+    update_payment(2, quarterly_payment(3))
+
+    # Assert
+    rows = provider_rows()
+    assert rows[("Test Provider", 2024, 1)]["client_count"] == 2
+    assert rows[("Test Provider", 2024, 3)]["client_count"] == 1
+    assert_matches_rebuild()
+
+def test_delete_last_payment_removes_quarter(pooled_db):
+    """Test that a quarter with no payments left is dropped."""
+    # Arrange
+    rebuild_provider_summaries()
+    payment = create_payment(quarterly_payment(4))
+
+    # Act
+    delete_payment(payment.payment_id)
+
+    # Assert
+    assert ("Test Provider", 2024, 4) not in provider_rows()
+    assert_matches_rebuild()
+
+def test_bulk_create_updates_rollup(pooled_db):
+    """Test that bulk imports apply the same deltas as single writes."""
+    # Arrange
+    rebuild_provider_summaries()
+
+    # Act
+    bulk_create_payments([quarterly_payment(1), quarterly_payment(2), quarterly_payment(2, fee=10.0)])
+
+    # Assert
+    rows = provider_rows()
+    assert rows[("Test Provider", 2024, 1)]["client_count"] == 3
+    assert rows[("Test Provider", 2024, 2)]["client_count"] == 1
+    assert rows[("Test Provider", 2024, 2)]["payment_count"] == 2
+    assert_matches_rebuild()
+
+def test_get_provider_summary_unknown_provider(pooled_db):
+    """Test that an unknown provider is distinguished from one without payments."""
+    # Act & Assert
+    assert get_provider_summary("No Such Provider") is None
+    assert get_provider_summary("Test Provider") == []
+
+def test_provider_summary_endpoints(pooled_db):
+    """Test GET /providers/{name}/summary and GET /providers/summary, including names with a slash."""
+    # Arrange
+    execute_query("UPDATE contracts SET provider_name = 'Capital Group / American Funds' WHERE contract_id = 2")
+    rebuild_provider_summaries()
+    client = TestClient(app)
+
+    # Act
+    by_provider = client.get("/providers/Capital Group / American Funds/summary", params={"year": 2024})
+    by_quarter = client.get("/providers/summary", params={"year": 2024, "quarter": 1})
+    missing = client.get("/providers/No Such Provider/summary")
+
+    # Assert
+    assert by_provider.status_code == 200
+    assert [(row["quarter"], row["total_payments"]) for row in by_provider.json()] == [(1, 3750.0)]
+    assert by_quarter.status_code == 200
+    assert {row["provider_name"]: row["client_count"] for row in by_quarter.json()} == {
+        "Test Provider": 2,
+        "Capital Group / American Funds": 1,
+    }
+    assert missing.status_code == 404
@@ -0,0 +1,95 @@
+import sqlite3
+import pytest
+from benchmarks.generator import generate_database, use_database
+from core.metrics import normalize_statement
+from services.export_service import EXPORT_QUERY
+from tools.query_audit import audit, collect_statements, is_allowed, plan_problems, plan_tags, run_workload
+
+@pytest.fixture(scope="module")
+def generated_db(tmp_path_factory):
+    """A generated database large enough for realistic plans."""
+    path = str(tmp_path_factory.mktemp("audit") / "audit.db")
+    generate_database(path, clients=300, years=3, derived=False)
+    return path
+
+def test_every_service_statement_uses_indexes(generated_db):
+    """Test that no statement the services issue does a full scan or an unexpected sort."""
+    # Act
+    problems = audit(generated_db)
+
+    # Assert
+    assert problems == [], "\n".join(f"{p.detail}: {p.statement[:200]}" for p in problems)
+
+def test_audit_sees_streamed_export(generated_db):
+    """Test that the export SELECT run through stream_query reaches the observers."""
+    # Act
+    with use_database(generated_db):
+        statements = collect_statements(run_workload)
+
+    # Assert
+    assert any(statement.startswith(normalize_statement(EXPORT_QUERY)) for statement in statements)
+
+def test_per_write_compliance_refresh_is_not_exempt(generated_db):
+    """Test that only the full compliance refresh carries the plan tag that allows scanning clients."""
+    # Act
+    with use_database(generated_db):
+        statements = collect_statements(run_workload)
+    refreshes = [s for s in statements if s.startswith("SELECT c.client_id, cm.last_payment_date, co.payment_schedule")]
+
+    # Assert
+    assert sorted(bool(plan_tags(s)) for s in refreshes) == [False, True]
+    assert all("c.client_id IN" not in s for s in refreshes if plan_tags(s))
+
+def test_audit_catches_a_dropped_index(generated_db, tmp_path):
+    """Test that losing an index shows up as a plan problem."""
+    # Arrange
+    path = str(tmp_path / "no_index.db")
+    source = sqlite3.connect(generated_db)
+    target = sqlite3.connect(path)
+    source.backup(target)
+    source.close()
+    target.execute("DROP INDEX idx_payments_applied_period")
+    target.execute("DROP INDEX idx_payments_keyset")
+    target.commit()
+    target.close()
+
+    # Act
+    problems = audit(path)
+
+    # Assert
+    assert any(p.detail.startswith("USE TEMP B-TREE") and "FROM payments" in p.statement for p in problems)
+
+def test_plan_problems_ignores_subqueries_and_fts():
+    """Test that only base-table scans and temp B-trees are flagged."""
+    # Arrange
+    plan = [
+        "SCAN c",
+        "SCAN fts",
+        "SCAN clients_fts VIRTUAL TABLE INDEX 0:M2",
+        "SCAN contracts USING INDEX idx_contracts_active_client",
+        "USE TEMP B-TREE FOR ORDER BY",
+    ]
+
+    # Act
+    problems = plan_problems(plan, {"c": "clients", "clients_fts": "clients_fts"})
+
+    # Assert
+    assert problems == ["SCAN clients", "USE TEMP B-TREE FOR ORDER BY"]
+
+def test_allowlist_matches_whole_plan_tags():
+    """Test that an allowed plan needs the exact tag, not SQL that happens to contain the reason's text."""
+    # Arrange
+    allowed = [("client-roster", "USE TEMP B-TREE", "sorted roster")]
+    sort = "USE TEMP B-TREE FOR ORDER BY"
+
+    # Act
+    tagged = is_allowed("SELECT * FROM clients ORDER BY display_name /* plan:client-roster */", sort, allowed)
+    longer_tag = is_allowed("SELECT * FROM clients ORDER BY 1 /* plan:client-roster-v2 */", sort, allowed)
+    untagged = is_allowed("SELECT 'client-roster' FROM clients ORDER BY 1", sort, allowed)
+    other_step = is_allowed("SELECT * FROM clients /* plan:client-roster */", "SCAN clients", allowed)
+
+    # Assert
+    assert tagged
+    assert not longer_tag
+    assert not untagged
+    assert not other_step
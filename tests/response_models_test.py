@@ -0,0 +1,66 @@
+import pytest
+import fastapi.routing
+from fastapi.testclient import TestClient
+from backend.main import app
+from models.clients import Client
+from models.payments import PaymentWithDetails
+
+@pytest.fixture
+def serialize_calls(monkeypatch):
+    """Count FastAPI's response_model dump-and-revalidate passes."""
+    calls = []
+    original = fastapi.routing.serialize_response
+    async def counting(*args, **kwargs):
+        calls.append(kwargs.get("field"))
+        return await original(*args, **kwargs)
+    monkeypatch.setattr(fastapi.routing, "serialize_response", counting)
+    return calls
+
+@pytest.mark.parametrize("path", ["/clients/", "/clients/summaries", "/clients/1/payments"])
+def test_list_routes_validate_once(pooled_db, serialize_calls, path):
+    """Test that hot list routes are not revalidated against their response_model."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    response = client.get(path)
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert serialize_calls == []
+
+def test_single_routes_still_use_response_model(pooled_db, serialize_calls):
+    """Test that other routes keep FastAPI's usual serialization."""
+    # Act
+    TestClient(app).get("/clients/1")
+
+    # Assert
+    assert len(serialize_calls) == 1
+
+def test_model_response_keeps_headers(pooled_db):
+    """Test that headers set on the injected response survive the fast path."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    roster = client.get("/clients/?limit=2")
+    payments = client.get("/clients/1/payments?limit=1")
+
+    # Assert
+    assert roster.headers["x-total-count"] == "3"
+    assert "x-next-cursor" in payments.headers
+
+def test_fast_path_output_matches_response_model(pooled_db):
+    """Test that the pre-serialized payloads are what the response_model would produce."""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    roster = client.get("/clients/").json()
+    payments = client.get("/clients/3/payments").json()
+
+    # Assert
+    assert roster == [Client(**c).model_dump() for c in roster]
+    assert payments == [PaymentWithDetails(**p).model_dump() for p in payments]
+    assert isinstance(payments[0]["actual_fee"], float)
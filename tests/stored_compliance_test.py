@@ -0,0 +1,128 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from core.database import execute_query
+from backend.main import app
+from backend.services.client_service import (
+    get_all_clients, get_client_by_id, refresh_client_compliance, add_months
+)
+from backend.services.payment_service import create_payment
+from backend.models.payments import PaymentCreate
+
+# Client 1 is monthly (last paid 2024-01-15), client 2 quarterly (2024-02-15)
+AS_OF = datetime(2024, 3, 25)
+
+def stored(client_id):
+    return execute_query(
+        """
+            SELECT compliance_status, compliance_reason, next_payment_due, compliance_as_of
+            FROM client_metrics WHERE client_id = :client_id
+        """,
+        {"client_id": client_id},
+        fetch_one=True
+    )
+
+def test_refresh_stores_status_reason_and_next_due(pooled_db):
+    """Test that compliance is computed with the client's own schedule and stored."""
+    # Act
+    refreshed = refresh_client_compliance(today=AS_OF)
+
+    # Assert
+    assert refreshed == 3
+    assert stored(1) == {
+        "compliance_status": "yellow",
+        "compliance_reason": "Payment approaching due date",
+        "next_payment_due": "2024-02-15",
+        "compliance_as_of": "2024-03-25",
+    }
+    assert stored(2)["compliance_status"] == "green"
+    assert stored(2)["next_payment_due"] == "2024-05-15"
+
+def test_refresh_uses_the_current_contract(pooled_db):
+    """Test that a client with two active contracts is judged once, on the same contract the roster shows."""
+    # Arrange
+    execute_query("""
+        INSERT INTO contracts (contract_id, client_id, provider_name, fee_type, percent_rate, flat_rate, payment_schedule, num_people)
+        VALUES (10, 1, 'Second Provider', 'flat', NULL, 900.0, 'quarterly', 5)
+    """)
+
+    # Act
+    refreshed = refresh_client_compliance([1], today=AS_OF)
+
+    # Assert
+    assert refreshed == 1
+    assert stored(1)["next_payment_due"] == "2024-02-15"
+    assert get_client_by_id(1).provider_name == "Test Provider"
+
+def test_roster_reads_stored_compliance(pooled_db):
+    """Test that GET /clients/ returns stored status, judging monthly clients on monthly thresholds."""
+    # Arrange
+    refresh_client_compliance(today=AS_OF)
+
+    # Act
+    clients = {client.client_id: client for client in get_all_clients()}
+
+    # Assert
+    assert clients[1].compliance_status == "yellow"
+    assert clients[1].next_payment_due == "2024-02-15"
+    assert clients[2].compliance_status == "green"
+    assert get_client_by_id(1).compliance_status == "yellow"
+
+def test_roster_filters_by_status(pooled_db):
+    """Test the server-side status filter."""
+    # Arrange
+    refresh_client_compliance(today=AS_OF)
+    client = TestClient(app)
+
+    # Act
+    response = client.get("/clients/", params={"status": "green"})
+
+    # Assert
+    assert response.status_code == 200
+    assert [c["client_id"] for c in response.json()] == [2]
+
+def test_client_without_payments_is_red(pooled_db):
+    """Test that a client with no metrics row is stored as red."""
+    # Arrange
+    execute_query(
+        "INSERT INTO clients (client_id, display_name, full_name) VALUES (4, 'New', 'NEW CLIENT')"
+    )
+
+    # Act
+    refresh_client_compliance(today=AS_OF)
+
+    # Assert
+    assert stored(4)["compliance_status"] == "red"
+    assert stored(4)["compliance_reason"] == "No payment records found"
+    assert stored(4)["next_payment_due"] is None
+
+def test_payment_write_refreshes_compliance(pooled_db):
+    """Test that recording a payment updates the stored status straight away."""
+    # Arrange
+    refresh_client_compliance(today=datetime(2025, 1, 1))
+    today = datetime.now()
+
+    # Act
+    create_payment(PaymentCreate(
+        contract_id=1,
+        client_id=1,
+        received_date=today.strftime("%Y-%m-%d"),
+        total_assets=96000.0,
+        expected_fee=40.0,
+        actual_fee=40.0,
+        method="check",
+        notes=None,
+        applied_start_month=today.month,
+        applied_start_month_year=today.year,
+        applied_end_month=today.month,
+        applied_end_month_year=today.year
+    ))
+
+    # Assert
+    assert stored(1)["compliance_status"] == "green"
+    assert stored(1)["next_payment_due"] == add_months(today, 1).strftime("%Y-%m-%d")
+
+def test_add_months_clamps_to_month_end():
+    """Test next-due dates for month-end payments."""
+    assert add_months(datetime(2024, 1, 31), 1) == datetime(2024, 2, 29)
+    assert add_months(datetime(2024, 11, 30), 3) == datetime(2025, 2, 28)
@@ -0,0 +1,189 @@
+import pytest
+from core.database import execute_query
+from backend.services.payment_service import (
+    create_payment, update_payment, delete_payment, bulk_create_payments
+)
+from backend.services.summary_service import rebuild_summaries, payment_period_range
+from backend.models.payments import PaymentCreate
+
+def monthly_payment(start_month, end_month=None, fee=40.0, year=2024):
+    """Build a fully populated monthly payment for client 1."""
+    return PaymentCreate(
+        contract_id=1,
+        client_id=1,
+        received_date=f"{year}-{(end_month or start_month):02d}-20",
+        total_assets=96000.0,
+        expected_fee=fee,
+        actual_fee=fee,
+        method="check",
+        notes=None,
+        applied_start_month=start_month,
+        applied_start_month_year=year,
+        applied_end_month=end_month or start_month,
+        applied_end_month_year=year
+    )
+
+def quarterly_payment(start, end, fee=3750.0):
+    """Build a quarterly payment for client 2 from (quarter, year) pairs."""
+    return PaymentCreate(
+        contract_id=2,
+        client_id=2,
+        received_date=f"{end[1]}-{end[0] * 3:02d}-20",
+        total_assets=None,
+        expected_fee=fee,
+        actual_fee=fee,
+        method="wire",
+        notes=None,
+        applied_start_quarter=start[0],
+        applied_start_quarter_year=start[1],
+        applied_end_quarter=end[0],
+        applied_end_quarter_year=end[1]
+    )
+
+def quarterly(client_id):
+    return {
+        (row["year"], row["quarter"]): row
+        for row in execute_query(
+            "SELECT * FROM quarterly_summaries WHERE client_id = :client_id",
+            {"client_id": client_id}
+        )
+    }
+
+def yearly(client_id):
+    return {
+        row["year"]: row
+        for row in execute_query(
+            "SELECT * FROM yearly_summaries WHERE client_id = :client_id",
+            {"client_id": client_id}
+        )
+    }
+
+def snapshot(client_id):
+    """Summary values without timestamps, for comparing against a rebuild."""
+    strip = lambda row: {k: v for k, v in row.items() if k not in ("id", "last_updated")}
+    return (
+        {key: strip(row) for key, row in quarterly(client_id).items()},
+        {key: strip(row) for key, row in yearly(client_id).items()},
+    )
+
+@pytest.fixture
+def summaries(pooled_db):
+    """Start from summaries rebuilt over the seed payments."""
+    rebuild_summaries()
+    return pooled_db
+
+def test_schema_has_no_summary_triggers(pooled_db):
+    """Test that summary maintenance no longer relies on triggers."""
+    # Act
+    triggers = execute_query(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+        "AND tbl_name IN ('payments', 'quarterly_summaries', 'yearly_summaries')"
+    )
+
+    # Assert
+    assert triggers == []
+
+def test_rebuild_covers_split_monthly_payment(summaries):
+    """Test that a split monthly payment lands in the quarter it covers."""
+    # Act
+    rows = quarterly(3)
+
+    # Assert
+    assert rows[(2024, 1)]["total_payments"] == pytest.approx(5000.0)
+    assert rows[(2024, 1)]["payment_count"] == 1
+    assert yearly(3)[2024]["total_payments"] == pytest.approx(5000.0)
+
+def test_monthly_create_updates_quarter(summaries):
+    """Test that monthly payments roll up into their quarter, not only quarterly ones."""
+    # Act
+    create_payment(monthly_payment(2))
+    create_payment(monthly_payment(4))
+
+    # Assert
+    rows = quarterly(1)
+    assert rows[(2024, 1)]["total_payments"] == pytest.approx(80.0)
+    assert rows[(2024, 1)]["payment_count"] == 2
+    assert rows[(2024, 1)]["expected_total"] == pytest.approx(80.0)
+    assert rows[(2024, 2)]["total_payments"] == pytest.approx(40.0)
+    assert yearly(1)[2024]["total_payments"] == pytest.approx(120.0)
+    assert yearly(1)[2024]["payment_count"] == 3
+
+def test_split_payment_is_apportioned_across_quarters(summaries):
+    """Test that a payment spanning quarters is divided evenly between them."""
+    # Act
+    create_payment(monthly_payment(2, 4, fee=90.0))
+
+    # Assert
+    rows = quarterly(1)
+    assert rows[(2024, 1)]["total_payments"] == pytest.approx(40.0 + 60.0)
+    assert rows[(2024, 2)]["total_payments"] == pytest.approx(30.0)
+
+def test_quarterly_split_across_years_sets_yoy_growth(summaries):
+    """Test a Q4-Q1 payment and the year-over-year growth it produces."""
+    # Act
+    create_payment(quarterly_payment((4, 2024), (1, 2025), fee=7500.0))
+
+    # Assert
+    rows = quarterly(2)
+    assert rows[(2024, 4)]["total_payments"] == pytest.approx(3750.0)
+    assert rows[(2025, 1)]["total_payments"] == pytest.approx(3750.0)
+    years = yearly(2)
+    assert years[2024]["total_payments"] == pytest.approx(7500.0)
+    assert years[2025]["total_payments"] == pytest.approx(3750.0)
+    assert years[2025]["yoy_growth"] == pytest.approx(-50.0)
+
+def test_update_moves_payment_between_quarters(summaries):
+    """Test that updating a payment's period clears the quarter it left."""
+    # Act
+    update_payment(2, quarterly_payment((2, 2024), (2, 2024), fee=4000.0))
+
+    # Assert
+    rows = quarterly(2)
+    assert (2024, 1) not in rows
+    assert rows[(2024, 2)]["total_payments"] == pytest.approx(4000.0)
+    assert yearly(2)[2024]["total_payments"] == pytest.approx(4000.0)
+
+def test_delete_removes_empty_summaries(summaries):
+    """Test that deleting the only payment in a period removes its summary rows."""
+    # Act
+    delete_payment(3)
+
+    # Assert
+    assert quarterly(3) == {}
+    assert yearly(3) == {}
+
+def test_bulk_create_updates_summaries(summaries):
+    """Test that bulk imports maintain summaries like single writes."""
+    # Act
+    bulk_create_payments([quarterly_payment((q, 2023), (q, 2023)) for q in range(1, 5)])
+
+    # Assert
+    assert yearly(2)[2023]["total_payments"] == pytest.approx(15000.0)
+    assert yearly(2)[2024]["yoy_growth"] == pytest.approx(-75.0)
+
+def test_incremental_matches_rebuild(summaries):
+    """Test that a mix of writes leaves the same summaries as a full rebuild."""
+    # Arrange
+    create_payment(monthly_payment(11, 12, fee=80.0, year=2023))
+    create_payment(monthly_payment(5))
+    created = create_payment(monthly_payment(6))
+    update_payment(created.payment_id, monthly_payment(7, 9, fee=120.0))
+    delete_payment(1)
+
+    # Act
+    incremental = snapshot(1)
+    rebuild_summaries(1)
+
+    # Assert
+    assert snapshot(1) == incremental
+
+def test_payment_period_range_matches_generated_columns(pooled_db):
+    """Test the Python period mirror against the stored month ordinals."""
+    # Arrange
+    rows = execute_query(
+        "SELECT *, applied_start_ym AS start_ym, applied_end_ym AS end_ym FROM payments"
+    )
+
+    # Act & Assert
+    for row in rows:
+        assert payment_period_range(row) == (row["start_ym"], row["end_ym"])
@@ -0,0 +1,93 @@
+import pytest
+from core.database import execute_query, transaction
+from backend.services.payment_service import create_payment, delete_payment
+from backend.models.payments import PaymentCreate
+
+def count_payments(pool, client_id):
+    """Count live payments for a client on a connection outside any transaction."""
+    conn = pool.acquire()
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) AS n FROM payments WHERE client_id = ? AND valid_to IS NULL",
+            (client_id,)
+        ).fetchone()["n"]
+    finally:
+        pool.release(conn)
+
+def test_transaction_commits_once_at_end(pooled_db):
+    """Test that writes inside a transaction are invisible to other connections until commit."""
+    # Act
+    with transaction():
+        execute_query(
+            "UPDATE clients SET full_name = 'RENAMED' WHERE client_id = 1"
+        )
+        outside = pooled_db.acquire()
+        seen_before_commit = outside.execute(
+            "SELECT full_name FROM clients WHERE client_id = 1"
+        ).fetchone()["full_name"]
+        pooled_db.release(outside)
+
+    # Assert
+    assert seen_before_commit == "PERCENTAGE MONTHLY CLIENT"
+    assert execute_query(
+        "SELECT full_name FROM clients WHERE client_id = 1", fetch_one=True
+    )["full_name"] == "RENAMED"
+
+def test_transaction_rolls_back_on_error(pooled_db):
+    """Test that an exception discards every statement in the unit of work."""
+    # Act
+    with pytest.raises(RuntimeError):
+        with transaction():
+            execute_query("UPDATE clients SET full_name = 'RENAMED' WHERE client_id = 1")
+            raise RuntimeError("boom")
+
+    # Assert
+    assert execute_query(
+        "SELECT full_name FROM clients WHERE client_id = 1", fetch_one=True
+    )["full_name"] == "PERCENTAGE MONTHLY CLIENT"
+
+def test_nested_transaction_joins_outer_connection(pooled_db):
+    """Test that a nested unit of work reuses the outer connection."""
+    # Act & Assert
+    with transaction() as outer:
+        with transaction() as inner:
+            assert inner is outer
+
+def test_create_payment_is_atomic(pooled_db, monkeypatch):
+    """Test that a failure after the insert leaves no partial payment behind."""
+    # Arrange
+    def fail_metrics(client_id, **kwargs):
+        raise RuntimeError("metrics failure")
+
+    monkeypatch.setattr("backend.services.payment_service.apply_payment_to_metrics", fail_metrics)
+    payment = PaymentCreate(
+        contract_id=2,
+        client_id=2,
+        received_date="2024-05-15",
+        total_assets=None,
+        expected_fee=3750.0,
+        actual_fee=3750.0,
+        method="check",
+        notes=None,
+        applied_start_quarter=2,
+        applied_start_quarter_year=2024,
+        applied_end_quarter=2,
+        applied_end_quarter_year=2024
+    )
+
+    # Act
+    with pytest.raises(RuntimeError):
+        create_payment(payment)
+
+    # Assert
+    assert count_payments(pooled_db, 2) == 1
+
+def test_delete_payment_single_connection(pooled_db):
+    """Test that a payment mutation runs on one pooled connection."""
+    # Act
+    result = delete_payment(2)
+
+    # Assert
+    assert result is True
+    assert pooled_db.stats()["open"] == 1
+    assert count_payments(pooled_db, 2) == 0